@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -54,6 +58,32 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Instrumentasi API (users/instrumentation.py): header Server-Timing,
+# histogram per view (GET metrics/, admin) dan peringatan jika jumlah query
+# melebihi budget. Default aktif saat DEBUG.
+API_INSTRUMENTATION = os.environ.get('API_INSTRUMENTATION', '1' if DEBUG else '0') == '1'
+if API_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, 'users.instrumentation.InstrumentationMiddleware')
+
+# Budget per request di luar batch tambahan bulk write: batch setelah yang
+# pertama (SQLite: 999 parameter per query) dideklarasikan jalur bulk lewat
+# instrumentation.allow_batches dan ditambahkan ke budget.
+API_QUERY_BUDGET = 10
+API_QUERY_BUDGETS = {
+    'student_dashboard': 2,
+    'async_student_dashboard': 2,
+    'instructor_dashboard': 4,
+    'async_instructor_dashboard': 4,
+    'course_gradebook': 4,
+    # Per chunk import: user, course dosen, mahasiswa, Grade yang ada,
+    # bulk_create, bulk_update, ringkasan (3) dan SAVEPOINT/RELEASE
+    'grade_import': 11,
+    # Simpan list_editable admin Grade: sesi, user, COUNT, baris formset,
+    # bulk_update, ringkasan (3), content type, log dan 4 SAVEPOINT/RELEASE.
+    # Satu halaman penuh (list_per_page 100) di SQLite: +1 batch ringkasan
+    'users_grade_changelist': 14,
+}
+
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development
 CORS_ALLOW_CREDENTIALS = True
@@ -79,9 +109,23 @@ TEMPLATES = [
     },
 ]
 
+# JWT_STATELESS_AUTH=1 -> user dibangun dari klaim token tanpa query per
+# request (users/authentication.py). Default mati: penanda revokasi token
+# disimpan di cache 'default', jadi hanya boleh aktif dengan cache bersama
+# (lihat CACHE_REDIS_URL di bawah). Jika mati, perilakunya sama dengan
+# JWTAuthentication biasa.
+JWT_STATELESS_AUTH = os.environ.get('JWT_STATELESS_AUTH', '0') == '1'
+# Umur cache baris CustomUser untuk view yang membutuhkannya (detik)
+JWT_USER_CACHE_TTL = 30
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
+    ),
+    # orjson jika terpasang, selain itu stdlib json (users/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'users.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
 }
 
@@ -93,14 +137,161 @@ WSGI_APPLICATION = 'reactauth.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Diatur lewat env: DB_ENGINE (sqlite3 | postgresql | mysql), DB_NAME,
+# DB_USER, DB_PASSWORD, DB_HOST, DB_PORT. Tanpa env: SQLite lokal.
+# DB_CONN_MAX_AGE: umur koneksi persisten (detik, default 0 = tutup tiap
+# request). Hanya untuk WSGI (misal 60): di ASGI setiap request bisa jalan di
+# thread berbeda sehingga koneksi persisten tidak dipakai ulang dan menumpuk;
+# pakai DB_POOL di sana.
+# DB_POOL=1 (PostgreSQL + psycopg 3): pool bawaan Django 5; koneksi
+# persisten otomatis dimatikan karena pool yang mengelola koneksi.
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite3')
+DB_POOL = DB_ENGINE == 'postgresql' and os.environ.get('DB_POOL', '0') == '1'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': f'django.db.backends.{DB_ENGINE}',
+        'NAME': os.environ.get('DB_NAME') or (BASE_DIR / 'db.sqlite3' if DB_ENGINE == 'sqlite3' else 'reactauth'),
+        'USER': os.environ.get('DB_USER', ''),
+        'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+        'HOST': os.environ.get('DB_HOST', ''),
+        'PORT': os.environ.get('DB_PORT', ''),
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', '0')),
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1',
+        'OPTIONS': {},
+    }
+}
+
+if DB_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+        'timeout': int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+    }
+elif DB_ENGINE == 'sqlite3':
+    # Detik menunggu lock tulis sebelum "database is locked"
+    DATABASES['default']['OPTIONS']['timeout'] = 20
+
+# BENCH_DATABASE=1: database ini khusus bench/test, jadi seed_bench,
+# bench_suite, bench_db dan loadtest_dashboards boleh meng-commit & menghapus
+# data sintetis tanpa --yes-i-mean-it
+BENCH_DATABASE = os.environ.get('BENCH_DATABASE', '0') == '1'
+
+# PRAGMA yang dijalankan untuk setiap koneksi SQLite baru (users/db.py).
+# DB_SQLITE_WAL=1: WAL (pembaca tidak diblokir penulis) + synchronous=NORMAL
+# (aman dengan WAL). Opt-in karena journal_mode tersimpan di file database:
+# db.sqlite3 dev yang ikut di repo tidak boleh berubah hanya karena migrate
+# atau runserver.
+SQLITE_WAL_PRAGMAS = {'journal_mode': 'WAL', 'synchronous': 'NORMAL'}
+SQLITE_PRAGMAS = {'mmap_size': 256 * 1024 * 1024}
+if os.environ.get('DB_SQLITE_WAL', '0') == '1':
+    SQLITE_PRAGMAS.update(SQLITE_WAL_PRAGMAS)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Locmem per proses. CACHE_REDIS_URL (misal redis://localhost:6379/0, butuh
+# paket redis) -> cache bersama antar worker.
+
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+    } if CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'reactauth-default',
     }
 }
 
+# Penanda revokasi di cache per proses tidak terlihat worker lain: user yang
+# dinonaktifkan tetap bisa memakai tokennya sampai kedaluwarsa
+if JWT_STATELESS_AUTH and not CACHE_REDIS_URL:
+    raise ImproperlyConfigured("JWT_STATELESS_AUTH=1 membutuhkan cache bersama (CACHE_REDIS_URL).")
+
+# Cache respons dashboard (users/response_cache.py). Locmem tidak dibagi
+# antar proses: dengan banyak worker, arahkan ke alias backend bersama.
+DASHBOARD_CACHE_ALIAS = 'default'
+DASHBOARD_CACHE_TIMEOUT = 300
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+# Logger 'users' (users.views, users.instrumentation, ...). LOG_LEVEL=DEBUG
+# untuk log detail per request; default INFO supaya jalur panas tidak
+# memformat apa pun.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'kv': {
+            'format': 'ts=%(asctime)s level=%(levelname)s logger=%(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'kv',
+        },
+    },
+    'loggers': {
+        'users': {
+            'handlers': ['console'],
+            'level': os.environ.get('LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+# Profil dipilih lewat env PASSWORD_HASHER_PROFILE (argon2 | bcrypt | pbkdf2);
+# default argon2 jika argon2-cffi terpasang, selain itu pbkdf2. Hasher pertama
+# dipakai untuk hash baru, sisanya hanya untuk membaca hash lama, yang
+# otomatis di-upgrade saat login berhasil (users/hashers.py). Ukur dampak
+# parameter dengan `python manage.py bench_login`.
+
+PASSWORD_HASHER_PROFILES = {
+    'argon2': [
+        'users.hashers.TunedArgon2PasswordHasher',
+        'users.hashers.TunedPBKDF2PasswordHasher',
+        'users.hashers.TunedBCryptSHA256PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+    'bcrypt': [
+        'users.hashers.TunedBCryptSHA256PasswordHasher',
+        'users.hashers.TunedPBKDF2PasswordHasher',
+        'users.hashers.TunedArgon2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+    'pbkdf2': [
+        'users.hashers.TunedPBKDF2PasswordHasher',
+        'users.hashers.TunedArgon2PasswordHasher',
+        'users.hashers.TunedBCryptSHA256PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+}
+
+PASSWORD_HASHER_PROFILE = os.environ.get('PASSWORD_HASHER_PROFILE') or (
+    'argon2' if find_spec('argon2') else 'pbkdf2'
+)
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+# Argon2: memory_cost dalam KiB. Satu login ~ satu core selama waktu hash,
+# jadi turunkan biaya hanya sejauh target keamanan masih terpenuhi.
+PASSWORD_HASHER_PARAMS = {
+    'argon2': {'time_cost': 2, 'memory_cost': 65536, 'parallelism': 1},
+    'bcrypt': {'rounds': 12},
+    'pbkdf2': {'iterations': 1_000_000},
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
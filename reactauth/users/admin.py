@@ -1,5 +1,97 @@
+import json
+
+from django import forms
 from django.contrib import admin
-from .models import CustomUser, Course, Grade
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Q
+from django.db.models.functions import Upper
+from django.forms.models import BaseModelFormSet
+from django.utils.functional import cached_property
+from .models import CustomUser, Course, Grade, StudentSummary
+from .course_stats import get_many_course_stats
+from .grade_import import SCORE_FIELDS
+from .grading import compute_final_grades, save_grades
+from .instrumentation import allow_batches
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator changelist tanpa COUNT(*) penuh: hitungan berhenti di
+    count_limit baris, atau lookahead_pages halaman setelah halaman yang
+    diminta (batasnya ikut bergeser, jadi setiap halaman tetap bisa dicapai
+    lewat halaman terakhir yang tampil). Tanpa filter/pencarian di
+    PostgreSQL dipakai perkiraan planner (pg_class.reltuples).
+    """
+    count_limit = 10_000
+    lookahead_pages = 10
+
+    def __init__(self, *args, page=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_limit = max(self.count_limit, (page + self.lookahead_pages) * self.per_page)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.count_limit:
+                return estimate
+        return min(queryset.order_by()[:self.count_limit + 1].count(), self.count_limit)
+
+
+def estimated_row_count(model, using='default'):
+    """Perkiraan jumlah baris tabel dari statistik database (None jika tidak ada)"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples = -1 jika tabel belum pernah di-ANALYZE
+    return int(row[0]) if row and row[0] >= 0 else None
+
+
+def prefix_lookup(field, prefix):
+    """Pencarian awalan sebagai rentang (>= prefix, < prefix+maks) agar index terpakai"""
+    return {f'{field}__gte': prefix, f'{field}__lt': prefix + '\U0010ffff'}
+
+
+class LoadedPkField(forms.ModelChoiceField):
+    """Field pk formset yang memakai baris yang sudah dimuat formset (tanpa query per baris)"""
+
+    def __init__(self, objects, *args, **kwargs):
+        self.objects = objects
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value not in self.empty_values and str(value) in self.objects:
+            return self.objects[str(value)]
+        return super().to_python(value)
+
+
+class LoadedPkFormSet(BaseModelFormSet):
+    """Formset list_editable: validasi pk dari queryset formset (satu query), bukan .get() per form"""
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        pk_name = self._pk_field.name
+        field = form.fields[pk_name]
+        if type(field) is forms.ModelChoiceField:
+            form.fields[pk_name] = LoadedPkField(
+                self.loaded_objects(), field.queryset,
+                initial=field.initial, required=False, widget=field.widget,
+            )
+
+    def loaded_objects(self):
+        if not hasattr(self, '_loaded_objects'):
+            self._loaded_objects = {str(obj.pk): obj for obj in self.get_queryset()}
+        return self._loaded_objects
 
 @admin.register(CustomUser)
 class CustomUserAdmin(admin.ModelAdmin):
@@ -9,7 +101,7 @@ class CustomUserAdmin(admin.ModelAdmin):
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
-    list_display = ['code', 'name', 'semester', 'credits', 'major', 'instructor']
+    list_display = ['code', 'name', 'semester', 'credits', 'major', 'instructor', 'enrolled', 'average_grade']
     list_filter = ['semester', 'major', 'credits']
     search_fields = ['code', 'name']
     
@@ -17,11 +109,28 @@ class CourseAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         return qs.select_related('instructor')
 
+    def get_changelist_instance(self, request):
+        # Ambil statistik satu halaman sekaligus (cache, atau satu query agregat)
+        cl = super().get_changelist_instance(request)
+        stats = get_many_course_stats(course.pk for course in cl.result_list)
+        for course in cl.result_list:
+            course.stats = stats[course.pk]
+        return cl
+
+    @admin.display(description='Students')
+    def enrolled(self, obj):
+        return obj.stats['enrolled']
+
+    @admin.display(description='Average')
+    def average_grade(self, obj):
+        return obj.stats['average']
+
 @admin.register(Grade)
 class GradeAdmin(admin.ModelAdmin):
+    # Kolom langsung dari join select_related (email/kode), bukan __str__
     list_display = [
-        'student', 
-        'course', 
+        'student__email',
+        'course__code',
         'assignment_score', 
         'midterm_score', 
         'final_score',
@@ -43,15 +152,91 @@ class GradeAdmin(admin.ModelAdmin):
         # ❌ HAPUS 'is_active'
     ]
     
-    search_fields = [
-        'student__full_name',
-        'student__email',
-        'course__code',
-        'course__name'
-    ]
-    
+    # Pencarian kustom di get_search_results; search_fields tetap diisi
+    # supaya kotak pencarian tampil
+    search_fields = ['=student__email', '^course__code']
+    search_help_text = 'Email mahasiswa (lengkap atau awalan) atau awalan kode course.'
+
+    autocomplete_fields = ['student', 'course']
     readonly_fields = ['final_grade', 'letter_grade', 'created_at', 'updated_at']
-    
+
+    # Tanpa COUNT(*) penuh di changelist
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('student', 'course')
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        # Email persis (unique index) atau awalan email / kode course (rentang
+        # di index) - bukan icontains di empat kolom hasil join
+        if term.startswith('@'):
+            # Domain (misal "@student.prasetiyamulya"): tidak bisa lewat index
+            students = CustomUser.objects.filter(email__icontains=term)
+        else:
+            # Awalan sekaligus email lengkap
+            students = CustomUser.objects.filter(**prefix_lookup('email', term.lower()))
+        # Tidak peka huruf besar/kecil lewat index UPPER(code)
+        courses = Course.objects.alias(code_upper=Upper('code')).filter(
+            **prefix_lookup('code_upper', term.upper())
+        )
+        return queryset.filter(
+            Q(student__in=students.values('pk')) | Q(course__in=courses.values('pk'))
+        ), False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        try:
+            page = max(1, int(request.GET.get(PAGE_VAR, 1)))
+        except ValueError:
+            page = 1
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, page=page)
+
+    def get_changelist_formset(self, request, **kwargs):
+        return super().get_changelist_formset(request, formset=LoadedPkFormSet, **kwargs)
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != 'POST' or '_save' not in request.POST:
+            return super().changelist_view(request, extra_context)
+        # Simpan list_editable sebagai satu batch: save_model & log_change
+        # hanya mengumpulkan, lalu dihitung & ditulis sekaligus
+        request._grade_batch = batch = []
+        request._grade_log = log = {}
+        with transaction.atomic():
+            response = super().changelist_view(request, extra_context)
+            self.save_batch(batch)
+            for message, objects in log.items():
+                allow_batches(len(objects), len(LogEntry._meta.concrete_fields) - 1)
+                LogEntry.objects.log_actions(request.user.pk, objects, CHANGE, message)
+        return response
+
+    def save_model(self, request, obj, form, change):
+        batch = getattr(request, '_grade_batch', None)
+        if change and batch is not None:
+            batch.append(obj)
+            return
+        super().save_model(request, obj, form, change)
+
+    def log_change(self, request, obj, message):
+        log = getattr(request, '_grade_log', None)
+        if log is None:
+            return super().log_change(request, obj, message)
+        # Satu INSERT per isi pesan (biasanya semua baris sama)
+        log.setdefault(json.dumps(message) if isinstance(message, list) else message, []).append(obj)
+
+    def save_batch(self, grades):
+        compute_final_grades(grades)
+        save_grades(grades, SCORE_FIELDS + ['final_grade', 'letter_grade'])
+
+@admin.register(StudentSummary)
+class StudentSummaryAdmin(admin.ModelAdmin):
+    list_display = ['student', 'gpa', 'total_credits', 'graded_courses', 'total_courses', 'updated_at']
+    search_fields = ['student__email', 'student__full_name']
+    readonly_fields = [f.name for f in StudentSummary._meta.fields]
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('student', 'course')
\ No newline at end of file
+        return qs.select_related('student')
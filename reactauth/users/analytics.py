@@ -0,0 +1,115 @@
+"""
+Rollup distribusi nilai untuk analitik registrar (GradeRollup).
+
+Satu baris per (course, jurusan mahasiswa): jumlah peserta, yang sudah
+dinilai, rata-rata & persentil final_grade, dan distribusi nilai huruf.
+Semester dan jurusan course ikut disalin, jadi endpoint analitik cukup
+membaca O(grup) baris, bukan memindai seluruh Grade.
+
+refresh_rollups() inkremental: course yang punya Grade atau Course dengan
+updated_at setelah watermark terakhir dihitung ulang utuh (semua grup
+course itu). Watermark dimundurkan WATERMARK_OVERLAP supaya transaksi yang
+commit terlambat tidak terlewat; menghitung ulang grup yang sama aman.
+
+Penghapusan Grade dan perubahan jurusan mahasiswa tidak mengubah
+updated_at mana pun: jalankan refresh penuh (full=True) secara berkala.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Course, Grade, GradeRollup, RollupWatermark
+
+WATERMARK_NAME = 'grade-rollup'
+WATERMARK_OVERLAP = timedelta(minutes=5)
+PERCENTILES = {'p25': 0.25, 'median': 0.50, 'p75': 0.75, 'p90': 0.90}
+ROLLUP_FIELDS = ['enrolled', 'graded', 'average', *PERCENTILES, 'distribution']
+
+
+def _percentile(values, fraction):
+    """values terurut; interpolasi linear (sama dengan numpy.percentile default)"""
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return round(values[lower] + (values[upper] - values[lower]) * (position - lower), 2)
+
+
+def build_rollups(course_ids=None, chunk_size=5000):
+    """GradeRollup (belum disimpan) untuk course_ids, atau semua course jika None"""
+    courses = Course.objects.all()
+    grades = Grade.objects.all()
+    if course_ids is not None:
+        courses = courses.filter(pk__in=course_ids)
+        grades = grades.filter(course_id__in=course_ids)
+    courses = {c['id']: c for c in courses.values('id', 'semester', 'major').order_by()}
+
+    groups = defaultdict(lambda: {'enrolled': 0, 'scores': [], 'letters': defaultdict(int)})
+    rows = grades.values_list('course_id', 'student__major', 'final_grade', 'letter_grade').order_by()
+    for course_id, student_major, final_grade, letter_grade in rows.iterator(chunk_size=chunk_size):
+        group = groups[course_id, student_major or '']
+        group['enrolled'] += 1
+        if final_grade is not None:
+            group['scores'].append(float(final_grade))
+        if letter_grade is not None:
+            group['letters'][letter_grade] += 1
+
+    rollups = []
+    for (course_id, student_major), group in groups.items():
+        scores = sorted(group['scores'])
+        course = courses[course_id]
+        rollup = GradeRollup(
+            course_id=course_id,
+            semester=course['semester'],
+            course_major=course['major'],
+            student_major=student_major,
+            enrolled=group['enrolled'],
+            graded=len(scores),
+            average=round(sum(scores) / len(scores), 2) if scores else None,
+            distribution={letter: group['letters'][letter] for letter, _label in Grade.GRADE_CHOICES},
+        )
+        for field, fraction in PERCENTILES.items():
+            setattr(rollup, field, _percentile(scores, fraction) if scores else None)
+        rollups.append(rollup)
+    return rollups
+
+
+def get_watermark():
+    return RollupWatermark.objects.filter(name=WATERMARK_NAME).values_list('value', flat=True).first()
+
+
+def changed_course_ids(since):
+    """Course yang Grade-nya atau dirinya sendiri berubah setelah `since`"""
+    changed = set(
+        Grade.objects.filter(updated_at__gt=since).values_list('course_id', flat=True).distinct().order_by()
+    )
+    changed.update(Course.objects.filter(updated_at__gt=since).values_list('pk', flat=True).order_by())
+    return changed
+
+
+def refresh_rollups(full=False, batch_size=1000):
+    """
+    Perbarui GradeRollup; kembalikan {'courses': n atau None (semua), 'groups': n}.
+    Tanpa watermark (atau full=True) seluruh tabel dibangun ulang.
+    """
+    started = timezone.now()
+    watermark = None if full else get_watermark()
+    course_ids = None if watermark is None else changed_course_ids(watermark - WATERMARK_OVERLAP)
+    rollups = build_rollups(course_ids) if course_ids is None or course_ids else []
+
+    with transaction.atomic():
+        if course_ids is None:
+            GradeRollup.objects.all().delete()
+        elif course_ids:
+            GradeRollup.objects.filter(course_id__in=course_ids).delete()
+        GradeRollup.objects.bulk_create(rollups, batch_size=batch_size)
+        # Watermark = waktu sebelum membaca: perubahan selama refresh ikut di putaran berikutnya
+        RollupWatermark.objects.bulk_create(
+            [RollupWatermark(name=WATERMARK_NAME, value=started)],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['value'],
+        )
+
+    return {'courses': None if course_ids is None else len(course_ids), 'groups': len(rollups)}
@@ -0,0 +1,152 @@
+"""
+Varian async (ASGI) dashboard mahasiswa & dosen.
+
+Payload, ETag dan cache respons sama dengan view sync di views.py. Query
+yang tidak saling bergantung (profil user + grades, atau user + course +
+grades) difilter lewat email, bukan pk, sehingga bisa dijalankan
+bersamaan dengan asyncio.gather. Jika klien mengirim If-None-Match, query
+user dijalankan dulu sendirian supaya 304 tetap cukup satu query.
+
+Catatan: ORM async Django masih menjalankan query di thread sync milik
+request, jadi query yang di-gather tidak paralel di database; yang hilang
+adalah thread yang diblokir per request di server ASGI.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+
+from .course_stats import get_many_course_stats
+from .etags import (
+    dashboard_etag,
+    etag_matches,
+    instructor_etag_annotations,
+    student_etag_annotations,
+    with_validator,
+)
+from .models import Course, CustomUser, Grade
+from .ranking import course_rank_annotations
+from .renderers import FastJSONRenderer
+from .response_cache import AsyncCachedDashboardMixin
+from .serializers import GradeRowSerializer
+from .views import (
+    INSTRUCTOR_NOT_FOUND,
+    instructor_dashboard_payload,
+    instructor_email_error,
+    student_dashboard_payload,
+)
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        FastJSONRenderer().render(data), status=status, content_type='application/json'
+    )
+
+
+async def _get_or_none(queryset, **lookup):
+    try:
+        return await queryset.aget(**lookup)
+    except queryset.model.DoesNotExist:
+        return None
+
+
+async def _list(queryset):
+    return [obj async for obj in queryset]
+
+
+async def _rows(serializer):
+    """Setara list(serializer.iter_rows()) dengan async for"""
+    return [(row, serializer.to_representation(row)) async for row in serializer.values()]
+
+
+class AsyncDashboardView(AsyncCachedDashboardMixin, View):
+    http_method_names = ['get', 'options']
+
+    def render_cached(self, request, etag, data):
+        if etag_matches(request, etag):
+            return with_validator(HttpResponse(status=304), etag)
+        return with_validator(json_response(data), etag)
+
+    def not_modified(self, etag):
+        return with_validator(HttpResponse(status=304), etag), None
+
+
+class AsyncStudentDashboardView(AsyncDashboardView):
+    """Dashboard student (async) - AllowAny"""
+    dashboard_kind = 'student'
+
+    async def get_dashboard(self, request):
+        email = request.GET.get('email')
+        if not email:
+            return json_response({'error': 'Email parameter required'}, status=400), None
+
+        users = CustomUser.objects.select_related('summary').annotate(**student_etag_annotations())
+        lookup = _get_or_none(users, email=email, role='student')
+
+        # Statistik window selalu ikut: keberadaan ringkasan belum diketahui
+        # saat query grades dijalankan bersamaan dengan query user
+        extra = {**course_rank_annotations(), **Grade.transcript_window_annotations()}
+        grades = Grade.objects.filter(student__email=email, student__role='student').annotate(**extra)
+        rows = _rows(GradeRowSerializer(grades, extra_fields=list(extra)))
+
+        if request.headers.get('If-None-Match'):
+            user = await lookup
+            if user is not None:
+                etag = dashboard_etag(user, student_etag_annotations())
+                if etag_matches(request, etag):
+                    rows.close()
+                    return self.not_modified(etag)
+            rows = await rows
+        else:
+            user, rows = await asyncio.gather(lookup, rows)
+
+        if user is None:
+            return json_response({'error': 'Student not found'}, status=404), None
+
+        etag = dashboard_etag(user, student_etag_annotations())
+        data = student_dashboard_payload(user, rows)
+        return with_validator(json_response(data), etag), data
+
+
+class AsyncInstructorDashboardView(AsyncDashboardView):
+    """Dashboard instructor (async)"""
+    dashboard_kind = 'instructor'
+
+    async def get_dashboard(self, request):
+        email = request.GET.get('email')
+        error = instructor_email_error(email)
+        if error is not None:
+            payload, status = error
+            return json_response(payload, status=status), None
+
+        users = CustomUser.objects.annotate(**instructor_etag_annotations())
+        lookup = _get_or_none(users, email=email, role='instructor')
+
+        owned = {'instructor__email': email, 'instructor__role': 'instructor'}
+        courses = _list(Course.objects.filter(**owned))
+        # Urut per course lalu terbaru: sesuai users_grade_course_recent_idx
+        grades = Grade.objects.filter(
+            course__instructor__email=email, course__instructor__role='instructor'
+        ).order_by('course_id', '-created_at')
+        rows = _rows(GradeRowSerializer(grades))
+
+        if request.headers.get('If-None-Match'):
+            instructor = await lookup
+            if instructor is not None:
+                etag = dashboard_etag(instructor, instructor_etag_annotations())
+                if etag_matches(request, etag):
+                    courses.close()
+                    rows.close()
+                    return self.not_modified(etag)
+            courses, rows = await asyncio.gather(courses, rows)
+        else:
+            instructor, courses, rows = await asyncio.gather(lookup, courses, rows)
+
+        if instructor is None:
+            return json_response(INSTRUCTOR_NOT_FOUND, status=404), None
+
+        course_stats = await sync_to_async(get_many_course_stats)([course.pk for course in courses])
+        etag = dashboard_etag(instructor, instructor_etag_annotations())
+        data = instructor_dashboard_payload(instructor, courses, course_stats, rows)
+        return with_validator(json_response(data), etag), data
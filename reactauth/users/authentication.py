@@ -0,0 +1,127 @@
+"""
+Autentikasi JWT tanpa query user per request.
+
+CustomTokenObtainPairSerializer menaruh email, role, full_name, major,
+is_staff dan auth_time (waktu login) di token. ClaimsJWTAuthentication
+membangun ClaimsUser dari klaim tersebut, jadi pemeriksaan role/izin tidak
+menyentuh database. View yang butuh baris CustomUser asli memanggil
+db_user(request.user), yang memakai cache in-process berumur pendek.
+
+Revokasi: menonaktifkan user, mengganti password/role/email, atau
+menghapus user menyimpan penanda "revoked-before" di cache (signals.py).
+Token dengan auth_time sebelum penanda itu ditolak, termasuk access token
+hasil refresh. Penanda harus terlihat semua worker, jadi mode ini hanya
+aktif dengan settings JWT_STATELESS_AUTH, yang ditolak settings tanpa cache
+bersama. Endpoint refresh sendiri tetap memeriksa is_active di database.
+
+Jika JWT_STATELESS_AUTH mati, atau token lama tanpa klaim lengkap, user
+diautentikasi lewat database seperti JWTAuthentication.
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CustomUser
+
+CACHE_ALIAS = 'default'
+REQUIRED_CLAIMS = ('email', 'role', 'auth_time')
+
+
+def _revoked_key(user_id):
+    return f'jwt:revoked-before:{user_id}'
+
+
+def revoke_user_tokens(user_id):
+    """Tolak semua token user ini yang diterbitkan dari login sebelum sekarang"""
+    # Token hasil refresh membawa auth_time login awal: simpan penanda
+    # selama umur refresh token
+    timeout = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    caches[CACHE_ALIAS].set(_revoked_key(user_id), time.time(), timeout)
+    user_cache.discard(user_id)
+
+
+class UserCache:
+    """Cache CustomUser in-process dengan TTL (JWT_USER_CACHE_TTL detik)"""
+
+    max_entries = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                return copy.copy(entry[1])
+
+        user = CustomUser.objects.filter(pk=user_id).first()
+        ttl = getattr(settings, 'JWT_USER_CACHE_TTL', 30)
+        if user is not None and ttl > 0:
+            with self._lock:
+                if len(self._entries) >= self.max_entries:
+                    self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                    if len(self._entries) >= self.max_entries:
+                        self._entries.clear()
+                self._entries[user_id] = (now + ttl, copy.copy(user))
+        return user
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class ClaimsUser(TokenUser):
+    """User ringan dari klaim token; klaim lain tersedia sebagai atribut"""
+
+    @property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __str__(self):
+        return self.email
+
+
+def db_user(user):
+    """Baris CustomUser untuk request.user (ClaimsUser atau model)"""
+    if isinstance(user, ClaimsUser):
+        instance = user_cache.get(user.id)
+        if instance is None or not instance.is_active:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return instance
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication tanpa query (JWT_STATELESS_AUTH): user dibangun dari klaim token"""
+
+    def get_user(self, validated_token):
+        claims = (api_settings.USER_ID_CLAIM,) + REQUIRED_CLAIMS
+        if not settings.JWT_STATELESS_AUTH or any(claim not in validated_token for claim in claims):
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        revoked_before = caches[CACHE_ALIAS].get(_revoked_key(user_id))
+        if revoked_before is not None and validated_token['auth_time'] < revoked_before:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return ClaimsUser(validated_token)
@@ -0,0 +1,37 @@
+"""
+Bagian bersama untuk import baris bulk (nilai di grade_import, roster di
+provisioning): pembaca CSV baris per baris dan pengumpul error per baris
+untuk laporan hasil.
+"""
+import codecs
+import csv
+
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_csv(upload, required_fields):
+    """Baca file CSV (biner) baris per baris tanpa memuat seluruh isi"""
+    reader = csv.DictReader(codecs.iterdecode(upload, 'utf-8-sig'))
+    missing = [f for f in required_fields if f not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(missing)}")
+    return reader
+
+
+class RowErrorCollector:
+    """Semua baris gagal dihitung, maksimal MAX_REPORTED_ERRORS yang dilaporkan"""
+
+    def __init__(self):
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+    def error_report(self):
+        return {
+            'error_count': self.error_count,
+            'errors': sorted(self.errors, key=lambda e: e['row']),
+        }
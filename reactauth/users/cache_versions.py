@@ -0,0 +1,62 @@
+"""
+Counter versi di cache untuk invalidasi lewat kunci berversi.
+
+Dipakai cache respons dashboard (satu generation global) dan statistik
+course (satu versi per course): kunci entri memuat versi saat ini, jadi
+menaikkan versi membuat entri lama tidak lagi ditemukan dan cukup
+dibiarkan kedaluwarsa.
+"""
+import time
+
+from django.db import transaction
+
+
+def new_version():
+    # Bukan angka kecil: jika kunci versi ter-evict, versi baru tidak boleh
+    # bertabrakan dengan entri lama yang masih tersimpan
+    return time.time_ns()
+
+
+def get_version(cache, key):
+    version = cache.get(key)
+    if version is None:
+        version = new_version()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_version(cache, key):
+    version = await cache.aget(key)
+    if version is None:
+        version = new_version()
+        if not await cache.aadd(key, version, None):
+            version = await cache.aget(key, version)
+    return version
+
+
+def get_versions(cache, keys):
+    """{kunci: versi} untuk beberapa kunci sekaligus"""
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return versions
+
+
+def bump_version(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_version(), None)
+
+
+def invalidate(cache, *keys):
+    """
+    Bump sekarang dan sekali lagi setelah commit, supaya nilai yang dihitung
+    dari data sebelum commit tidak tersimpan di versi terbaru.
+    """
+    for key in set(keys):
+        bump_version(cache, key)
+        transaction.on_commit(lambda key=key: bump_version(cache, key))
@@ -0,0 +1,114 @@
+"""
+Statistik per mata kuliah (jumlah peserta, rata-rata, min/max, distribusi
+nilai huruf) yang disimpan di cache Django.
+
+Kunci cache memuat nomor versi per course; setiap penulisan Grade/Course
+menaikkan versi tersebut (lihat signals.py), sehingga entri lama tidak
+pernah terbaca lagi dan cukup dibiarkan kedaluwarsa.
+"""
+from django.core.cache import caches
+from django.db.models import Avg, Count, Max, Min, Q
+
+from .cache_versions import bump_version, get_versions, invalidate
+from .models import Grade
+
+CACHE_ALIAS = 'default'
+CACHE_TIMEOUT = 60 * 60
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(course_id):
+    return f'course-stats:version:{course_id}'
+
+
+def _stats_key(course_id, version):
+    return f'course-stats:{course_id}:{version}'
+
+
+def bump_course_stats_version(course_id):
+    """Invalidasi statistik satu course"""
+    bump_version(_cache(), _version_key(course_id))
+
+
+def invalidate_course_stats(*course_ids):
+    """Dipanggil setiap kali Grade/Course berubah (termasuk jalur bulk)"""
+    invalidate(_cache(), *map(_version_key, course_ids))
+
+
+def _get_versions(course_ids):
+    keys = {_version_key(cid): cid for cid in course_ids}
+    return {keys[k]: v for k, v in get_versions(_cache(), keys).items()}
+
+
+def compute_course_stats(course_ids):
+    """Hitung statistik beberapa course sekaligus dalam satu query agregat"""
+    letter_counts = {
+        f'letter_{i}': Count('id', filter=Q(letter_grade=letter))
+        for i, (letter, _label) in enumerate(Grade.GRADE_CHOICES)
+    }
+    rows = Grade.objects.filter(course_id__in=course_ids).values('course_id').annotate(
+        enrolled=Count('id'),
+        graded=Count('final_grade'),
+        average=Avg('final_grade'),
+        minimum=Min('final_grade'),
+        maximum=Max('final_grade'),
+        **letter_counts,
+    ).order_by()
+
+    stats = {cid: empty_course_stats() for cid in course_ids}
+    for row in rows:
+        stats[row['course_id']] = {
+            'enrolled': row['enrolled'],
+            'graded': row['graded'],
+            'average': round(row['average'], 2) if row['average'] is not None else None,
+            'min': row['minimum'],
+            'max': row['maximum'],
+            'distribution': {
+                letter: row[f'letter_{i}']
+                for i, (letter, _label) in enumerate(Grade.GRADE_CHOICES)
+            },
+        }
+    return stats
+
+
+def empty_course_stats():
+    return {
+        'enrolled': 0,
+        'graded': 0,
+        'average': None,
+        'min': None,
+        'max': None,
+        'distribution': {letter: 0 for letter, _label in Grade.GRADE_CHOICES},
+    }
+
+
+def get_many_course_stats(course_ids):
+    """
+    Statistik untuk beberapa course: dibaca dari cache, yang belum ada
+    dihitung dalam satu query lalu disimpan.
+    """
+    course_ids = list(course_ids)
+    if not course_ids:
+        return {}
+
+    cache = _cache()
+    versions = _get_versions(course_ids)
+    keys = {_stats_key(cid, versions[cid]): cid for cid in course_ids}
+    stats = {keys[k]: v for k, v in cache.get_many(keys).items()}
+
+    missing = [cid for cid in course_ids if cid not in stats]
+    if missing:
+        fresh = compute_course_stats(missing)
+        cache.set_many(
+            {_stats_key(cid, versions[cid]): fresh[cid] for cid in missing},
+            CACHE_TIMEOUT,
+        )
+        stats.update(fresh)
+    return stats
+
+
+def get_course_stats(course_id):
+    return get_many_course_stats([course_id])[course_id]
@@ -0,0 +1,23 @@
+"""
+Pengaturan per koneksi database.
+
+SQLite: PRAGMA dari settings.SQLITE_PRAGMAS dijalankan setiap kali Django
+membuka koneksi baru (sinyal connection_created). journal_mode=WAL
+tersimpan di file database, PRAGMA lain berlaku per koneksi.
+
+PRAGMA dijalankan langsung di koneksi DB-API, bukan lewat cursor Django,
+supaya tidak melewati execute_wrappers: koneksi yang dibuka ulang di tengah
+request tidak menambah hitungan query view (users/instrumentation.py).
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    for name, value in pragmas.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}').close()
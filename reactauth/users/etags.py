@@ -0,0 +1,104 @@
+"""
+Validator ETag untuk dashboard (conditional GET).
+
+ETag dihitung dari jumlah baris + updated_at terbaru di scope dashboard,
+diambil sebagai subquery di query user yang memang sudah dijalankan,
+tanpa membangun payload. Klien yang polling dengan If-None-Match
+mendapat 304 setelah satu query.
+
+Dashboard mahasiswa juga memuat peringkat (ranking.py): anotasi peringkat
+dan jumlah/updated_at terbaru grade sekelas ikut di ETag, jadi perubahan
+nilai mahasiswa lain yang menggeser peringkat tidak menghasilkan 304.
+
+Nama user lain yang tampil (dosen di dashboard mahasiswa, mahasiswa di
+dashboard dosen) ikut lewat updated_at terbaru user tersebut.
+"""
+import hashlib
+
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.response import Response
+
+from .models import Course, Grade
+from .ranking import student_rank_annotations
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return "W/" + quote_etag(digest)
+
+
+def _scope_aggregate(queryset, owner_field, aggregate):
+    """Subquery skalar: agregat atas baris milik user luar (OuterRef('pk'))"""
+    return Subquery(
+        queryset.filter(**{owner_field: OuterRef('pk')})
+        .order_by()
+        .values(owner_field)
+        .annotate(value=aggregate)
+        .values('value')
+    )
+
+
+def _peer_grades():
+    """Grade dianotasi jumlah & updated_at terbaru grade di course yang sama (per course lewat index)"""
+    peers = Grade.objects.filter(course=OuterRef('course_id')).order_by()
+    return Grade.objects.annotate(
+        peer_count=Subquery(peers.values('course').annotate(n=Count('*')).values('n')),
+        peer_last=Subquery(peers.order_by('-updated_at').values('updated_at')[:1]),
+    )
+
+
+def student_etag_annotations():
+    """Anotasi untuk query user mahasiswa, sehingga ETag tanpa query tambahan"""
+    return {
+        'etag_grades': _scope_aggregate(Grade.objects, 'student', Count('id')),
+        'etag_grade_last': _scope_aggregate(Grade.objects, 'student', Max('updated_at')),
+        'etag_course_last': _scope_aggregate(Grade.objects, 'student', Max('course__updated_at')),
+        'etag_instructor_last': _scope_aggregate(Grade.objects, 'student', Max('course__instructor__updated_at')),
+        # Peringkat per course bergantung pada grade peserta lain
+        'etag_peer_grades': _scope_aggregate(_peer_grades(), 'student', Sum('peer_count')),
+        'etag_peer_last': _scope_aggregate(_peer_grades(), 'student', Max('peer_last')),
+        **student_rank_annotations(),
+    }
+
+
+def instructor_etag_annotations():
+    return {
+        'etag_courses': _scope_aggregate(Course.objects, 'instructor', Count('id')),
+        'etag_course_last': _scope_aggregate(Course.objects, 'instructor', Max('updated_at')),
+        'etag_grades': _scope_aggregate(Grade.objects, 'course__instructor', Count('id')),
+        'etag_grade_last': _scope_aggregate(Grade.objects, 'course__instructor', Max('updated_at')),
+        'etag_student_last': _scope_aggregate(Grade.objects, 'course__instructor', Max('student__updated_at')),
+    }
+
+
+def dashboard_etag(user, annotations):
+    """ETag dari user yang sudah dianotasi dengan *_etag_annotations()"""
+    return make_etag(
+        user.role, user.pk, user.full_name, user.email, user.major,
+        *(getattr(user, name) for name in annotations),
+    )
+
+
+def etag_matches(request, etag):
+    """True jika If-None-Match request cocok dengan etag"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    # Perbandingan lemah: abaikan prefix W/
+    wanted = {tag.removeprefix('W/') for tag in parse_etags(header)}
+    return '*' in wanted or etag.removeprefix('W/') in wanted
+
+
+def not_modified(request, etag):
+    """Response 304 jika If-None-Match cocok dengan etag, selain itu None"""
+    if etag_matches(request, etag):
+        return with_validator(Response(status=304), etag)
+    return None
+
+
+def with_validator(response, etag):
+    response['ETag'] = etag
+    # Klien boleh menyimpan, tapi wajib revalidasi setiap kali
+    response['Cache-Control'] = 'private, no-cache'
+    return response
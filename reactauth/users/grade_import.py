@@ -0,0 +1,179 @@
+"""
+Import nilai secara bulk (CSV / JSON) oleh dosen.
+
+Baris dibaca satu per satu, divalidasi, lalu dikumpulkan per chunk.
+Setiap chunk: satu query mahasiswa, satu query Grade yang sudah ada,
+nilai akhir dihitung sekaligus, lalu disimpan dengan bulk_create /
+bulk_update di dalam satu transaksi. Baris yang gagal tidak menghentikan
+import; semuanya dilaporkan di hasil. File yang ternyata bukan UTF-8 di
+tengah jalan menghentikan import: chunk yang sudah tersimpan tetap, dan
+hasilnya memuat 'error' untuk file tersebut.
+"""
+from contextlib import nullcontext
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, transaction
+
+from .bulk_rows import RowErrorCollector, iter_csv
+from .grading import compute_final_grades, save_grades
+from .instrumentation import batched_queries
+from .models import Course, CustomUser, Grade
+
+SCORE_FIELDS = ['assignment_score', 'midterm_score', 'final_score']
+REQUIRED_FIELDS = ['student_email', 'course_code']
+CHUNK_SIZE = 1000
+
+
+def iter_csv_rows(upload):
+    """Baca file CSV (UploadedFile) baris per baris tanpa memuat seluruh isi"""
+    return iter_csv(upload, REQUIRED_FIELDS)
+
+
+def _parse_score(value):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        score = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError("A valid number is required.")
+    if not score.is_finite():
+        raise ValueError("A valid number is required.")
+    if score < 0 or score > 100:
+        raise ValueError("Ensure this value is between 0 and 100.")
+    if score.as_tuple().exponent < -2:
+        raise ValueError("Ensure that there are no more than 2 decimal places.")
+    return score
+
+
+def validate_row(row):
+    """Kembalikan (data bersih, errors) untuk satu baris input"""
+    errors = {}
+    if not isinstance(row, dict):
+        return None, {'non_field_errors': ['Invalid row.']}
+
+    data = {}
+    for field in REQUIRED_FIELDS:
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            errors[field] = ['Not a valid string.']
+            value = ''
+        value = (value or '').strip()
+        if not value and field not in errors:
+            errors[field] = ['This field is required.']
+        data[field] = value
+    data['student_email'] = data['student_email'].lower()
+
+    for field in SCORE_FIELDS:
+        try:
+            data[field] = _parse_score(row.get(field))
+        except ValueError as exc:
+            errors[field] = [str(exc)]
+
+    return data, errors
+
+
+class GradeImporter(RowErrorCollector):
+    """Satu sesi import untuk satu dosen"""
+
+    def __init__(self, instructor, chunk_size=CHUNK_SIZE):
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.courses = {
+            course.code: course
+            for course in Course.objects.filter(instructor=instructor)
+        }
+        self.seen = set()
+        self.flushed = 0
+        self.created = 0
+        self.updated = 0
+
+    def run(self, rows):
+        chunk = []
+        file_error = None
+        try:
+            for row_number, row in enumerate(rows, start=1):
+                data, errors = validate_row(row)
+                if not errors and data['course_code'] not in self.courses:
+                    errors['course_code'] = ['Course not found or not taught by you.']
+                if errors:
+                    self.add_error(row_number, errors)
+                    continue
+
+                chunk.append((row_number, data))
+                if len(chunk) >= self.chunk_size:
+                    self.flush(chunk)
+                    chunk = []
+        except UnicodeDecodeError:
+            # Chunk sebelumnya sudah tersimpan: laporkan apa yang sudah masuk
+            file_error = 'File harus berupa CSV UTF-8; baris setelah bagian yang rusak tidak diimpor.'
+        if chunk:
+            self.flush(chunk)
+
+        report = {'created': self.created, 'updated': self.updated, **self.error_report()}
+        if file_error:
+            report['error'] = file_error
+        return report
+
+    def flush(self, chunk):
+        # Chunk setelah yang pertama: query tambahan yang dideklarasikan
+        with batched_queries() if self.flushed else nullcontext():
+            self.write_chunk(chunk)
+        self.flushed += 1
+
+    def write_chunk(self, chunk):
+        emails = {data['student_email'] for _, data in chunk}
+        students = {
+            s.email: s
+            for s in CustomUser.objects.filter(email__in=emails, role='student')
+        }
+        course_ids = {self.courses[data['course_code']].pk for _, data in chunk}
+        existing = {
+            (g.student_id, g.course_id): g
+            for g in Grade.objects.filter(
+                course_id__in=course_ids,
+                student__email__in=emails,
+            )
+        }
+
+        to_create, to_update, rows = [], [], []
+        for row_number, data in chunk:
+            student = students.get(data['student_email'])
+            if student is None:
+                self.add_error(row_number, {'student_email': ['Student not found.']})
+                continue
+            course = self.courses[data['course_code']]
+            key = (student.pk, course.pk)
+            if key in self.seen:
+                self.add_error(row_number, {'non_field_errors': ['Duplicate row for this student and course.']})
+                continue
+            self.seen.add(key)
+
+            grade = existing.get(key)
+            if grade is None:
+                grade = Grade(student=student, course=course)
+                to_create.append(grade)
+            else:
+                grade.course = course  # skema penilaian tanpa query tambahan
+                to_update.append(grade)
+            for field in SCORE_FIELDS:
+                # Kolom kosong = tidak diubah
+                if data[field] is not None:
+                    setattr(grade, field, data[field])
+            rows.append(row_number)
+
+        compute_final_grades(to_create + to_update)
+
+        try:
+            with transaction.atomic():
+                save_grades(to_update, SCORE_FIELDS + ['final_grade', 'letter_grade'], created=to_create)
+        except IntegrityError:
+            for row_number in rows:
+                self.add_error(row_number, {'non_field_errors': ['Conflicting write, please retry this row.']})
+            return
+
+        self.created += len(to_create)
+        self.updated += len(to_update)
+
+
+def import_grades(instructor, rows, chunk_size=CHUNK_SIZE):
+    return GradeImporter(instructor, chunk_size=chunk_size).run(rows)
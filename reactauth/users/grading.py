@@ -0,0 +1,180 @@
+"""
+Mesin perhitungan nilai akhir & nilai huruf.
+
+Dipakai oleh Grade.save(), import bulk, dan perintah hitung ulang, supaya
+semua jalur memberi hasil yang sama persis. Perhitungan dilakukan dalam
+bilangan bulat (skor dalam perseratus x bobot dalam persen) sehingga jalur
+NumPy dan Python murni memberi hasil identik; nilai akhir dibulatkan
+half-up ke dua desimal.
+
+Jika NumPy tersedia, perhitungan array memakai operasi vektor dan
+searchsorted atas ambang nilai huruf; jika tidak, dipakai bisect.
+"""
+from bisect import bisect_right
+from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy opsional
+    np = None
+
+# Bobot default (persen): tugas, UTS, UAS
+DEFAULT_WEIGHTS = (30, 30, 40)
+
+# Nilai minimum untuk setiap huruf, dari tertinggi; di bawah semuanya = 'E'
+DEFAULT_CUTOFFS = (
+    ('A', 85), ('A-', 80), ('B+', 75), ('B', 70), ('B-', 65),
+    ('C+', 60), ('C', 55), ('D', 40),
+)
+LOWEST_LETTER = 'E'
+# Urutan huruf dari tertinggi, untuk memeriksa ambang kustom
+LETTER_ORDER = [letter for letter, _score in DEFAULT_CUTOFFS] + [LOWEST_LETTER]
+
+
+def _hundredths(value):
+    """Decimal/float/int -> int dalam satuan 0.01 (sama dengan np.rint(x * 100))"""
+    return round(float(value) * 100)
+
+
+class GradingScheme:
+    """Bobot komponen + ambang nilai huruf untuk satu mata kuliah"""
+
+    def __init__(self, weights=DEFAULT_WEIGHTS, cutoffs=DEFAULT_CUTOFFS):
+        weights = tuple(int(w) for w in weights)
+        if len(weights) != 3 or any(w < 0 for w in weights) or sum(weights) != 100:
+            raise ValueError("Bobot harus tiga angka non-negatif dengan total 100.")
+        cutoffs = sorted(((letter, _hundredths(score)) for letter, score in cutoffs),
+                         key=lambda c: c[1])
+        if len({score for _letter, score in cutoffs}) != len(cutoffs):
+            raise ValueError("Ambang nilai huruf tidak boleh sama.")
+        if any(letter not in LETTER_ORDER for letter, _score in cutoffs):
+            raise ValueError(f"Huruf harus salah satu dari {', '.join(LETTER_ORDER)}.")
+        # Urut naik menurut skor => huruf harus urut dari terendah ke tertinggi
+        ranks = [LETTER_ORDER.index(letter) for letter, _score in cutoffs]
+        if any(lower <= higher for lower, higher in zip(ranks, ranks[1:])):
+            raise ValueError("Ambang nilai huruf harus menurun dari huruf tertinggi ke terendah.")
+
+        self.weights = weights
+        # Urut naik: thresholds[i] adalah nilai minimum untuk letters[i + 1]
+        self.thresholds = [score for _letter, score in cutoffs]
+        self.letters = [LOWEST_LETTER] + [letter for letter, _score in cutoffs]
+        self._np_thresholds = np.array(self.thresholds, dtype=np.int64) if np is not None else None
+        self._np_letters = np.array(self.letters, dtype=object) if np is not None else None
+
+    @classmethod
+    def for_course(cls, course):
+        if course is None:
+            return DEFAULT_SCHEME
+        weights = (course.assignment_weight, course.midterm_weight, course.final_weight)
+        cutoffs = course.grade_cutoffs
+        if weights == DEFAULT_WEIGHTS and not cutoffs:
+            return DEFAULT_SCHEME
+        return cls(weights, cutoffs.items() if cutoffs else DEFAULT_CUTOFFS)
+
+    def _total(self, a, m, f):
+        wa, wm, wf = self.weights
+        # satuan 0.0001 -> dibulatkan half-up ke 0.01
+        return (a * wa + m * wm + f * wf + 50) // 100
+
+    def letter_for(self, final_hundredths):
+        return self.letters[bisect_right(self.thresholds, final_hundredths)]
+
+    def compute_one(self, assignment_score, midterm_score, final_score):
+        """(nilai akhir Decimal, huruf), atau None jika ada komponen kosong"""
+        if assignment_score is None or midterm_score is None or final_score is None:
+            return None
+        total = self._total(_hundredths(assignment_score),
+                            _hundredths(midterm_score),
+                            _hundredths(final_score))
+        return Decimal(total).scaleb(-2), self.letter_for(total)
+
+    def compute(self, assignment_scores, midterm_scores, final_scores):
+        """
+        Versi array dari compute_one. Mengembalikan list sepanjang input
+        berisi (nilai akhir, huruf) atau None.
+        """
+        if np is not None:
+            return self._compute_numpy(assignment_scores, midterm_scores, final_scores)
+        return [
+            self.compute_one(a, m, f)
+            for a, m, f in zip(assignment_scores, midterm_scores, final_scores)
+        ]
+
+    def _compute_numpy(self, assignment_scores, midterm_scores, final_scores):
+        # None -> NaN, sehingga baris yang belum lengkap bisa di-mask
+        scores = np.array([assignment_scores, midterm_scores, final_scores], dtype=np.float64)
+        complete = ~np.isnan(scores).any(axis=0)
+        hundredths = np.rint(scores[:, complete] * 100).astype(np.int64)
+
+        weights = np.array(self.weights, dtype=np.int64)[:, None]
+        totals = ((hundredths * weights).sum(axis=0) + 50) // 100
+        letters = self._np_letters[np.searchsorted(self._np_thresholds, totals, side='right')]
+
+        results = [None] * scores.shape[1]
+        for i, total, letter in zip(np.flatnonzero(complete).tolist(), totals.tolist(), letters.tolist()):
+            results[i] = (Decimal(total).scaleb(-2), letter)
+        return results
+
+
+DEFAULT_SCHEME = GradingScheme()
+
+
+def compute_final_grades(grades):
+    """
+    Isi final_grade/letter_grade untuk sekumpulan Grade (belum disimpan),
+    dikelompokkan per skema mata kuliah. Grade dengan komponen belum
+    lengkap dibiarkan apa adanya, sama seperti Grade.save().
+    """
+    by_course = {}
+    for grade in grades:
+        key = grade.course_id if grade.course_id is not None else id(grade.course)
+        by_course.setdefault(key, []).append(grade)
+
+    for group in by_course.values():
+        scheme = GradingScheme.for_course(group[0].course)
+        results = scheme.compute(
+            [g.assignment_score for g in group],
+            [g.midterm_score for g in group],
+            [g.final_score for g in group],
+        )
+        for grade, result in zip(group, results):
+            if result is not None:
+                grade.final_grade, grade.letter_grade = result
+    return grades
+
+
+def save_grades(updated, fields, created=()):
+    """
+    Tulis Grade hasil compute_final_grades lewat jalur bulk, lalu perbarui
+    semua turunannya. bulk_update tidak menjalankan auto_now dan bulk_* tidak
+    memicu signal, jadi updated_at (watermark analytics), ringkasan
+    mahasiswa, statistik course dan cache dashboard diurus di sini - jalur
+    bulk Grade wajib lewat fungsi ini.
+
+    `fields`: kolom yang ditulis bulk_update (updated_at ditambahkan).
+    Berjalan di transaksi pemanggil jika ada (tanpa savepoint tambahan).
+    """
+    from django.db import transaction
+    from django.utils import timezone
+
+    from .course_stats import invalidate_course_stats
+    from .instrumentation import allow_batches
+    from .models import Grade
+    from .response_cache import invalidate_dashboards
+    from .summaries import refresh_student_summaries
+
+    grades = [*created, *updated]
+    if not grades:
+        return
+    now = timezone.now()
+    for grade in updated:
+        grade.updated_at = now
+    # INSERT: semua kolom kecuali id; UPDATE: pk dua kali (CASE & WHERE) + kolom
+    allow_batches(len(created), len(Grade._meta.concrete_fields) - 1)
+    allow_batches(len(updated), 2 + len(fields) + 1)
+    with transaction.atomic(savepoint=False):
+        Grade.objects.bulk_create(created)
+        Grade.objects.bulk_update(updated, [*fields, 'updated_at'])
+        refresh_student_summaries({g.student_id for g in grades})
+        invalidate_course_stats(*{g.course_id for g in grades})
+        invalidate_dashboards()
@@ -0,0 +1,50 @@
+"""
+Password hasher dengan parameter dari settings.PASSWORD_HASHER_PARAMS.
+
+Nama algoritma sama dengan hasher bawaan Django, jadi hash lama tetap
+terbaca. Jika parameter di settings berubah, must_update() bernilai True
+dan check_password() menyimpan ulang hash dengan parameter baru saat user
+berhasil login (upgrade transparan, tanpa migrasi data).
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BCryptSHA256PasswordHasher,
+    PBKDF2PasswordHasher,
+)
+
+
+def _param(profile, name, default):
+    return getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(profile, {}).get(name, default)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id (butuh argon2-cffi)"""
+
+    @property
+    def time_cost(self):
+        return _param('argon2', 'time_cost', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _param('argon2', 'memory_cost', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _param('argon2', 'parallelism', Argon2PasswordHasher.parallelism)
+
+
+class TunedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """bcrypt atas SHA-256 dari password (butuh bcrypt)"""
+
+    @property
+    def rounds(self):
+        return _param('bcrypt', 'rounds', BCryptSHA256PasswordHasher.rounds)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 (tanpa dependensi tambahan)"""
+
+    @property
+    def iterations(self):
+        return _param('pbkdf2', 'iterations', PBKDF2PasswordHasher.iterations)
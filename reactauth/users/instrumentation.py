@@ -0,0 +1,250 @@
+"""
+Instrumentasi per view: jumlah query, waktu DB, waktu render JSON dan
+latensi total.
+
+Aktif jika InstrumentationMiddleware ada di MIDDLEWARE (settings
+API_INSTRUMENTATION). Setiap respons mendapat header Server-Timing, dan
+angka-angkanya dikumpulkan ke histogram in-process (per proses worker)
+yang bisa dibaca admin lewat endpoint metrics/.
+
+Query dihitung lewat execute_wrapper yang dipasang di setiap koneksi baru
+dan mencatat ke request yang sedang aktif (ContextVar), sehingga query di
+view async (thread sync_to_async) juga ikut terhitung.
+
+Bulk write yang dipecah per batas parameter database menambah query sesuai
+jumlah baris; jalur bulk mendeklarasikannya lewat allow_batches() /
+batched_queries() dan batch tambahan itu ditambahkan ke budget view
+(query_budget).
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+# Batas atas bucket histogram latensi (ms); bucket terakhir = sisanya
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_current = ContextVar('users_request_timings', default=None)
+
+
+class RequestTimings:
+    """Angka untuk satu request"""
+
+    __slots__ = ('queries', 'batched', 'db', 'render')
+
+    def __init__(self):
+        self.queries = 0
+        self.batched = 0
+        self.db = 0.0
+        self.render = 0.0
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def extra_batches(rows, columns, batch_size=None, using=DEFAULT_DB_ALIAS):
+    """
+    Query tambahan saat bulk write `rows` baris x `columns` parameter per
+    baris dipecah seperti Django (SQLite: 999 // columns, dibatasi
+    batch_size)
+    """
+    if not rows:
+        return 0
+    size = max(connections[using].ops.bulk_batch_size([None] * columns, [None] * rows), 1)
+    if batch_size:
+        size = min(size, batch_size)
+    return -(-rows // size) - 1
+
+
+def allow_batches(rows, columns, batch_size=None, using=DEFAULT_DB_ALIAS):
+    """Deklarasikan batch tambahan bulk write di request yang aktif"""
+    timings = _current.get()
+    if timings is not None:
+        timings.batched += extra_batches(rows, columns, batch_size, using)
+
+
+@contextmanager
+def batched_queries():
+    """
+    Semua query di dalam blok dihitung sebagai batch tambahan yang
+    dideklarasikan (misal chunk import setelah chunk pertama)
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    queries, batched = timings.queries, timings.batched
+    try:
+        yield
+    finally:
+        timings.batched = batched + timings.queries - queries
+
+
+@contextmanager
+def timed_render():
+    """Dipakai renderer JSON: catat lama render ke request yang aktif"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.render += time.perf_counter() - start
+
+
+class ViewMetrics:
+    """Histogram latensi + total query/DB/render per view (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def record(self, view, timings, total):
+        latency_ms = total * 1000
+        with self._lock:
+            entry = self._views.get(view)
+            if entry is None:
+                entry = self._views[view] = {
+                    'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'queries': 0, 'max_queries': 0, 'max_batched': 0, 'db_ms': 0.0, 'render_ms': 0.0,
+                    'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                }
+            entry['count'] += 1
+            entry['total_ms'] += latency_ms
+            entry['max_ms'] = max(entry['max_ms'], latency_ms)
+            entry['queries'] += timings.queries
+            entry['max_queries'] = max(entry['max_queries'], timings.queries)
+            entry['max_batched'] = max(entry['max_batched'], timings.batched)
+            entry['db_ms'] += timings.db * 1000
+            entry['render_ms'] += timings.render * 1000
+            entry['buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            views = {view: dict(entry, buckets=list(entry['buckets'])) for view, entry in self._views.items()}
+
+        result = {}
+        for view, entry in sorted(views.items()):
+            count = entry['count']
+            result[view] = {
+                'count': count,
+                'avg_ms': round(entry['total_ms'] / count, 2),
+                'p50_ms': _percentile(entry['buckets'], count, 0.50),
+                'p99_ms': _percentile(entry['buckets'], count, 0.99),
+                'max_ms': round(entry['max_ms'], 2),
+                'avg_queries': round(entry['queries'] / count, 2),
+                'max_queries': entry['max_queries'],
+                'max_batched': entry['max_batched'],
+                'avg_db_ms': round(entry['db_ms'] / count, 2),
+                'avg_render_ms': round(entry['render_ms'] / count, 2),
+                'histogram_ms': {
+                    (f'<={bound}' if bound is not None else f'>{LATENCY_BUCKETS_MS[-1]}'): n
+                    for bound, n in zip((*LATENCY_BUCKETS_MS, None), entry['buckets'])
+                },
+            }
+        return result
+
+
+def _percentile(buckets, count, fraction):
+    """Batas atas bucket yang memuat persentil (None jika di bucket terakhir)"""
+    target = max(1, round(count * fraction))
+    seen = 0
+    for bound, n in zip(LATENCY_BUCKETS_MS, buckets):
+        seen += n
+        if seen >= target:
+            return bound
+    return None
+
+
+metrics = ViewMetrics()
+
+
+def query_budget(view, batched=0):
+    """Budget view dari settings + batch bulk write yang dideklarasikan"""
+    budgets = getattr(settings, 'API_QUERY_BUDGETS', {})
+    return budgets.get(view, getattr(settings, 'API_QUERY_BUDGET', 10)) + batched
+
+
+class InstrumentationMiddleware:
+    """Server-Timing + histogram per view + peringatan query budget"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    def finish(self, request, response, timings, total):
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else '<unresolved>'
+        metrics.record(view, timings, total)
+
+        response['Server-Timing'] = (
+            f'db;dur={timings.db * 1000:.1f};desc="{timings.queries} queries", '
+            f'render;dur={timings.render * 1000:.1f}, '
+            f'total;dur={total * 1000:.1f}'
+        )
+
+        budget = query_budget(view, timings.batched)
+        if timings.queries > budget:
+            logger.warning(
+                "query budget exceeded: view=%s queries=%d budget=%d batched=%d method=%s path=%s",
+                view, timings.queries, budget, timings.batched, request.method, request.path,
+            )
+        return response
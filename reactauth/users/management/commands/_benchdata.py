@@ -0,0 +1,183 @@
+"""Data & utilitas bersama untuk perintah bench_* (bukan perintah manage.py)"""
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from users.grading import compute_final_grades
+from users.models import Course, CustomUser, Grade
+from users.response_cache import invalidate_dashboards
+from users.summaries import refresh_student_summaries
+
+# Penanda username data bench: ':' ditolak validator username, jadi akun
+# asli (registrasi, admin, provisioning) tidak mungkin memilikinya
+BENCH_USERNAME_PREFIX = 'bench:'
+
+# Data seed_bench (di-commit, dipakai bench_suite); penanda sama seperti di atas
+SEED_USERNAME_PREFIX = 'seed:'
+SEED_PASSWORD = 'seed-password-123'
+SEED_COHORTS = 4
+
+
+def seed_gradebook(rows, students=100, per_course=100):
+    """
+    Satu dosen dengan rows grade tersebar di beberapa course, dibuat dengan
+    bulk_create (tanpa signal). Panggil di dalam transaksi yang di-rollback.
+    """
+    # Peserta per course tidak bisa melebihi jumlah mahasiswa (unique student+course)
+    per_course = min(per_course, students)
+    instructor = CustomUser.objects.create(
+        email='bench-dosen@prasetiyamulya.ac.id', username=f'{BENCH_USERNAME_PREFIX}dosen',
+        full_name='Bench Dosen', role='instructor',
+    )
+    courses = Course.objects.bulk_create([
+        Course(code=f'BENCH{i:03d}', name=f'Bench {i}', credits=3, semester='1',
+               major='business_mathematics', instructor=instructor)
+        for i in range(max(1, -(-rows // per_course)))
+    ])
+    student_rows = CustomUser.objects.bulk_create([
+        CustomUser(email=f'bench{i}@student.prasetiyamulya.ac.id', username=f'{BENCH_USERNAME_PREFIX}{i}',
+                   full_name=f'Bench {i}', role='student')
+        for i in range(students)
+    ])
+    grades = [
+        Grade(student=student_rows[i % students], course=courses[i // per_course],
+              assignment_score=Decimal(i % 101), midterm_score=Decimal(50),
+              final_score=Decimal('75.50'))
+        for i in range(rows)
+    ]
+    for grade in grades:
+        grade.calculate_final_grade()
+    Grade.objects.bulk_create(grades, batch_size=1000)
+    return instructor
+
+
+def require_bench_database(confirmed=False):
+    """Tolak perintah yang meng-commit/menghapus data bench kecuali DB-nya memang untuk bench"""
+    if confirmed or getattr(settings, 'BENCH_DATABASE', False):
+        return
+    raise CommandError(
+        f"Perintah ini menulis dan menghapus data di database {connection.settings_dict['NAME']!r}. "
+        "Set BENCH_DATABASE=1 untuk database bench/test, atau tambahkan --yes-i-mean-it."
+    )
+
+
+def bench_users():
+    return CustomUser.objects.filter(username__startswith=BENCH_USERNAME_PREFIX)
+
+
+def refresh_bench_summaries():
+    """Ringkasan hanya untuk mahasiswa bench, bukan seluruh mahasiswa di database"""
+    return refresh_student_summaries(list(bench_users().filter(role='student').values_list('pk', flat=True)))
+
+
+def delete_gradebook():
+    """Hapus data seed_gradebook yang sudah di-commit (misal untuk load test)"""
+    with transaction.atomic():
+        # Hanya course milik dosen bench; kode BENCH* saja bukan penanda
+        course_ids = list(Course.objects.filter(instructor__in=bench_users()).values_list('pk', flat=True))
+        # Hapus user dulu: grade ikut ter-cascade tanpa refresh ringkasan per baris
+        bench_users().delete()
+        Course.objects.filter(pk__in=course_ids).delete()
+
+
+def best_of(func, repeat):
+    """(waktu terbaik dalam detik, hasil terakhir)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _score(rng, ability):
+    return Decimal(min(100.0, max(0.0, rng.gauss(ability, 10)))).quantize(Decimal('0.01'))
+
+
+def seed_cohorts(students=50_000, courses=2_000, grades=1_000_000, seed=0,
+                 batch_size=5_000, on_progress=None):
+    """
+    Data sintetis berskala besar: mahasiswa di semua MAJOR_CHOICES dan
+    SEED_COHORTS angkatan, course di semua jurusan x 8 semester (5 per
+    dosen), dan grades//students course per mahasiswa dari jurusannya
+    sendiri. Nilai mengikuti kemampuan per mahasiswa; ~5% belum ada UAS.
+    Semua ditulis dengan bulk_create; ringkasan tidak dibuat di sini.
+    Kembalikan jumlah baris yang dibuat per model.
+    """
+    rng = random.Random(seed)
+    majors = [value for value, _label in CustomUser.MAJOR_CHOICES]
+    semesters = [value for value, _label in Course.SEMESTER_CHOICES]
+    password = make_password(SEED_PASSWORD)  # satu hash untuk semua akun
+    now = timezone.now()
+
+    instructors = CustomUser.objects.bulk_create([
+        CustomUser(email=f'seed-dosen{i}@prasetiyamulya.ac.id', username=f'{SEED_USERNAME_PREFIX}dosen{i}',
+                   full_name=f'Seed Dosen {i}', major=majors[i % len(majors)],
+                   role='instructor', password=password)
+        for i in range(max(1, courses // 5))
+    ], batch_size=batch_size)
+
+    course_rows = Course.objects.bulk_create([
+        Course(code=f'SEED{i:05d}', name=f'Seed Course {i}', semester=semesters[(i // len(majors)) % len(semesters)],
+               major=majors[i % len(majors)], credits=rng.choice([2, 3, 3, 3, 4, 6]),
+               instructor=instructors[i // 5 % len(instructors)])
+        for i in range(courses)
+    ], batch_size=batch_size)
+    by_major = {major: [c for c in course_rows if c.major == major] for major in majors}
+
+    per_student = min(grades // max(students, 1), min(len(c) for c in by_major.values()))
+    created = {'instructors': len(instructors), 'courses': len(course_rows), 'students': 0, 'grades': 0}
+    for start in range(0, students, batch_size):
+        batch = CustomUser.objects.bulk_create([
+            CustomUser(email=f'seed{i}@student.prasetiyamulya.ac.id', username=f'{SEED_USERNAME_PREFIX}{i}',
+                       full_name=f'Seed Student {i}', major=majors[i % len(majors)], role='student',
+                       password=password, date_joined=now - timedelta(days=365 * (i % SEED_COHORTS)))
+            for i in range(start, min(start + batch_size, students))
+        ])
+        rows = []
+        for student in batch:
+            ability = rng.gauss(75, 8)
+            for course in rng.sample(by_major[student.major], per_student):
+                rows.append(Grade(
+                    student=student, course=course,
+                    assignment_score=_score(rng, ability), midterm_score=_score(rng, ability),
+                    final_score=_score(rng, ability) if rng.random() > 0.05 else None,
+                ))
+        compute_final_grades(rows)
+        Grade.objects.bulk_create(rows, batch_size=batch_size)
+        created['students'] += len(batch)
+        created['grades'] += len(rows)
+        if on_progress:
+            on_progress(created)
+    return created
+
+
+def seeded_users():
+    return CustomUser.objects.filter(username__startswith=SEED_USERNAME_PREFIX)
+
+
+def seeded_courses():
+    return Course.objects.filter(instructor__in=seeded_users())
+
+
+def delete_cohorts():
+    """
+    Hapus data seed_cohorts dalam satu transaksi. Grade (bisa jutaan baris)
+    dihapus dengan satu DELETE tanpa signal: ringkasan mahasiswa seed ikut
+    ter-cascade bersama user-nya dan rollup bersama course-nya, jadi tidak
+    ada tabel turunan yang tertinggal. Cache dashboard diinvalidasi sekali.
+    """
+    with transaction.atomic():
+        course_ids = list(seeded_courses().values_list('pk', flat=True))
+        grades = Grade.objects.filter(course_id__in=course_ids)
+        grades._raw_delete(grades.db)
+        seeded_users().delete()
+        Course.objects.filter(pk__in=course_ids).delete()
+    invalidate_dashboards()
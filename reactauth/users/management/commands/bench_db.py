@@ -0,0 +1,114 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from users.models import Grade
+
+from ._benchdata import (
+    bench_users, delete_gradebook, refresh_bench_summaries, require_bench_database, seed_gradebook,
+)
+
+# PRAGMA bawaan SQLite (tanpa tuning) sebagai pembanding
+SQLITE_DEFAULT_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'mmap_size': 0}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark request/s dashboard mahasiswa dengan dan tanpa koneksi "
+        "persisten + PRAGMA SQLite (WAL). Beberapa thread klien, sebagian "
+        "iterasi menulis Grade. Data bench di-commit lalu dihapus."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=5.0, help="durasi per konfigurasi")
+        parser.add_argument('--write-every', type=int, default=10, help="1 tulis per N request (0 = baca saja)")
+        parser.add_argument('--students', type=int, default=200)
+        parser.add_argument('--yes-i-mean-it', action='store_true',
+                            help="Jalankan walau BENCH_DATABASE tidak diset")
+
+    def handle(self, *args, **options):
+        require_bench_database(options['yes_i_mean_it'])
+        if options['students'] < 1:
+            raise CommandError("--students minimal 1.")
+        database = connections.settings['default']
+        configs = [('tanpa tuning', 0, SQLITE_DEFAULT_PRAGMAS)]
+        configs.append(('CONN_MAX_AGE=60 + PRAGMA', 60, {**settings.SQLITE_PRAGMAS, **settings.SQLITE_WAL_PRAGMAS}))
+        if connection.vendor != 'sqlite':
+            configs = [('CONN_MAX_AGE=0', 0, {}), ('CONN_MAX_AGE=60', 60, {})]
+        if str(database['NAME']).startswith(('file:', ':memory:')):
+            raise CommandError("Butuh database file, bukan in-memory.")
+
+        journal_mode = None
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                (journal_mode,) = cursor.fetchone()
+
+        delete_gradebook()
+        seed_gradebook(options['students'] * 10, students=options['students'])
+        refresh_bench_summaries()
+        grade_ids = list(Grade.objects.filter(student__in=bench_users()).values_list('pk', flat=True))
+        original_max_age = database['CONN_MAX_AGE']
+        try:
+            self.stdout.write(f"{'konfigurasi':<28} {'req/s':>8} {'error':>6}")
+            for label, max_age, pragmas in configs:
+                database['CONN_MAX_AGE'] = max_age
+                with override_settings(
+                    SQLITE_PRAGMAS=pragmas,
+                    ALLOWED_HOSTS=['testserver'],
+                    CACHES={**settings.CACHES, 'bench-dummy': {
+                        'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+                    DASHBOARD_CACHE_ALIAS='bench-dummy',
+                ):
+                    connection.close()
+                    connection.ensure_connection()  # terapkan journal_mode ke file
+                    connection.close()
+                    rate, errors = self.run(options, grade_ids)
+                self.stdout.write(f"{label:<28} {rate:8.1f} {errors:6d}")
+        finally:
+            database['CONN_MAX_AGE'] = original_max_age
+            delete_gradebook()
+            if journal_mode:
+                # journal_mode tersimpan di file: kembalikan seperti sebelum bench
+                with connection.cursor() as cursor:
+                    cursor.execute(f'PRAGMA journal_mode = {journal_mode}')
+
+    def run(self, options, grade_ids):
+        url = reverse('student_dashboard')
+        deadline = time.perf_counter() + options['seconds']
+        counts = []
+        lock = threading.Lock()
+
+        def worker(n):
+            client = Client()
+            done = errors = 0
+            while time.perf_counter() < deadline:
+                email = f'bench{(n * 7919 + done) % options["students"]}@student.prasetiyamulya.ac.id'
+                write = options['write_every'] and done % options['write_every'] == 0
+                if write:
+                    grade = Grade.objects.select_related('course').get(pk=grade_ids[(n * 31 + done) % len(grade_ids)])
+                    grade.final_score = (grade.final_score + 1) % 100
+                    grade.save()
+                    connection.close_if_unusable_or_obsolete()
+                response = client.get(url, {'email': email})
+                errors += response.status_code != 200
+                done += 1
+            connection.close()
+            with lock:
+                counts.append((done, errors))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(options['threads'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return sum(c for c, _e in counts) / elapsed, sum(e for _c, e in counts)
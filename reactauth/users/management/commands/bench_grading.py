@@ -0,0 +1,67 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from users import grading
+from users.grading import DEFAULT_SCHEME, compute_final_grades
+from users.models import Course, Grade
+
+
+class Command(BaseCommand):
+    help = "Benchmark: Grade.calculate_final_grade per baris vs grading.compute_final_grades (tanpa DB)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def make_grades(self, rows, seed):
+        rng = random.Random(seed)
+        course = Course(code='BENCH', credits=3, semester='1')
+
+        def score():
+            return Decimal(rng.randint(0, 10_000)).scaleb(-2)
+
+        return [
+            Grade(course=course, assignment_score=score(), midterm_score=score(), final_score=score())
+            for _ in range(rows)
+        ]
+
+    def timed(self, label, rows, func):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{label:<28} {elapsed * 1000:10.1f} ms  {rows / elapsed:12,.0f} rows/s")
+        return elapsed
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        backend = 'numpy' if grading.np is not None else 'pure python'
+        self.stdout.write(f"{rows:,} baris, backend batch: {backend}")
+
+        per_instance = self.make_grades(rows, options['seed'])
+        batch = self.make_grades(rows, options['seed'])
+
+        def run_per_instance():
+            for grade in per_instance:
+                grade.calculate_final_grade()
+
+        slow = self.timed('per-instance', rows, run_per_instance)
+        fast = self.timed('batch (compute_final_grades)', rows, lambda: compute_final_grades(batch))
+
+        # Inti perhitungan saja, tanpa akses atribut model
+        columns = (
+            [g.assignment_score for g in batch],
+            [g.midterm_score for g in batch],
+            [g.final_score for g in batch],
+        )
+        self.timed('engine: compute_one loop', rows,
+                   lambda: [DEFAULT_SCHEME.compute_one(*row) for row in zip(*columns)])
+        self.timed('engine: compute (array)', rows, lambda: DEFAULT_SCHEME.compute(*columns))
+
+        mismatches = sum(
+            (a.final_grade, a.letter_grade) != (b.final_grade, b.letter_grade)
+            for a, b in zip(per_instance, batch)
+        )
+        self.stdout.write(f"speedup: {slow / fast:.2f}x, hasil berbeda: {mismatches}")
@@ -0,0 +1,90 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from users.models import CustomUser
+from users.views import CustomTokenObtainPairView
+
+PASSWORD = 'bench-password-123'
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark throughput login (POST /login/, termasuk pembuatan JWT) per "
+        "profil password hasher, satu proses = satu core. Contoh: "
+        "bench_login --profile pbkdf2 --param pbkdf2.iterations=600000"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile', action='append', choices=sorted(settings.PASSWORD_HASHER_PROFILES),
+            help="Profil yang diukur (boleh berulang); default semua profil",
+        )
+        parser.add_argument(
+            '--param', action='append', default=[], metavar='PROFIL.NAMA=NILAI',
+            help="Override PASSWORD_HASHER_PARAMS, misal argon2.memory_cost=32768",
+        )
+        parser.add_argument('--logins', type=int, default=20)
+
+    def handle(self, *args, **options):
+        params = self.parse_params(options['param'])
+        profiles = options['profile'] or sorted(settings.PASSWORD_HASHER_PROFILES)
+
+        self.stdout.write(f"{'profil':<8} {'parameter':<48} {'hash ms':>9} {'login ms':>9} {'login/s/core':>13}")
+        for profile in profiles:
+            hashers = settings.PASSWORD_HASHER_PROFILES[profile]
+            with override_settings(PASSWORD_HASHERS=hashers, PASSWORD_HASHER_PARAMS=params):
+                hasher = get_hasher()
+                try:
+                    if hasher.library:
+                        hasher._load_library()
+                except ValueError as exc:
+                    self.stdout.write(self.style.WARNING(f"{profile:<8} dilewati: {exc}"))
+                    continue
+                with transaction.atomic():
+                    self.run(profile, params.get(profile, {}), options['logins'])
+                    transaction.set_rollback(True)
+
+    def parse_params(self, items):
+        params = copy.deepcopy(getattr(settings, 'PASSWORD_HASHER_PARAMS', {}))
+        for item in items:
+            try:
+                name, value = item.split('=', 1)
+                profile, key = name.split('.', 1)
+                params.setdefault(profile, {})[key] = int(value)
+            except ValueError:
+                raise CommandError(f"--param tidak valid: {item!r} (format PROFIL.NAMA=ANGKA)")
+        return params
+
+    def run(self, profile, params, logins):
+        user = CustomUser.objects.create_user(
+            email='bench-login@student.prasetiyamulya.ac.id', username='bench-login',
+            password=PASSWORD, full_name='Bench Login', role='student',
+        )
+
+        start = time.process_time()
+        for _ in range(logins):
+            user.check_password(PASSWORD)
+        hash_seconds = (time.process_time() - start) / logins
+
+        factory = APIRequestFactory()
+        view = CustomTokenObtainPairView.as_view()
+        body = {'email': user.email, 'password': PASSWORD}
+        start = time.process_time()
+        for _ in range(logins):
+            response = view(factory.post('/login/', body, format='json'))
+            if response.status_code != 200:
+                raise CommandError(f"Login gagal ({response.status_code}): {response.data}")
+        login_seconds = (time.process_time() - start) / logins
+
+        described = ', '.join(f'{k}={v}' for k, v in sorted(params.items())) or '-'
+        self.stdout.write(
+            f"{profile:<8} {described:<48} {hash_seconds * 1000:9.1f} "
+            f"{login_seconds * 1000:9.1f} {1 / login_seconds:13.1f}"
+        )
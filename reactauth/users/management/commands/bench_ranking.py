@@ -0,0 +1,92 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import Mod, Rank
+from django.utils import timezone
+
+from users.models import CustomUser, StudentSummary
+from users.ranking import student_rank_annotations
+from users.summaries import refresh_student_summaries
+
+from ._benchdata import bench_users, best_of, seed_gradebook
+
+MAJORS = [value for value, _label in CustomUser.MAJOR_CHOICES]
+COHORTS = 4
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark peringkat IPK per jurusan/angkatan: RANK() OVER per request "
+        "vs subquery di index (major, gpa)/(cohort, gpa). Data dibuat di dalam "
+        "transaksi yang di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=50_000)
+        parser.add_argument('--courses-per-student', type=int, default=4)
+        parser.add_argument('--lookups', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        students = options['students']
+        with transaction.atomic():
+            seed_gradebook(students * options['courses_per_student'],
+                           students=students, per_course=students // 10 or 1)
+            self.spread_students()
+            refresh_student_summaries()
+            self.run(options['lookups'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def spread_students(self):
+        """Bagi mahasiswa bench ke semua jurusan dan COHORTS angkatan"""
+        bench = bench_users().filter(role='student')
+        now = timezone.now()
+        for i, major in enumerate(MAJORS):
+            bench.annotate(bucket=Mod('id', len(MAJORS))).filter(bucket=i).update(major=major)
+        for i in range(COHORTS):
+            bench.annotate(bucket=Mod('id', COHORTS)).filter(bucket=i).update(
+                date_joined=now.replace(year=now.year - i)
+            )
+
+    def run(self, lookups, repeat):
+        ids = list(
+            StudentSummary.objects.filter(student__in=bench_users())
+            .values_list('student_id', flat=True)
+        )
+        sample = random.Random(0).sample(ids, min(lookups, len(ids)))
+        users = CustomUser.objects.select_related('summary')
+
+        def naive():
+            # Sort seluruh partisi per request, lalu cari mahasiswanya
+            result = {}
+            for student_id in sample:
+                user = users.get(pk=student_id)
+                ranks = []
+                for scope in ('major', 'cohort'):
+                    ranked = StudentSummary.objects.filter(
+                        graded_courses__gt=0, **{scope: getattr(user.summary, scope)}
+                    ).annotate(rank=Window(Rank(), order_by=F('gpa').desc()))
+                    ranks.append(next(r for s, r in ranked.values_list('student_id', 'rank') if s == student_id))
+                result[student_id] = tuple(ranks)
+            return result
+
+        annotated = users.annotate(**student_rank_annotations())
+
+        def indexed():
+            result = {}
+            for student_id in sample:
+                user = annotated.get(pk=student_id)
+                result[student_id] = (user.rank_major_above + 1, user.rank_cohort_above + 1)
+            return result
+
+        slow, slow_ranks = best_of(naive, repeat)
+        fast, fast_ranks = best_of(indexed, repeat)
+
+        self.stdout.write(
+            f"{len(ids):,} mahasiswa, {len(sample)} lookup (terbaik dari {repeat}, per lookup)"
+        )
+        self.stdout.write(f"RANK() OVER per request  {slow / len(sample) * 1000:9.2f} ms")
+        self.stdout.write(f"subquery di index        {fast / len(sample) * 1000:9.2f} ms")
+        self.stdout.write(f"speedup: {slow / fast:.1f}x, peringkat identik: {slow_ranks == fast_ranks}")
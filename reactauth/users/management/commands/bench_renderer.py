@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from users.renderers import FastJSONRenderer, orjson
+from users.views import InstructorDashboardView
+
+from ._benchdata import best_of, seed_gradebook
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark render payload dashboard dosen: JSONRenderer (stdlib) "
+        "vs FastJSONRenderer (orjson). Data dibuat di dalam transaksi yang di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5_000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            instructor = seed_gradebook(options['rows'])
+            data = self.build_payload(instructor)
+            transaction.set_rollback(True)
+        self.run(data, options['rows'], options['repeat'])
+
+    def build_payload(self, instructor):
+        request = APIRequestFactory().get('/', {'email': instructor.email})
+        view = InstructorDashboardView()
+        view.setup(request)
+        view.request = view.initialize_request(request)
+        return view.get_dashboard(view.request).data
+
+    def run(self, data, rows, repeat):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson tidak terpasang: FastJSONRenderer = stdlib"))
+
+        stdlib, stdlib_json = best_of(lambda: JSONRenderer().render(data), repeat)
+        fast, fast_json = best_of(lambda: FastJSONRenderer().render(data), repeat)
+
+        self.stdout.write(f"payload dosen {rows:,} grade, {len(stdlib_json) / 1024:,.0f} KiB (terbaik dari {repeat})")
+        self.stdout.write(f"JSONRenderer      {stdlib * 1000:8.2f} ms")
+        self.stdout.write(f"FastJSONRenderer  {fast * 1000:8.2f} ms")
+        self.stdout.write(f"speedup: {stdlib / fast:.2f}x, JSON identik: {stdlib_json == fast_json}")
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from users.models import Grade
+from users.serializers import GradeRowSerializer, GradeSerializer
+
+from ._benchdata import bench_users, best_of, seed_gradebook
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark: GradeSerializer vs GradeRowSerializer (fast path). "
+        "Data dibuat di dalam transaksi yang di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            seed_gradebook(options['rows'])
+            self.run(options['rows'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def run(self, rows, repeat):
+        queryset = Grade.objects.filter(student__in=bench_users())
+        renderer = JSONRenderer()
+        serializers = [
+            ('GradeSerializer', lambda: GradeSerializer(
+                queryset.select_related('student', 'course__instructor'), many=True
+            ).data),
+            ('GradeRowSerializer', lambda: GradeRowSerializer(queryset).data),
+        ]
+
+        self.stdout.write(
+            f"{rows:,} grade, terbaik dari {repeat}: serialize = query + .data, render = JSON saja"
+        )
+        self.stdout.write(f"{'':<20}{'serialize ms':>14}{'rows/s':>12}{'render ms':>12}")
+        results = []
+        for label, serialize in serializers:
+            serialize_seconds, data = best_of(serialize, repeat)
+            render_seconds, content = best_of(lambda: renderer.render(data), repeat)
+            results.append((serialize_seconds, content))
+            self.stdout.write(
+                f"{label:<20}{serialize_seconds * 1000:14.1f}{rows / serialize_seconds:12,.0f}"
+                f"{render_seconds * 1000:12.1f}"
+            )
+
+        (slow, slow_json), (fast, fast_json) = results
+        self.stdout.write(f"speedup serialize: {slow / fast:.2f}x, JSON identik: {slow_json == fast_json}")
@@ -0,0 +1,189 @@
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import uuid
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from users.models import CustomUser, Grade
+
+from ._benchdata import SEED_PASSWORD, require_bench_database, seeded_courses, seeded_users
+
+SCENARIOS = ['registration', 'login', 'student_dashboard', 'instructor_dashboard']
+REGISTRATION_PREFIX = 'seed-reg-'
+RESULT_FIELDS = ['mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_mean']
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark end-to-end (Client Django in-process, lengkap dengan middleware) "
+        "untuk registrasi, login dan dashboard di atas data seed_bench: latensi & "
+        "jumlah query per request, ditulis sebagai JSON agar bisa dibandingkan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS)
+        parser.add_argument('--requests', type=int, default=100, help="request per skenario")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="File JSON hasil (default bench-results/<waktu>.json)")
+        parser.add_argument('--compare', help="JSON hasil run sebelumnya untuk dibandingkan")
+        parser.add_argument('--with-cache', action='store_true',
+                            help="Aktifkan cache respons dashboard (default dimatikan)")
+        parser.add_argument('--yes-i-mean-it', action='store_true',
+                            help="Jalankan walau BENCH_DATABASE tidak diset")
+
+    def handle(self, *args, **options):
+        require_bench_database(options['yes_i_mean_it'])
+        if options['requests'] < 2:
+            raise CommandError("--requests minimal 2.")
+        students = list(seeded_users().filter(role='student').values_list('email', flat=True)[:10_000])
+        instructors = list(seeded_users().filter(role='instructor').values_list('email', flat=True))
+        if not students or not instructors:
+            raise CommandError("Belum ada data seed; jalankan manage.py seed_bench dulu.")
+
+        overrides = {'ALLOWED_HOSTS': ['testserver']}
+        if not options['with_cache']:
+            overrides['CACHES'] = {
+                **settings.CACHES,
+                'bench-dummy': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            }
+            overrides['DASHBOARD_CACHE_ALIAS'] = 'bench-dummy'
+
+        self.rng = random.Random(options['seed'])
+        self.students = students
+        self.instructors = instructors
+        self.registered = []
+        results = {}
+        with override_settings(**overrides):
+            self.client = Client()
+            try:
+                for scenario in options['scenario'] or SCENARIOS:
+                    results[scenario] = self.measure(getattr(self, scenario), options['requests'])
+            finally:
+                # Akun registrasi lewat API tidak bisa diberi penanda seed:
+                # hapus persis email yang dibuat run ini
+                CustomUser.objects.filter(email__in=self.registered).delete()
+
+        report = {'meta': self.meta(options), 'results': results}
+        path = Path(options['output'] or f"bench-results/{timezone.now():%Y%m%dT%H%M%SZ}.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+
+        self.print_results(results, self.load(options['compare']) if options['compare'] else None)
+        self.stdout.write(self.style.SUCCESS(f"Hasil ditulis ke {path}"))
+
+    def measure(self, request, count):
+        request()  # warm-up
+        latencies, queries, errors = [], [], 0
+        for _ in range(count):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                ok = request()
+                latencies.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            errors += not ok
+        cuts = statistics.quantiles(latencies, n=100)
+        return {
+            'requests': count,
+            'errors': errors,
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'p50_ms': round(cuts[49], 3),
+            'p95_ms': round(cuts[94], 3),
+            'p99_ms': round(cuts[98], 3),
+            'max_ms': round(max(latencies), 3),
+            'queries_mean': round(statistics.fmean(queries), 2),
+            'queries_max': max(queries),
+        }
+
+    # Skenario: satu request, kembalikan True jika berhasil
+
+    def registration(self):
+        name = f'{REGISTRATION_PREFIX}{uuid.uuid4().hex[:12]}'
+        email = f'{name}@student.prasetiyamulya.ac.id'
+        self.registered.append(email)
+        response = self.client.post(reverse('register'), {
+            'email': email,
+            'username': name,
+            'full_name': 'Seed Registration',
+            'major': 'business_mathematics',
+            'role': 'student',
+            'password': SEED_PASSWORD,
+            'password_confirmation': SEED_PASSWORD,
+        })
+        return response.status_code == 201
+
+    def login(self):
+        response = self.client.post(reverse('token_obtain_pair'), {
+            'email': self.rng.choice(self.students), 'password': SEED_PASSWORD,
+        })
+        return response.status_code == 200
+
+    def student_dashboard(self):
+        response = self.client.get(reverse('student_dashboard'), {'email': self.rng.choice(self.students)})
+        return response.status_code == 200
+
+    def instructor_dashboard(self):
+        response = self.client.get(reverse('instructor_dashboard'), {'email': self.rng.choice(self.instructors)})
+        return response.status_code == 200
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                cwd=settings.BASE_DIR, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'timestamp': timezone.now().isoformat(),
+            'commit': commit,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'password_hasher': get_hasher().algorithm,
+            'response_cache': options['with_cache'],
+            # Hanya data seed yang diukur, bukan seluruh isi database
+            'dataset': {
+                'students': seeded_users().filter(role='student').count(),
+                'instructors': seeded_users().filter(role='instructor').count(),
+                'courses': seeded_courses().count(),
+                'grades': Grade.objects.filter(course__in=seeded_courses()).count(),
+            },
+        }
+
+    def load(self, path):
+        try:
+            return json.loads(Path(path).read_text())['results']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"--compare tidak bisa dibaca: {exc}")
+
+    def print_results(self, results, baseline):
+        header = f"{'skenario':<22}" + "".join(f"{field:>14}" for field in RESULT_FIELDS)
+        self.stdout.write(header)
+        for scenario, result in results.items():
+            line = f"{scenario:<22}" + "".join(f"{result[field]:>14}" for field in RESULT_FIELDS)
+            self.stdout.write(line)
+            before = (baseline or {}).get(scenario)
+            if before:
+                deltas = "".join(
+                    f"{self.delta(before.get(field), result[field]):>14}" for field in RESULT_FIELDS
+                )
+                self.stdout.write(f"{'  vs baseline':<22}{deltas}")
+
+    @staticmethod
+    def delta(before, after):
+        if not before:
+            return '-'
+        return f"{(after - before) / before * 100:+.1f}%"
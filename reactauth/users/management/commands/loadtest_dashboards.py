@@ -0,0 +1,124 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from ._benchdata import delete_gradebook, refresh_bench_summaries, require_bench_database, seed_gradebook
+
+ROUTES = {
+    'student': ('student_dashboard', 'async_student_dashboard'),
+    'instructor': ('instructor_dashboard', 'async_instructor_dashboard'),
+}
+
+
+async def asgi_get(app, path, query):
+    """Satu GET langsung ke aplikasi ASGI (tanpa socket); kembalikan status"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': urlencode(query).encode(), 'root_path': '',
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    done = asyncio.Event()
+    sent = {}
+
+    async def receive():
+        if not sent.get('body_read'):
+            sent['body_read'] = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            sent['status'] = message['status']
+        elif message['type'] == 'http.response.body' and not message.get('more_body'):
+            done.set()
+
+    await app(scope, receive, send)
+    done.set()
+    return sent['status']
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test in-process lewat aplikasi ASGI: dashboard sync vs async, "
+        "N klien bersamaan, laporan p50/p99. Data bench di-commit lalu dihapus; "
+        "cache respons dashboard dimatikan kecuali --with-cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=sorted(ROUTES), action='append')
+        parser.add_argument('--clients', type=int, default=500)
+        parser.add_argument('--requests', type=int, default=2, help="request per klien")
+        parser.add_argument('--rows', type=int, default=2_000)
+        parser.add_argument('--students', type=int, default=200)
+        parser.add_argument('--with-cache', action='store_true')
+        parser.add_argument('--yes-i-mean-it', action='store_true',
+                            help="Jalankan walau BENCH_DATABASE tidak diset")
+
+    def handle(self, *args, **options):
+        require_bench_database(options['yes_i_mean_it'])
+        if options['students'] < 1:
+            raise CommandError("--students minimal 1.")
+        overrides = {'ALLOWED_HOSTS': ['localhost']}
+        if not options['with_cache']:
+            overrides['CACHES'] = {
+                **settings.CACHES,
+                'loadtest-dummy': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            }
+            overrides['DASHBOARD_CACHE_ALIAS'] = 'loadtest-dummy'
+
+        delete_gradebook()
+        instructor = seed_gradebook(options['rows'], students=options['students'])
+        try:
+            refresh_bench_summaries()
+            emails = {
+                'student': [f'bench{i}@student.prasetiyamulya.ac.id' for i in range(options['students'])],
+                'instructor': [instructor.email],
+            }
+            with override_settings(**overrides):
+                app = get_asgi_application()
+                self.stdout.write(
+                    f"{options['clients']} klien x {options['requests']} request, "
+                    f"{options['rows']:,} grade"
+                )
+                self.stdout.write(f"{'route':<28} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'error':>6}")
+                for kind in options['kind'] or sorted(ROUTES):
+                    for name in ROUTES[kind]:
+                        self.run(app, name, emails[kind], options['clients'], options['requests'])
+        finally:
+            delete_gradebook()
+
+    def run(self, app, name, emails, clients, requests):
+        path = reverse(name)
+        latencies, errors = [], 0
+
+        async def client(n):
+            nonlocal errors
+            for i in range(requests):
+                email = emails[(n * requests + i) % len(emails)]
+                start = time.perf_counter()
+                status = await asgi_get(app, path, {'email': email})
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+
+        async def main():
+            await asgi_get(app, path, {'email': emails[0]})  # warm-up
+            start = time.perf_counter()
+            await asyncio.gather(*(client(n) for n in range(clients)))
+            return time.perf_counter() - start
+
+        elapsed = asyncio.run(main())
+        cuts = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{name:<28} {len(latencies) / elapsed:8.1f} {cuts[49] * 1000:9.1f} "
+            f"{cuts[98] * 1000:9.1f} {errors:6d}"
+        )
@@ -0,0 +1,41 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.provisioning import CHUNK_SIZE, iter_roster, provision_students
+
+
+class Command(BaseCommand):
+    help = (
+        "Buat akun mahasiswa secara bulk dari roster CSV (email, full_name, major, "
+        "password_hash atau password). Email yang sudah terdaftar dilewati."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('roster', help="Path file CSV")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Proses untuk hashing kolom password (default: jumlah CPU)",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['roster'], 'rb') as roster:
+                report = provision_students(
+                    iter_roster(roster),
+                    chunk_size=options['chunk_size'],
+                    workers=options['workers'],
+                )
+        except (OSError, ValueError, UnicodeDecodeError) as exc:
+            raise CommandError(str(exc))
+
+        for error in report['errors']:
+            self.stderr.write(f"baris {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['created']} dibuat, {report['skipped']} sudah ada, "
+            f"{report['error_count']} gagal ({time.perf_counter() - started:.1f} s)"
+        ))
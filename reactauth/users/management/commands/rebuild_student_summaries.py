@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.summaries import find_summary_drift, refresh_student_summaries
+
+
+class Command(BaseCommand):
+    help = "Bangun ulang tabel StudentSummary dari Grade, atau cek drift dengan --check"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Hanya laporkan ringkasan yang tidak sesuai, tanpa menulis",
+        )
+        parser.add_argument(
+            '--student', type=int, action='append', dest='students',
+            help="Batasi ke id mahasiswa tertentu (boleh diulang)",
+        )
+
+    def handle(self, *args, **options):
+        student_ids = options['students']
+
+        if options['check']:
+            drift = find_summary_drift(student_ids)
+            for student_id, fields in sorted(drift.items()):
+                self.stdout.write(f"student {student_id}: {', '.join(fields)}")
+            if drift:
+                raise CommandError(f"{len(drift)} ringkasan tidak sesuai")
+            self.stdout.write(self.style.SUCCESS("Tidak ada drift"))
+            return
+
+        written = refresh_student_summaries(student_ids)
+        self.stdout.write(self.style.SUCCESS(f"{written} ringkasan diperbarui"))
@@ -0,0 +1,86 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from users.recompute import GradeRecomputer, recompute_shard, select_course_ids
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang final_grade/letter_grade tersimpan dan tulis hanya yang berubah"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', action='append', dest='courses',
+                            help="Kode course (boleh diulang)")
+        parser.add_argument('--semester', help="Batasi ke satu semester")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Tampilkan perubahan tanpa menulis")
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Jumlah proses; course dibagi berdasarkan id")
+
+    def handle(self, *args, **options):
+        course_ids = select_course_ids(options['courses'], options['semester'])
+        if not course_ids:
+            raise CommandError("Tidak ada course yang cocok.")
+
+        workers = max(1, options['workers'])
+        if workers > 1 and connection.vendor == 'sqlite':
+            # SQLite hanya mengizinkan satu penulis per file database: proses
+            # lain cuma mengantre lock tulis (atau gagal "database is locked"),
+            # jadi beberapa proses tidak mempercepat apa pun.
+            self.stderr.write(self.style.WARNING("SQLite: --workers diabaikan, memakai 1 proses."))
+            workers = 1
+        if workers == 1:
+            recomputer = GradeRecomputer(
+                course_ids,
+                chunk_size=options['chunk_size'],
+                dry_run=options['dry_run'],
+                on_chunk=self.report_progress,
+            )
+            stats = recomputer.run()
+            changes = recomputer.changes
+        else:
+            stats, changes = self.run_sharded(course_ids, workers, options)
+
+        for grade_id, (old_final, old_letter), (new_final, new_letter) in changes:
+            self.stdout.write(
+                f"grade {grade_id}: {old_final} ({old_letter}) -> {new_final} ({new_letter})"
+            )
+
+        rate = stats['scanned'] / stats['seconds'] if stats['seconds'] else 0
+        verb = "akan berubah" if options['dry_run'] else "diperbarui"
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['scanned']} grade diperiksa, {stats['changed']} {verb} "
+            f"({stats['seconds']:.1f}s, {rate:,.0f} baris/s)"
+        ))
+
+    def report_progress(self, stats):
+        rate = stats['scanned'] / stats['seconds'] if stats['seconds'] else 0
+        self.stderr.write(
+            f"  {stats['scanned']} diperiksa, {stats['changed']} berubah, {rate:,.0f} baris/s"
+        )
+
+    def run_sharded(self, course_ids, workers, options):
+        shards = [course_ids[i::workers] for i in range(workers)]
+        shards = [shard for shard in shards if shard]
+
+        # Koneksi tidak boleh diwariskan ke proses anak
+        connections.close_all()
+        total = {'scanned': 0, 'changed': 0, 'seconds': 0.0}
+        changes = []
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as pool:
+            futures = [
+                pool.submit(recompute_shard, shard, options['chunk_size'], options['dry_run'])
+                for shard in shards
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                stats, shard_changes = future.result()
+                total['scanned'] += stats['scanned']
+                total['changed'] += stats['changed']
+                total['seconds'] = max(total['seconds'], stats['seconds'])
+                changes.extend(shard_changes)
+                self.stderr.write(f"  shard {done}/{len(shards)} selesai: {stats['scanned']} diperiksa")
+        return total, changes
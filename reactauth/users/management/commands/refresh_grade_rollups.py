@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from users.analytics import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Perbarui tabel GradeRollup (analitik) secara inkremental dari watermark updated_at"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help="Bangun ulang seluruh rollup (menangkap Grade yang dihapus / jurusan yang berubah)",
+        )
+
+    def handle(self, *args, **options):
+        result = refresh_rollups(full=options['full'])
+        scope = "semua course" if result['courses'] is None else f"{result['courses']} course berubah"
+        self.stdout.write(self.style.SUCCESS(f"{result['groups']} grup rollup ditulis ({scope})"))
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from users.analytics import refresh_rollups
+from users.summaries import refresh_student_summaries
+
+from ._benchdata import SEED_PASSWORD, delete_cohorts, require_bench_database, seed_cohorts, seeded_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Buat data sintetis berskala besar (di-commit) untuk bench_suite: "
+        "mahasiswa, dosen, course dan grade di semua jurusan & semester."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=50_000)
+        parser.add_argument('--courses', type=int, default=2_000)
+        parser.add_argument('--grades', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=0, help="Seed random (data dapat diulang)")
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--clear', action='store_true',
+                            help="Hapus data seed sebelumnya dulu")
+        parser.add_argument('--delete', action='store_true',
+                            help="Hanya hapus data seed, tanpa membuat baru")
+        parser.add_argument('--yes-i-mean-it', action='store_true',
+                            help="Jalankan walau BENCH_DATABASE tidak diset")
+
+    def handle(self, *args, **options):
+        require_bench_database(options['yes_i_mean_it'])
+        started = time.perf_counter()
+        if options['clear'] or options['delete']:
+            delete_cohorts()
+            if options['delete']:
+                self.stdout.write(self.style.SUCCESS("Data seed dihapus"))
+                return
+        elif seeded_users().exists():
+            raise CommandError("Data seed sudah ada; pakai --clear untuk membuat ulang.")
+
+        with transaction.atomic():
+            created = seed_cohorts(
+                students=options['students'],
+                courses=options['courses'],
+                grades=options['grades'],
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+                on_progress=self.report_progress,
+            )
+            # bulk_create tidak memicu signal: bangun tabel turunan sekali
+            refresh_student_summaries()
+            refresh_rollups(full=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{created['students']:,} mahasiswa, {created['instructors']:,} dosen, "
+            f"{created['courses']:,} course, {created['grades']:,} grade "
+            f"({time.perf_counter() - started:.1f}s). Password semua akun: {SEED_PASSWORD}"
+        ))
+
+    def report_progress(self, created):
+        self.stderr.write(f"  {created['students']:,} mahasiswa, {created['grades']:,} grade", ending='\r')
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_remove_grade_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_courses', models.PositiveIntegerField(default=0)),
+                ('graded_courses', models.PositiveIntegerField(default=0)),
+                ('total_credits', models.PositiveIntegerField(default=0)),
+                ('total_points', models.FloatField(default=0.0)),
+                ('gpa', models.FloatField(default=0.0)),
+                ('semesters', models.JSONField(blank=True, default=dict, help_text='Rincian per semester: {semester: {courses, graded_courses, credits, gpa}}')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='summary', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Summary',
+                'verbose_name_plural': 'Student Summaries',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:33
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_studentsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='assignment_weight',
+            field=models.PositiveSmallIntegerField(default=30, help_text='Bobot tugas (%)', validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='final_weight',
+            field=models.PositiveSmallIntegerField(default=40, help_text='Bobot UAS (%)', validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='grade_cutoffs',
+            field=models.JSONField(blank=True, help_text='Nilai minimum per huruf, misal {"A": 85, "A-": 80, ...}. Kosong = standar', null=True),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='midterm_weight',
+            field=models.PositiveSmallIntegerField(default=30, help_text='Bobot UTS (%)', validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
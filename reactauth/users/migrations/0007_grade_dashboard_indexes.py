@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_course_grading_scheme'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['student', '-created_at'], name='users_grade_student_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['course', '-created_at'], name='users_grade_course_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(condition=models.Q(('letter_grade__isnull', False)), fields=['student'], name='users_grade_student_graded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['letter_grade'], name='users_grade_letter_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_grade_dashboard_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(choices=[('1', 'Semester 1'), ('2', 'Semester 2'), ('3', 'Semester 3'), ('4', 'Semester 4'), ('5', 'Semester 5'), ('6', 'Semester 6'), ('7', 'Semester 7'), ('8', 'Semester 8')], max_length=1)),
+                ('course_major', models.CharField(choices=[('artificial_intelligence_and_robotics', 'AIR'), ('business_mathematics', 'BM'), ('digital_business_technology', 'DBT'), ('product_design_engineering', 'PDE'), ('food_business_technology', 'FBT')], max_length=100)),
+                ('student_major', models.CharField(blank=True, choices=[('artificial_intelligence_and_robotics', 'AIR'), ('business_mathematics', 'BM'), ('digital_business_technology', 'DBT'), ('product_design_engineering', 'PDE'), ('food_business_technology', 'FBT')], default='', max_length=100)),
+                ('enrolled', models.PositiveIntegerField(default=0)),
+                ('graded', models.PositiveIntegerField(default=0)),
+                ('average', models.FloatField(blank=True, null=True)),
+                ('p25', models.FloatField(blank=True, null=True)),
+                ('median', models.FloatField(blank=True, null=True)),
+                ('p75', models.FloatField(blank=True, null=True)),
+                ('p90', models.FloatField(blank=True, null=True)),
+                ('distribution', models.JSONField(blank=True, default=dict, help_text='Jumlah per nilai huruf')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Grade Rollup',
+                'verbose_name_plural': 'Grade Rollups',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['updated_at'], name='users_grade_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='graderollup',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='users.course'),
+        ),
+        migrations.AddIndex(
+            model_name='graderollup',
+            index=models.Index(fields=['semester', 'course_major'], name='users_graderollup_filter_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='graderollup',
+            constraint=models.UniqueConstraint(fields=('course', 'student_major'), name='users_graderollup_group_uniq'),
+        ),
+    ]
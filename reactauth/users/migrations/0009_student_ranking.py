@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_grade_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentsummary',
+            name='cohort',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Angkatan (tahun date_joined)', null=True),
+        ),
+        migrations.AddField(
+            model_name='studentsummary',
+            name='major',
+            field=models.CharField(blank=True, choices=[('artificial_intelligence_and_robotics', 'AIR'), ('business_mathematics', 'BM'), ('digital_business_technology', 'DBT'), ('product_design_engineering', 'PDE'), ('food_business_technology', 'FBT')], max_length=100, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['course', 'final_grade'], name='users_grade_course_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentsummary',
+            index=models.Index(fields=['major', 'gpa', 'graded_courses'], name='users_summary_major_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentsummary',
+            index=models.Index(fields=['cohort', 'gpa', 'graded_courses'], name='users_summary_cohort_rank_idx'),
+        ),
+    ]
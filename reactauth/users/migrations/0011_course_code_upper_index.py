@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:27
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_grade_course_updated_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(django.db.models.functions.text.Upper('code'), name='users_course_code_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_ranking_fields(apps, schema_editor):
+    """Isi major & cohort StudentSummary lama dari CustomUser (sama dengan summaries.py)"""
+    StudentSummary = apps.get_model('users', 'StudentSummary')
+    pending = StudentSummary.objects.filter(cohort__isnull=True).select_related('student').order_by('pk')
+    last_pk = 0
+    while batch := list(pending.filter(pk__gt=last_pk)[:BATCH_SIZE]):
+        last_pk = batch[-1].pk
+        for summary in batch:
+            summary.major = summary.student.major
+            summary.cohort = summary.student.date_joined.year
+        StudentSummary.objects.bulk_update(batch, ['major', 'cohort'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_course_code_upper_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ranking_fields, migrations.RunPython.noop),
+    ]
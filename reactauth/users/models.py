@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Upper
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
@@ -21,6 +23,8 @@ class CustomUser(AbstractUser):
     full_name = models.CharField(max_length=100)
     major= models.CharField(max_length=100,choices=MAJOR_CHOICES,blank=True,null=True)
     role = models.CharField(max_length=20,choices=ROLE_CHOICES,default='student')
+    # Untuk ETag dashboard orang lain yang menampilkan nama user ini (etags.py)
+    updated_at = models.DateTimeField(auto_now=True)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username','full_name']
@@ -96,6 +100,28 @@ class Course(models.Model):
         limit_choices_to={'role': 'student'}
     )
     
+    # Skema penilaian (lihat grading.py)
+    assignment_weight = models.PositiveSmallIntegerField(
+        default=30,
+        validators=[MaxValueValidator(100)],
+        help_text="Bobot tugas (%)"
+    )
+    midterm_weight = models.PositiveSmallIntegerField(
+        default=30,
+        validators=[MaxValueValidator(100)],
+        help_text="Bobot UTS (%)"
+    )
+    final_weight = models.PositiveSmallIntegerField(
+        default=40,
+        validators=[MaxValueValidator(100)],
+        help_text="Bobot UAS (%)"
+    )
+    grade_cutoffs = models.JSONField(
+        null=True,
+        blank=True,
+        help_text='Nilai minimum per huruf, misal {"A": 85, "A-": 80, ...}. Kosong = standar'
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -103,21 +129,37 @@ class Course(models.Model):
         ordering = ['semester', 'code']
         verbose_name = 'Course'
         verbose_name_plural = 'Courses'
+        indexes = [
+            # Pencarian awalan kode tanpa peka huruf besar/kecil (admin Grade)
+            models.Index(Upper('code'), name='users_course_code_upper_idx'),
+        ]
 
     def __str__(self):
         return f"{self.code} - {self.name}"
 
+    def clean(self):
+        from .grading import GradingScheme
+        if self.grade_cutoffs is not None:
+            letters = {letter for letter, _label in Grade.GRADE_CHOICES}
+            if not isinstance(self.grade_cutoffs, dict) or not set(self.grade_cutoffs) <= letters:
+                raise ValidationError({'grade_cutoffs': "Gunakan huruf dari GRADE_CHOICES sebagai kunci."})
+        try:
+            GradingScheme.for_course(self)
+        except (TypeError, ValueError) as exc:
+            raise ValidationError(str(exc))
+
+    def get_statistics(self):
+        """Statistik kelas (dari cache, lihat course_stats.py)"""
+        from .course_stats import get_course_stats
+        return get_course_stats(self.pk)
+
     def get_total_students(self):
         """Menghitung total mahasiswa yang terdaftar"""
-        return self.grades.filter.count()
+        return self.get_statistics()['enrolled']
 
     def get_average_grade(self):
         """Menghitung rata-rata nilai kelas"""
-        from django.db.models import Avg
-        avg = self.grades.filter(
-            final_grade__isnull=False,
-        ).aggregate(avg_grade=Avg('final_grade'))
-        return round(avg['avg_grade'], 2) if avg['avg_grade'] else None
+        return self.get_statistics()['average']
 
 class Grade(models.Model):
     """Model untuk nilai mahasiswa (sekaligus enrollment)"""
@@ -192,42 +234,160 @@ class Grade(models.Model):
     class Meta:
         unique_together = ['student', 'course']
         ordering = ['-created_at']
+        indexes = [
+            # StudentDashboardView: grades milik satu mahasiswa, terbaru dulu
+            models.Index(fields=['student', '-created_at'], name='users_grade_student_recent_idx'),
+            # InstructorDashboardView / gradebook: grades per course, terbaru dulu
+            models.Index(fields=['course', '-created_at'], name='users_grade_course_recent_idx'),
+            # Statistik IPK: hanya baris yang sudah dinilai
+            models.Index(
+                fields=['student'],
+                condition=models.Q(letter_grade__isnull=False),
+                name='users_grade_student_graded_idx',
+            ),
+            models.Index(fields=['letter_grade'], name='users_grade_letter_idx'),
+            # Peringkat per course (ranking.py): hitung nilai di atas nilai sendiri
+            models.Index(fields=['course', 'final_grade'], name='users_grade_course_score_idx'),
+            # ETag dashboard mahasiswa: updated_at terbaru per course
+            models.Index(fields=['course', 'updated_at'], name='users_grade_course_updated_idx'),
+            # Refresh inkremental GradeRollup: grade yang berubah sejak watermark
+            models.Index(fields=['updated_at'], name='users_grade_updated_idx'),
+        ]
 
     def __str__(self):
         grade = self.letter_grade or 'Belum dinilai'
         return f"{self.student.full_name} - {self.course.code} ({grade})"
 
     def calculate_final_grade(self):
-        """Hitung nilai akhir: 30% tugas, 30% UTS, 40% UAS"""
-        scores = [self.assignment_score, self.midterm_score, self.final_score]
-        
-        if all(score is not None for score in scores):
-            total = (float(self.assignment_score) * 0.3 +
-                    float(self.midterm_score) * 0.3 +
-                    float(self.final_score) * 0.4)
-            
-            self.final_grade = round(total, 2)
-            self.letter_grade = self._convert_to_letter(self.final_grade)
-            return self.final_grade
-        return None
-
-    def _convert_to_letter(self, score):
-        """Convert angka ke huruf"""
-        if score >= 85: return 'A'
-        elif score >= 80: return 'A-'
-        elif score >= 75: return 'B+'
-        elif score >= 70: return 'B'
-        elif score >= 65: return 'B-'
-        elif score >= 60: return 'C+'
-        elif score >= 55: return 'C'
-        elif score >= 40: return 'D'
-        return 'E'
+        """
+        Hitung nilai akhir sesuai bobot course (default 30% tugas, 30% UTS, 40% UAS).
+        Skema dibaca dari self.course: untuk banyak Grade sekaligus pakai
+        select_related('course') atau grading.compute_final_grades.
+        """
+        from .grading import GradingScheme
+        if None in (self.assignment_score, self.midterm_score, self.final_score):
+            return None  # belum lengkap: course tidak perlu dimuat
+        self.final_grade, self.letter_grade = GradingScheme.for_course(self.course).compute_one(
+            self.assignment_score, self.midterm_score, self.final_score
+        )
+        return self.final_grade
 
     def get_grade_point(self):
         """Dapatkan poin untuk IPK"""
         return self.GRADE_POINTS.get(self.letter_grade, 0.0)
 
+    @classmethod
+    def grade_point_expression(cls):
+        """Versi SQL dari get_grade_point (Case/When atas GRADE_POINTS)"""
+        return models.Case(
+            *[
+                models.When(letter_grade=letter, then=models.Value(point))
+                for letter, point in cls.GRADE_POINTS.items()
+            ],
+            default=models.Value(0.0),
+            output_field=models.FloatField(),
+        )
+
+    @classmethod
+    def transcript_window_annotations(cls):
+        """Total poin & SKS (hanya yang sudah dinilai) di setiap baris, via OVER ()"""
+        graded_credits = models.Case(
+            models.When(letter_grade__isnull=False, then=models.F('course__credits')),
+            default=models.Value(0),
+            output_field=models.IntegerField(),
+        )
+        return {
+            'stat_total_points': models.Window(
+                models.Sum(cls.grade_point_expression() * graded_credits,
+                           output_field=models.FloatField())
+            ),
+            'stat_total_credits': models.Window(models.Sum(graded_credits)),
+        }
+
     def save(self, *args, **kwargs):
-        self.calculate_final_grade()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'assignment_score', 'midterm_score', 'final_score'} & set(update_fields):
+            self.calculate_final_grade()
         super().save(*args, **kwargs)
-        
\ No newline at end of file
+        
+
+class StudentSummary(models.Model):
+    """Ringkasan transkrip per mahasiswa (denormalisasi dari Grade)"""
+
+    student = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='summary',
+        limit_choices_to={'role': 'student'}
+    )
+    total_courses = models.PositiveIntegerField(default=0)
+    graded_courses = models.PositiveIntegerField(default=0)
+    total_credits = models.PositiveIntegerField(default=0)
+    total_points = models.FloatField(default=0.0)
+    gpa = models.FloatField(default=0.0)
+    semesters = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Rincian per semester: {semester: {courses, graded_courses, credits, gpa}}"
+    )
+    # Disalin dari student untuk index peringkat (ranking.py)
+    major = models.CharField(max_length=100, choices=CustomUser.MAJOR_CHOICES, blank=True, null=True)
+    cohort = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Angkatan (tahun date_joined)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Student Summary'
+        verbose_name_plural = 'Student Summaries'
+        indexes = [
+            # Peringkat IPK per jurusan / angkatan: hitung IPK di atas IPK
+            # sendiri; graded_courses ikut supaya index-nya covering
+            models.Index(fields=['major', 'gpa', 'graded_courses'], name='users_summary_major_rank_idx'),
+            models.Index(fields=['cohort', 'gpa', 'graded_courses'], name='users_summary_cohort_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student} (IPK {self.gpa})"
+
+
+class GradeRollup(models.Model):
+    """Distribusi nilai per (course, jurusan mahasiswa) untuk analitik registrar (analytics.py)"""
+
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='rollups')
+    # Disalin dari course supaya filter analitik tidak perlu join
+    semester = models.CharField(max_length=1, choices=Course.SEMESTER_CHOICES)
+    course_major = models.CharField(max_length=100, choices=CustomUser.MAJOR_CHOICES)
+    # '' = mahasiswa tanpa jurusan
+    student_major = models.CharField(max_length=100, choices=CustomUser.MAJOR_CHOICES, blank=True, default='')
+
+    enrolled = models.PositiveIntegerField(default=0)
+    graded = models.PositiveIntegerField(default=0)
+    average = models.FloatField(null=True, blank=True)
+    p25 = models.FloatField(null=True, blank=True)
+    median = models.FloatField(null=True, blank=True)
+    p75 = models.FloatField(null=True, blank=True)
+    p90 = models.FloatField(null=True, blank=True)
+    distribution = models.JSONField(default=dict, blank=True, help_text="Jumlah per nilai huruf")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Grade Rollup'
+        verbose_name_plural = 'Grade Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'student_major'], name='users_graderollup_group_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['semester', 'course_major'], name='users_graderollup_filter_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id} / {self.student_major or '-'}"
+
+
+class RollupWatermark(models.Model):
+    """Batas updated_at yang sudah diproses oleh refresh inkremental"""
+
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
@@ -0,0 +1,66 @@
+"""
+Keyset (cursor) pagination untuk gradebook, diurutkan (created_at, id)
+menurun. Berbeda dengan OFFSET, setiap halaman cukup melanjutkan dari
+baris terakhir halaman sebelumnya lewat index (course, -created_at).
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(grade):
+    raw = f"{grade.created_at.isoformat()}|{grade.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+
+
+class GradeKeysetPagination:
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({'page_size': 'A valid integer is required.'})
+        return max(1, min(size, MAX_PAGE_SIZE))
+
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        queryset = queryset.order_by('-created_at', '-id')
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        page_size = self.get_page_size(request)
+        # Ambil satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(self.page[-1]))
+
+    def get_paginated_data(self, data):
+        return {'next': self.get_next_link(), 'results': data}
@@ -0,0 +1,172 @@
+"""
+Provisioning mahasiswa secara bulk dari roster (CSV) oleh registrar.
+
+Kolom roster: email, full_name, major (opsional), dan salah satu dari
+password_hash (hash Django yang sudah jadi, disimpan apa adanya) atau
+password (di-hash di sini, paralel di beberapa proses). Tanpa keduanya
+akun dibuat dengan password tidak terpakai (reset password dulu).
+
+Baris divalidasi, email yang sudah terdaftar dilewati (satu query per
+chunk), lalu sisanya disimpan dengan bulk_create. Baris yang gagal tidak
+menghentikan proses; semuanya dilaporkan di hasil.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import IntegrityError, transaction
+
+from .bulk_rows import RowErrorCollector, iter_csv
+from .models import CustomUser
+from .response_cache import invalidate_dashboards
+from .serializers import STUDENT_EMAIL_PATTERN
+
+CHUNK_SIZE = 1000
+MAJORS = {value for value, _label in CustomUser.MAJOR_CHOICES}
+REQUIRED_FIELDS = ['email', 'full_name']
+
+
+def iter_roster(roster):
+    """Baca roster CSV (file biner) baris per baris tanpa memuat seluruh isi"""
+    return iter_csv(roster, REQUIRED_FIELDS)
+
+
+def validate_roster_row(row):
+    """Kembalikan (data bersih, errors) untuk satu baris roster"""
+    errors = {}
+    email = (row.get('email') or '').strip().lower()
+    if not STUDENT_EMAIL_PATTERN.match(email):
+        errors['email'] = ["Email must be a valid student email address."]
+
+    full_name = (row.get('full_name') or '').strip()
+    if not full_name:
+        errors['full_name'] = ['This field is required.']
+    elif len(full_name) > 100:
+        errors['full_name'] = ['Ensure this field has no more than 100 characters.']
+
+    major = (row.get('major') or '').strip() or None
+    if major is not None and major not in MAJORS:
+        errors['major'] = [f'"{major}" is not a valid choice.']
+
+    password_hash = (row.get('password_hash') or '').strip()
+    if password_hash:
+        try:
+            identify_hasher(password_hash)
+        except ValueError:
+            errors['password_hash'] = ['Unknown password hash format.']
+
+    data = {
+        'email': email,
+        'full_name': full_name,
+        'major': major,
+        'password_hash': password_hash,
+        'password': row.get('password') or '',
+    }
+    return data, errors
+
+
+def _hash_passwords(passwords):
+    return [make_password(password) for password in passwords]
+
+
+class RosterProvisioner(RowErrorCollector):
+    """Satu sesi provisioning; hash password di pool proses jika workers > 1"""
+
+    def __init__(self, chunk_size=CHUNK_SIZE, workers=1):
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.seen = set()
+        self.created = 0
+        self.skipped = 0
+
+    def run(self, rows):
+        pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            chunk = []
+            for row_number, row in enumerate(rows, start=1):
+                data, errors = validate_roster_row(row)
+                if not errors and data['email'] in self.seen:
+                    errors['email'] = ['Duplicate row for this email.']
+                if errors:
+                    self.add_error(row_number, errors)
+                    continue
+                self.seen.add(data['email'])
+                chunk.append((row_number, data))
+                if len(chunk) >= self.chunk_size:
+                    self.flush(chunk, pool)
+                    chunk = []
+            if chunk:
+                self.flush(chunk, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return {'created': self.created, 'skipped': self.skipped, **self.error_report()}
+
+    def hash_passwords(self, passwords, pool):
+        if pool is None or len(passwords) < 2:
+            return _hash_passwords(passwords)
+        size = -(-len(passwords) // self.workers)
+        batches = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+        return [hashed for batch in pool.map(_hash_passwords, batches) for hashed in batch]
+
+    def flush(self, chunk, pool):
+        existing = set(
+            CustomUser.objects.filter(email__in=[data['email'] for _, data in chunk])
+            .values_list('email', flat=True)
+        )
+        fresh = []
+        for row_number, data in chunk:
+            if data['email'] in existing:
+                self.skipped += 1
+            else:
+                fresh.append((row_number, data))
+        if not fresh:
+            return
+
+        to_hash = [data['password'] for _, data in fresh if not data['password_hash'] and data['password']]
+        hashed = iter(self.hash_passwords(to_hash, pool))
+
+        users = []
+        for _row_number, data in fresh:
+            if data['password_hash']:
+                password = data['password_hash']
+            elif data['password']:
+                password = next(hashed)
+            else:
+                password = make_password(None)  # password tidak terpakai
+            users.append(CustomUser(
+                email=data['email'],
+                username=data['email'].split('@')[0],
+                full_name=data['full_name'],
+                major=data['major'],
+                role='student',
+                password=password,
+            ))
+
+        try:
+            with transaction.atomic():
+                CustomUser.objects.bulk_create(users)
+                # bulk_create tidak memicu signal
+                invalidate_dashboards()
+        except IntegrityError:
+            # Username (bagian lokal email) bentrok, atau ditulis bersamaan:
+            # ulangi per baris supaya hanya baris yang bermasalah yang gagal
+            for (row_number, _data), user in zip(fresh, users):
+                self.create_one(row_number, user)
+            return
+        self.created += len(users)
+
+    def create_one(self, row_number, user):
+        user.pk = None
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            self.add_error(row_number, {'non_field_errors': ['Email or username already exists.']})
+            return
+        self.created += 1
+
+
+def provision_students(rows, chunk_size=CHUNK_SIZE, workers=1):
+    return RosterProvisioner(chunk_size=chunk_size, workers=workers).run(rows)
@@ -0,0 +1,74 @@
+"""
+Peringkat & persentil mahasiswa untuk dashboard.
+
+- IPK per jurusan dan per angkatan (tahun date_joined), di antara mahasiswa
+  yang sudah punya nilai: dari StudentSummary, yang menyalin major/cohort
+  dan diperbarui setiap ada perubahan Grade.
+- Nilai akhir per course (satu course = satu kelas), di antara peserta
+  yang sudah dinilai.
+
+Index (major, gpa, graded_courses), (cohort, gpa, graded_courses) dan
+(course, final_grade) adalah "rank index"-nya (covering, tanpa baca tabel): peringkat = 1 + jumlah baris dengan nilai lebih tinggi di
+partisi yang sama (semantik RANK()), dihitung sebagai subquery di query
+yang memang sudah dijalankan view. Tidak ada sort IPK per request dan
+tidak ada query tambahan; karena ikut di query user, peringkat juga ikut
+menentukan ETag.
+"""
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Grade, StudentSummary
+
+
+def _count(queryset, partition):
+    """Subquery skalar COUNT(*) untuk satu partisi (0 jika kosong)"""
+    return Coalesce(
+        Subquery(queryset.order_by().values(partition).annotate(n=Count('*')).values('n')),
+        0,
+    )
+
+
+def student_rank_annotations():
+    """Anotasi query CustomUser (dengan summary): peringkat IPK per jurusan & angkatan"""
+    ranked = StudentSummary.objects.filter(graded_courses__gt=0)
+    annotations = {}
+    for scope in ('major', 'cohort'):
+        peers = ranked.filter(**{scope: OuterRef(f'summary__{scope}')})
+        annotations[f'rank_{scope}_above'] = _count(peers.filter(gpa__gt=OuterRef('summary__gpa')), scope)
+        annotations[f'rank_{scope}_size'] = _count(peers, scope)
+    return annotations
+
+
+def course_rank_annotations():
+    """Anotasi query Grade: peringkat nilai akhir di course masing-masing"""
+    peers = Grade.objects.filter(course=OuterRef('course_id'), final_grade__isnull=False)
+    return {
+        'rank_course_above': _count(peers.filter(final_grade__gt=OuterRef('final_grade')), 'course'),
+        'rank_course_size': _count(peers, 'course'),
+    }
+
+
+def rank_entry(above, size):
+    """{'rank', 'of', 'percentile'}; persentil = % peserta dengan nilai <= milik sendiri"""
+    if not size:
+        return None
+    rank = above + 1
+    return {'rank': rank, 'of': size, 'percentile': round(100 * (size - above) / size, 1)}
+
+
+def student_ranks(user):
+    """Peringkat jurusan & angkatan dari user yang dianotasi student_rank_annotations()"""
+    summary = getattr(user, 'summary', None)
+    if summary is None or not summary.graded_courses:
+        return {'major': None, 'cohort': None}
+    return {
+        scope: rank_entry(getattr(user, f'rank_{scope}_above'), getattr(user, f'rank_{scope}_size'))
+        for scope in ('major', 'cohort')
+    }
+
+
+def course_rank(row):
+    """Peringkat satu baris grade (.values() dengan course_rank_annotations())"""
+    if row['final_grade'] is None:
+        return None
+    return rank_entry(row['rank_course_above'], row['rank_course_size'])
@@ -0,0 +1,84 @@
+"""
+Hitung ulang final_grade/letter_grade yang tersimpan (misal setelah bobot
+atau ambang nilai huruf sebuah course diubah).
+
+Grade dibaca per chunk dengan keyset (pk > pk terakhir), dihitung lewat
+grading.compute_final_grades, dan hanya baris yang berubah yang ditulis
+kembali dengan bulk_update. Setiap chunk dibaca utuh sebelum ditulis, jadi
+tidak ada cursor baca yang masih terbuka saat bulk_update (di SQLite
+menulis selama cursor terbuka bisa melewatkan atau mengulang baris).
+"""
+import time
+
+
+from .grading import compute_final_grades, save_grades
+from .models import Course, Grade
+
+RESULT_FIELDS = ['final_grade', 'letter_grade']
+
+
+def select_course_ids(codes=None, semester=None):
+    courses = Course.objects.all()
+    if codes:
+        courses = courses.filter(code__in=codes)
+    if semester:
+        courses = courses.filter(semester=semester)
+    return list(courses.order_by('pk').values_list('pk', flat=True))
+
+
+class GradeRecomputer:
+    def __init__(self, course_ids, chunk_size=2000, dry_run=False, on_chunk=None):
+        self.course_ids = list(course_ids)
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.on_chunk = on_chunk
+        self.stats = {'scanned': 0, 'changed': 0, 'seconds': 0.0}
+        self.changes = []
+
+    def run(self):
+        courses = Course.objects.in_bulk(self.course_ids)
+        grades = (
+            Grade.objects.filter(course_id__in=self.course_ids)
+            .only('id', 'student_id', 'course_id', 'assignment_score',
+                  'midterm_score', 'final_score', *RESULT_FIELDS)
+            .order_by('id')
+        )
+
+        self.started = time.perf_counter()
+        last_pk = 0
+        while chunk := list(grades.filter(pk__gt=last_pk)[:self.chunk_size]):
+            last_pk = chunk[-1].pk
+            for grade in chunk:
+                grade.course = courses[grade.course_id]
+            self.process(chunk)
+        self.stats['seconds'] = time.perf_counter() - self.started
+        return self.stats
+
+    def process(self, chunk):
+        before = [(g.final_grade, g.letter_grade) for g in chunk]
+        compute_final_grades(chunk)
+        changed = [
+            (g, old) for g, old in zip(chunk, before)
+            if (g.final_grade, g.letter_grade) != old
+        ]
+
+        self.stats['scanned'] += len(chunk)
+        self.stats['changed'] += len(changed)
+
+        if self.dry_run:
+            self.changes.extend(
+                (g.pk, old, (g.final_grade, g.letter_grade)) for g, old in changed
+            )
+        elif changed:
+            save_grades([g for g, _old in changed], RESULT_FIELDS)
+
+        self.stats['seconds'] = time.perf_counter() - self.started
+        if self.on_chunk:
+            self.on_chunk(self.stats)
+
+
+def recompute_shard(course_ids, chunk_size, dry_run):
+    """Entry point worker multi-proses: kembalikan statistik & perubahan"""
+    recomputer = GradeRecomputer(course_ids, chunk_size=chunk_size, dry_run=dry_run)
+    recomputer.run()
+    return recomputer.stats, recomputer.changes
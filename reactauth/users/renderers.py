@@ -0,0 +1,56 @@
+"""
+Renderer JSON cepat untuk DRF.
+
+Memakai orjson jika terpasang (opsional); tipe yang tidak didukung orjson
+secara native (Decimal, lazy string, dst.) dan datetime diteruskan ke
+encoder DRF supaya output identik dengan JSONRenderer bawaan. Tanpa
+orjson, atau untuk output ber-indent (browsable API, ?indent=), renderer
+ini jatuh kembali ke JSONRenderer (stdlib json).
+"""
+from rest_framework.renderers import JSONRenderer
+
+from .instrumentation import timed_render
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson opsional
+    orjson = None
+
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def __init__(self):
+        super().__init__()
+        self._default = self.encoder_class().default
+
+    def can_use_orjson(self, indent):
+        return orjson is not None and indent is None and self.compact and not self.ensure_ascii
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        with timed_render():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if not self.can_use_orjson(indent):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self._default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            # misal integer > 64 bit: biarkan stdlib yang menangani
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Sama seperti JSONRenderer: escape U+2028/U+2029
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
@@ -0,0 +1,142 @@
+"""
+Cache respons dashboard (mahasiswa & dosen) di cache Django.
+
+Kunci memuat satu generation counter global yang dinaikkan oleh setiap
+save/delete Grade, Course dan CustomUser (lihat signals.py) serta oleh
+jalur bulk lewat invalidate_dashboards(). Setelah generation naik, semua
+entri lama tidak lagi bisa ditemukan, sehingga data basi tidak pernah
+dikirim. Cache hit tidak menyentuh ORM maupun serializer sama sekali.
+
+Backend diatur lewat DASHBOARD_CACHE_ALIAS. Locmem (default) hanya aman
+untuk satu proses: pada deployment multi-worker gunakan backend bersama
+(Redis/Memcached) supaya invalidasi terlihat oleh semua worker.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .cache_versions import aget_version, bump_version, get_version, invalidate
+from .etags import not_modified, with_validator
+
+GENERATION_KEY = 'dashboard:generation'
+
+
+def _cache():
+    return caches[getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300)
+
+
+class CacheStats:
+    """Counter hit/miss per jenis dashboard (in-process, thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+
+    def record(self, kind, outcome):
+        with self._lock:
+            per_kind = self._counts.setdefault(kind, {'hits': 0, 'misses': 0})
+            per_kind[outcome] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {kind: dict(counts) for kind, counts in self._counts.items()}
+
+
+stats = CacheStats()
+
+
+def current_generation():
+    return get_version(_cache(), GENERATION_KEY)
+
+
+def bump_generation():
+    bump_version(_cache(), GENERATION_KEY)
+
+
+def invalidate_dashboards():
+    """Dipanggil setiap ada perubahan data dashboard (termasuk jalur bulk)"""
+    invalidate(_cache(), GENERATION_KEY)
+
+
+async def acurrent_generation():
+    return await aget_version(_cache(), GENERATION_KEY)
+
+
+def _key(kind, email, generation):
+    digest = hashlib.sha1(email.encode()).hexdigest()
+    return f'dashboard:{kind}:{generation}:{digest}'
+
+
+def dashboard_key(kind, email):
+    return _key(kind, email, current_generation())
+
+
+async def adashboard_key(kind, email):
+    return _key(kind, email, await acurrent_generation())
+
+
+class CachedDashboardMixin:
+    """
+    Bungkus get() sebuah view dashboard: layani dari cache jika ada,
+    selain itu panggil get_dashboard() dan simpan respons 200-nya.
+    """
+    dashboard_kind = None
+
+    def get(self, request):
+        email = request.query_params.get('email')
+        if not email:
+            return self.get_dashboard(request)
+
+        cache = _cache()
+        key = dashboard_key(self.dashboard_kind, email)
+        entry = cache.get(key)
+        if entry is not None:
+            stats.record(self.dashboard_kind, 'hits')
+            etag, data = entry
+            return not_modified(request, etag) or with_validator(Response(data), etag)
+
+        stats.record(self.dashboard_kind, 'misses')
+        response = self.get_dashboard(request)
+        if response.status_code == 200:
+            cache.set(key, (response['ETag'], response.data), _timeout())
+        return response
+
+
+class AsyncCachedDashboardMixin:
+    """
+    Versi async CachedDashboardMixin untuk view Django async (bukan DRF):
+    get_dashboard() mengembalikan (HttpResponse, data) dan render_cached()
+    membangun respons dari entri cache. Entri dibagi dengan view sync.
+    """
+    dashboard_kind = None
+
+    async def get(self, request):
+        email = request.GET.get('email')
+        if not email:
+            response, _data = await self.get_dashboard(request)
+            return response
+
+        cache = _cache()
+        key = await adashboard_key(self.dashboard_kind, email)
+        entry = await cache.aget(key)
+        if entry is not None:
+            stats.record(self.dashboard_kind, 'hits')
+            etag, data = entry
+            return self.render_cached(request, etag, data)
+
+        stats.record(self.dashboard_kind, 'misses')
+        response, data = await self.get_dashboard(request)
+        if response.status_code == 200:
+            await cache.aset(key, (response['ETag'], data), _timeout())
+        return response
@@ -1,4 +1,9 @@
+import time
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .models import Grade
@@ -6,6 +11,10 @@ import re
 
 User = get_user_model()
 
+STUDENT_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@student\.prasetiyamulya\.ac\.id')
+INSTRUCTOR_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@prasetiyamulya\.ac\.id')
+EMAIL_IN_USE = "Email is already in use."
+
 # ============= AUTHENTICATION (tetap perlu) =============
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -18,16 +27,16 @@ class RegisterSerializer(serializers.ModelSerializer):
             'password': {'write_only': True, 'style': {'input_type': 'password'}},
             'full_name': {'required': True},
             'major':{'required':True},
+            # Keunikan dicek oleh unique index saat insert (lihat create),
+            # bukan dengan query exists() terpisah
+            'email': {'validators': []},
+            'username': {'validators': []},
         }
 
     def validate_email(self, value):
         email = value.lower()
-        student_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@student\.prasetiyamulya\.ac\.id')
-        instructor_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@prasetiyamulya\.ac\.id')
 
-        if student_pattern.match(email) or instructor_pattern.match(email):
-            if User.objects.filter(email=email).exists():
-                raise serializers.ValidationError("Email is already in use.")
+        if STUDENT_EMAIL_PATTERN.match(email) or INSTRUCTOR_EMAIL_PATTERN.match(email):
             return email
         
         raise serializers.ValidationError("Email must be a valid student or instructor email address.")
@@ -48,14 +57,21 @@ class RegisterSerializer(serializers.ModelSerializer):
         elif domain == 'prasetiyamulya.ac.id':
             role = 'instructor'
         
-        user = User.objects.create_user(
-            email=email,
-            username=username,
-            password=validated_data['password'],
-            full_name=validated_data['full_name'],
-            major=validated_data.get('major',''),
-            role=role
-        )
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=email,
+                    username=username,
+                    password=validated_data['password'],
+                    full_name=validated_data['full_name'],
+                    major=validated_data.get('major',''),
+                    role=role
+                )
+        except IntegrityError:
+            # Hanya di jalur gagal: cari tahu constraint mana yang dilanggar
+            if User.objects.filter(email=email).exists():
+                raise serializers.ValidationError({'email': [EMAIL_IN_USE]})
+            raise serializers.ValidationError({'username': ["A user with that username already exists."]})
         return user
 
 
@@ -71,6 +87,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['full_name'] = user.full_name
         token['major'] = user.major
         token['role'] = user.role
+        token['is_staff'] = user.is_staff
+        # Waktu login (sub-detik); ikut tersalin ke access token hasil
+        # refresh, dibandingkan dengan penanda revokasi
+        token['auth_time'] = time.time()
         return token
     
     def validate(self, attrs):
@@ -95,12 +115,12 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 class GradeSerializer(serializers.ModelSerializer):
     """Serializer untuk display grade (READ ONLY)"""
     
-    # Gunakan SerializerMethodField untuk semua relasi yang bisa None
-    student_name = serializers.SerializerMethodField()
-    course_name = serializers.SerializerMethodField()
-    course_code = serializers.SerializerMethodField()
-    course_credits = serializers.SerializerMethodField()
-    instructor_name = serializers.SerializerMethodField()
+    # source= langsung ke relasi; allow_null untuk instructor yang bisa None
+    student_name = serializers.CharField(source='student.full_name', read_only=True, allow_null=True)
+    course_name = serializers.CharField(source='course.name', read_only=True, allow_null=True)
+    course_code = serializers.CharField(source='course.code', read_only=True, allow_null=True)
+    course_credits = serializers.IntegerField(source='course.credits', read_only=True, allow_null=True)
+    instructor_name = serializers.CharField(source='course.instructor.full_name', read_only=True, allow_null=True)
     grade_point = serializers.SerializerMethodField()
     
     class Meta:
@@ -114,26 +134,85 @@ class GradeSerializer(serializers.ModelSerializer):
             'created_at'
         ]
     
-    def get_student_name(self, obj):
-        return obj.student.full_name if obj.student else None
-    
-    def get_course_name(self, obj):
-        return obj.course.name if obj.course else None
-    
-    def get_course_code(self, obj):
-        return obj.course.code if obj.course else None
-    
-    def get_course_credits(self, obj):
-        return obj.course.credits if obj.course else None
-    
-    def get_instructor_name(self, obj):
-        """Handle case ketika instructor bisa None"""
-        if obj.course and obj.course.instructor:
-            return obj.course.instructor.full_name
-        return None
-    
     def get_grade_point(self, obj):
         return obj.get_grade_point() if obj.letter_grade else None
-    
 
 
+class GradeRowSerializer:
+    """
+    Fast path read-only untuk GradeSerializer: membaca kolom lewat .values()
+    (tanpa membuat instance model) dan menghasilkan dict dengan key, urutan
+    dan format yang sama persis, sehingga JSON-nya identik byte per byte.
+    """
+
+    # field output -> lookup .values()
+    VALUE_FIELDS = {
+        'id': 'id',
+        'course_code': 'course__code',
+        'course_name': 'course__name',
+        'course_credits': 'course__credits',
+        'instructor_name': 'course__instructor__full_name',
+        'student_name': 'student__full_name',
+        'assignment_score': 'assignment_score',
+        'midterm_score': 'midterm_score',
+        'final_score': 'final_score',
+        'final_grade': 'final_grade',
+        'letter_grade': 'letter_grade',
+        'created_at': 'created_at',
+    }
+    DECIMAL_FIELDS = ['assignment_score', 'midterm_score', 'final_score', 'final_grade']
+    # Kolom tambahan untuk pengelompokan (misal per course di dashboard dosen)
+    EXTRA_FIELDS = ['course_id']
+
+    def __init__(self, queryset, extra_fields=()):
+        self.queryset = queryset
+        self.extra_fields = [*self.EXTRA_FIELDS, *extra_fields]
+        # Field DRF hanya dipakai untuk format nilai, supaya identik;
+        # timezone diambil sekali, bukan per baris
+        self._decimal = serializers.DecimalField(max_digits=5, decimal_places=2)
+        self._datetime = serializers.DateTimeField(default_timezone=timezone.get_current_timezone())
+        self._plan = [
+            (field, self.VALUE_FIELDS.get(field), self._formatter(field))
+            for field in GradeSerializer.Meta.fields
+        ]
+
+    def _formatter(self, field):
+        if field in self.DECIMAL_FIELDS:
+            return self._format_decimal
+        if field == 'created_at':
+            return self._datetime.to_representation
+        return None
+
+    def _format_decimal(self, value):
+        # Nilai dari kolom decimal_places=2 sudah terkuantisasi
+        if isinstance(value, Decimal) and value.as_tuple().exponent == -2:
+            return f'{value:f}'
+        return self._decimal.to_representation(value)
+
+    def values(self):
+        return self.queryset.values(*self.VALUE_FIELDS.values(), *self.extra_fields)
+
+    def to_representation(self, row):
+        ret = {}
+        for field, source, formatter in self._plan:
+            if source is None:  # grade_point
+                letter = row['letter_grade']
+                ret[field] = Grade.GRADE_POINTS.get(letter, 0.0) if letter else None
+                continue
+            value = row[source]
+            if value is not None and formatter is not None:
+                value = formatter(value)
+            ret[field] = value
+        return ret
+
+    def iter_rows(self, chunk_size=None):
+        """(row mentah .values(), data) satu per satu, cocok untuk streaming"""
+        rows = self.values()
+        if chunk_size:
+            rows = rows.iterator(chunk_size=chunk_size)
+        for row in rows:
+            yield row, self.to_representation(row)
+
+    @property
+    def data(self):
+        return [data for _row, data in self.iter_rows()]
@@ -0,0 +1,112 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .authentication import revoke_user_tokens, user_cache
+from .course_stats import invalidate_course_stats
+from .models import Course, CustomUser, Grade, StudentSummary
+from .response_cache import invalidate_dashboards
+from .summaries import refresh_student_summaries
+
+# Penyimpanan user yang tidak memengaruhi isi dashboard
+NON_DASHBOARD_USER_FIELDS = {'last_login', 'password'}
+
+# Field yang tercermin di klaim JWT / menentukan hak akses
+CREDENTIAL_USER_FIELDS = {'email', 'role', 'is_active', 'is_staff', 'is_superuser'}
+
+# Field user yang disalin ke StudentSummary (partisi peringkat)
+SUMMARY_USER_FIELDS = {'major', 'date_joined'}
+
+
+def _deleting_students(origin):
+    """True jika delete berasal dari CustomUser (ringkasan ikut ter-cascade)"""
+    if isinstance(origin, QuerySet):
+        return origin.model is CustomUser
+    return isinstance(origin, CustomUser)
+
+
+@receiver(post_save, sender=Grade)
+def grade_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_course_stats(instance.course_id)
+    invalidate_dashboards()
+    refresh_student_summaries([instance.student_id])
+
+
+@receiver(post_delete, sender=Grade)
+def grade_deleted(sender, instance, origin=None, **kwargs):
+    invalidate_course_stats(instance.course_id)
+    invalidate_dashboards()
+    if _deleting_students(origin):
+        return
+    refresh_student_summaries([instance.student_id])
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_course_stats(instance.pk)
+    invalidate_dashboards()
+    # SKS bisa berubah -> IPK semua peserta ikut berubah
+    if created:
+        return
+    student_ids = list(instance.grades.values_list('student_id', flat=True))
+    if student_ids:
+        refresh_student_summaries(student_ids)
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    invalidate_course_stats(instance.pk)
+    invalidate_dashboards()
+
+
+def _credential_values(instance):
+    # Hanya field yang sudah dimuat: field deferred tidak ikut disimpan
+    return {field: instance.__dict__[field] for field in CREDENTIAL_USER_FIELDS if field in instance.__dict__}
+
+
+@receiver(post_init, sender=CustomUser)
+def user_loaded(sender, instance, **kwargs):
+    instance._saved_credentials = _credential_values(instance)
+
+
+def _changes_credentials(instance, update_fields):
+    # _password hanya terisi oleh set_password() yang disengaja; rehash
+    # saat login (check_password) mengosongkannya sebelum save
+    if instance._password is not None:
+        return True
+    fields = CREDENTIAL_USER_FIELDS if update_fields is None else CREDENTIAL_USER_FIELDS & set(update_fields)
+    before = instance._saved_credentials
+    return any(
+        field not in before or before[field] != instance.__dict__[field]
+        for field in fields
+        if field in instance.__dict__
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def user_saved(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    user_cache.discard(instance.pk)
+    if not created and _changes_credentials(instance, update_fields):
+        revoke_user_tokens(instance.pk)
+    instance._saved_credentials = _credential_values(instance)
+    if update_fields and set(update_fields) <= NON_DASHBOARD_USER_FIELDS:
+        return
+    if not created and instance.role == 'student' and (
+        update_fields is None or SUMMARY_USER_FIELDS & set(update_fields)
+    ):
+        StudentSummary.objects.filter(student=instance).update(
+            major=instance.major, cohort=instance.date_joined.year
+        )
+    invalidate_dashboards()
+
+
+@receiver(post_delete, sender=CustomUser)
+def user_deleted(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
+    invalidate_dashboards()
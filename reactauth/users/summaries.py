@@ -0,0 +1,114 @@
+"""
+Ringkasan transkrip mahasiswa (StudentSummary).
+
+Ringkasan diperbarui per mahasiswa yang terdampak: setiap perubahan Grade
+hanya menghitung ulang baris milik mahasiswa tersebut (satu query agregat
++ satu upsert), bukan seluruh tabel Grade.
+
+Jalur bulk (bulk_create / bulk_update / queryset.update) tidak memicu
+signal, jadi pemanggilnya wajib memanggil refresh_student_summaries()
+dengan id mahasiswa yang berubah (untuk Grade: lewat grading.save_grades).
+"""
+from collections import defaultdict
+
+from django.db.models import Count, F, FloatField, Q, Sum
+
+from .instrumentation import allow_batches
+from .models import CustomUser, Grade, StudentSummary
+
+SUMMARY_FIELDS = [
+    'total_courses', 'graded_courses', 'total_credits',
+    'total_points', 'gpa', 'semesters', 'major', 'cohort',
+]
+
+
+def _gpa(points, credits):
+    return round(points / credits, 2) if credits > 0 else 0.0
+
+
+def build_student_summaries(student_ids=None):
+    """
+    Hitung StudentSummary (belum disimpan) untuk student_ids,
+    atau untuk semua mahasiswa jika student_ids None.
+    """
+    students = CustomUser.objects.filter(role='student')
+    grades = Grade.objects.all()
+    if student_ids is not None:
+        students = students.filter(id__in=student_ids)
+        grades = grades.filter(student_id__in=student_ids)
+
+    graded = Q(letter_grade__isnull=False)
+    rows = grades.values('student_id', 'course__semester').annotate(
+        courses=Count('id'),
+        graded_courses=Count('id', filter=graded),
+        credits=Sum('course__credits', filter=graded, default=0),
+        points=Sum(
+            Grade.grade_point_expression() * F('course__credits'),
+            filter=graded,
+            default=0.0,
+            output_field=FloatField(),
+        ),
+    ).order_by()
+
+    per_student = defaultdict(list)
+    for row in rows:
+        per_student[row['student_id']].append(row)
+
+    summaries = {}
+    for student_id, major, date_joined in students.values_list('id', 'major', 'date_joined'):
+        semesters = {}
+        totals = {'courses': 0, 'graded_courses': 0, 'credits': 0, 'points': 0.0}
+        for row in sorted(per_student.get(student_id, []), key=lambda r: r['course__semester']):
+            semesters[row['course__semester']] = {
+                'courses': row['courses'],
+                'graded_courses': row['graded_courses'],
+                'credits': row['credits'],
+                'gpa': _gpa(row['points'], row['credits']),
+            }
+            for key in totals:
+                totals[key] += row[key]
+
+        summaries[student_id] = StudentSummary(
+            student_id=student_id,
+            total_courses=totals['courses'],
+            graded_courses=totals['graded_courses'],
+            total_credits=totals['credits'],
+            total_points=round(totals['points'], 4),
+            gpa=_gpa(totals['points'], totals['credits']),
+            semesters=semesters,
+            major=major,
+            cohort=date_joined.year,
+        )
+    return summaries
+
+
+def refresh_student_summaries(student_ids=None, batch_size=1000):
+    """Hitung ulang & upsert ringkasan; mengembalikan jumlah baris yang ditulis"""
+    summaries = list(build_student_summaries(student_ids).values())
+    allow_batches(len(summaries), len(StudentSummary._meta.concrete_fields) - 1, batch_size)
+    StudentSummary.objects.bulk_create(
+        summaries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['student'],
+        update_fields=SUMMARY_FIELDS + ['updated_at'],
+    )
+    return len(summaries)
+
+
+def find_summary_drift(student_ids=None):
+    """Bandingkan ringkasan tersimpan dengan hasil hitung ulang"""
+    expected = build_student_summaries(student_ids)
+    stored = StudentSummary.objects.filter(student_id__in=list(expected))
+    stored = {s.student_id: s for s in stored}
+
+    drift = {}
+    for student_id, fresh in expected.items():
+        current = stored.get(student_id)
+        if current is None:
+            drift[student_id] = ['missing']
+            continue
+        fields = [f for f in SUMMARY_FIELDS if getattr(current, f) != getattr(fresh, f)]
+        if fields:
+            drift[student_id] = fields
+    return drift
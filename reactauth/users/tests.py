@@ -1,3 +1,1502 @@
-from django.test import TestCase
+import csv
+import json
+import logging
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from functools import partial
+from importlib import import_module
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections, transaction
+from django.db.backends.signals import connection_created
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import grading, instrumentation, renderers, response_cache
+from .analytics import WATERMARK_OVERLAP, refresh_rollups
+from .authentication import user_cache
+from .grade_import import import_grades
+from .grading import DEFAULT_SCHEME
+from .management.commands._benchdata import delete_gradebook, refresh_bench_summaries, seed_gradebook
+from .models import Course, CustomUser, Grade, GradeRollup, RollupWatermark, StudentSummary
+from .recompute import GradeRecomputer
+from .serializers import CustomTokenObtainPairSerializer, GradeRowSerializer, GradeSerializer
+from .summaries import refresh_student_summaries
+from .urls import urlpatterns
+from .views import StudentDashboardView, instructor_dashboard_payload
+
+
+def make_student(n):
+    return CustomUser.objects.create_user(
+        email=f"student{n}@student.prasetiyamulya.ac.id",
+        username=f"student{n}",
+        password="password123",
+        full_name=f"Student {n}",
+        major="business_mathematics",
+        role="student",
+    )
+
+
+def make_instructor(n=0):
+    return CustomUser.objects.create_user(
+        email=f"dosen{n}@prasetiyamulya.ac.id",
+        username=f"dosen{n}",
+        password="password123",
+        full_name=f"Dosen {n}",
+        major="business_mathematics",
+        role="instructor",
+    )
+
+
+def make_course(n, instructor=None, semester="1"):
+    return Course.objects.create(
+        code=f"BM{n:03d}",
+        name=f"Course {n}",
+        credits=3,
+        semester=semester,
+        major="business_mathematics",
+        instructor=instructor,
+    )
+
+
+def make_grade(student, course, scores=(80, 75, 90)):
+    return Grade.objects.create(
+        student=student,
+        course=course,
+        assignment_score=Decimal(scores[0]),
+        midterm_score=Decimal(scores[1]),
+        final_score=Decimal(scores[2]),
+    )
+
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class InstructorDashboardQueryTests(TestCase):
+    """Jumlah query dashboard dosen tidak boleh tumbuh dengan data"""
+
+    def setUp(self):
+        self.instructor = make_instructor()
+        self.url = reverse("instructor_dashboard")
+
+    def populate(self, n_courses, n_students):
+        students = [make_student(i) for i in range(n_students)]
+        for c in range(n_courses):
+            course = make_course(c, instructor=self.instructor)
+            for student in students:
+                make_grade(student, course)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"email": self.instructor.email})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.json()
+
+    def test_query_count_is_flat(self):
+        self.populate(1, 1)
+        small, _ = self.count_queries()
+
+        Grade.objects.all().delete()
+        Course.objects.all().delete()
+        CustomUser.objects.filter(role="student").delete()
+
+        self.populate(5, 8)
+        large, data = self.count_queries()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(data["courses"]), 5)
+        self.assertEqual(len(data["courses"][0]["grades"]), 8)
+        self.assertEqual(
+            data["courses"][0]["grades"][0]["instructor_name"],
+            self.instructor.full_name,
+        )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class StudentDashboardTests(TestCase):
+    """Statistik IPK dihitung di database, maksimal dua query"""
+
+    def setUp(self):
+        self.student = make_student(0)
+        self.url = reverse("student_dashboard")
+
+    def test_gpa_and_query_budget(self):
+        graded = make_course(1)
+        graded.credits = 4
+        graded.save()
+        make_grade(self.student, graded, scores=(90, 90, 90))  # A -> 4.0
+        make_grade(self.student, make_course(2), scores=(70, 70, 70))  # B -> 3.0
+        Grade.objects.create(student=self.student, course=make_course(3))
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"email": self.student.email})
+
+        stats = response.json()["statistics"]
+        self.assertEqual(stats["total_courses"], 3)
+        self.assertEqual(stats["total_credits"], 7)
+        self.assertEqual(stats["gpa"], round((4.0 * 4 + 3.0 * 3) / 7, 2))
+        self.assertEqual(len(response.json()["grades"]), 3)
+
+    def test_logging_without_extra_queries(self):
+        make_grade(self.student, make_course(1))
+        # Level produksi (INFO dari settings.LOGGING): tidak ada output,
+        # tidak ada query tambahan
+        logger = logging.getLogger("users.views")
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        stdout = self.enterContext(mock.patch("sys.stdout", new_callable=StringIO))
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {"email": self.student.email})
+        self.assertEqual((records, stdout.getvalue()), ([], ""))
+
+        cache.clear()  # lewati cache respons dashboard
+        with self.assertLogs("users.views", "DEBUG") as logs, self.assertNumQueries(2):
+            self.client.get(self.url, {"email": self.student.email})
+        self.assertIn(f"student_id={self.student.pk} grades=1", logs.output[0])
+
+    def test_no_grades(self):
+        response = self.client.get(self.url, {"email": self.student.email})
+        self.assertEqual(
+            response.json()["statistics"],
+            {"total_courses": 0, "gpa": 0.0, "total_credits": 0, "ranking": {"major": None, "cohort": None}},
+        )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class StudentSummaryTests(TestCase):
+    """StudentSummary selalu sinkron dengan Grade"""
+
+    def setUp(self):
+        self.student = make_student(0)
+
+    def test_summary_follows_grade_writes(self):
+        course = make_course(1, semester="2")
+        grade = make_grade(self.student, course, scores=(90, 90, 90))
+        summary = StudentSummary.objects.get(student=self.student)
+        self.assertEqual((summary.gpa, summary.total_credits), (4.0, 3))
+        self.assertEqual(summary.semesters["2"]["graded_courses"], 1)
+
+        grade.final_score = Decimal(0)
+        grade.save()  # 90*0.3 + 90*0.3 = 54 -> D
+        summary.refresh_from_db()
+        self.assertEqual(summary.gpa, 1.0)
+
+        course.credits = 6
+        course.save()
+        summary.refresh_from_db()
+        self.assertEqual(summary.total_credits, 6)
+
+        grade.delete()
+        summary.refresh_from_db()
+        self.assertEqual((summary.total_courses, summary.gpa, summary.semesters), (0, 0.0, {}))
+
+    def test_deleting_student_cascades(self):
+        make_grade(self.student, make_course(1))
+        self.student.delete()
+        self.assertFalse(StudentSummary.objects.exists())
+
+    def test_rebuild_command_detects_and_fixes_drift(self):
+        make_grade(self.student, make_course(1))
+        StudentSummary.objects.update(gpa=1.23)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_student_summaries", "--check", stdout=StringIO())
+        call_command("rebuild_student_summaries", stdout=StringIO())
+        call_command("rebuild_student_summaries", "--check", stdout=StringIO())
+        self.assertEqual(StudentSummary.objects.get().gpa, 3.7)  # 82.5 -> A-
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CourseStatsTests(TestCase):
+    """Statistik course dibaca dari cache dan diinvalidasi oleh penulisan Grade"""
+
+    def setUp(self):
+        cache.clear()
+        self.course = make_course(1)
+        self.students = [make_student(i) for i in range(3)]
+
+    def test_stats_values(self):
+        make_grade(self.students[0], self.course, scores=(90, 90, 90))
+        make_grade(self.students[1], self.course, scores=(50, 50, 50))
+        Grade.objects.create(student=self.students[2], course=self.course)
+
+        stats = self.course.get_statistics()
+        self.assertEqual(self.course.get_total_students(), 3)
+        self.assertEqual(stats["graded"], 2)
+        self.assertEqual(self.course.get_average_grade(), Decimal("70.00"))
+        self.assertEqual((stats["min"], stats["max"]), (Decimal("50.00"), Decimal("90.00")))
+        self.assertEqual(stats["distribution"]["A"], 1)
+        self.assertEqual(stats["distribution"]["D"], 1)
+
+    def test_cached_until_grade_write(self):
+        grade = make_grade(self.students[0], self.course, scores=(90, 90, 90))
+        self.assertEqual(self.course.get_average_grade(), Decimal("90.00"))
+
+        with self.assertNumQueries(0):
+            self.course.get_average_grade()
+
+        grade.final_score = Decimal(40)  # 27 + 27 + 16 = 70
+        grade.save()
+        self.assertEqual(self.course.get_average_grade(), Decimal("70.00"))
+
+        grade.delete()
+        self.assertEqual(self.course.get_total_students(), 0)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradeImportTests(TestCase):
+    """Import nilai bulk via CSV/JSON"""
+
+    def setUp(self):
+        cache.clear()
+        self.instructor = make_instructor()
+        self.course = make_course(1, instructor=self.instructor)
+        self.other_course = make_course(2)
+        self.students = [make_student(i) for i in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.instructor)
+        self.url = reverse("grade_import")
+
+    def test_csv_import_creates_updates_and_reports(self):
+        make_grade(self.students[0], self.course, scores=(10, 10, 10))
+        content = (
+            "student_email,course_code,assignment_score,midterm_score,final_score\n"
+            f"{self.students[0].email},BM001,90,90,\n"
+            f"{self.students[1].email},BM001,70,70,70\n"
+            f"{self.students[2].email},BM002,70,70,70\n"
+            f"nobody@student.prasetiyamulya.ac.id,BM001,70,70,70\n"
+            f"{self.students[1].email},BM001,101,70,70\n"
+        )
+        upload = SimpleUploadedFile("grades.csv", content.encode(), content_type="text/csv")
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+
+        report = response.json()
+        self.assertEqual((report["created"], report["updated"]), (1, 1))
+        self.assertEqual([e["row"] for e in report["errors"]], [3, 4, 5])
+        self.assertIn("assignment_score", report["errors"][2]["errors"])
+
+        updated = Grade.objects.get(student=self.students[0])
+        self.assertEqual(updated.final_grade, Decimal("58.00"))  # 27 + 27 + 4
+        self.assertEqual(updated.letter_grade, "C")
+        created = Grade.objects.get(student=self.students[1])
+        self.assertEqual((created.final_grade, created.letter_grade), (Decimal("70.00"), "B"))
+        self.assertEqual(StudentSummary.objects.get(student=self.students[1]).gpa, 3.0)
+        self.assertEqual(self.course.get_total_students(), 2)
+
+    def test_json_import_in_chunks(self):
+        rows = [
+            {"student_email": s.email, "course_code": "BM001",
+             "assignment_score": 80, "midterm_score": 80, "final_score": 80}
+            for s in self.students
+        ]
+        report = import_grades(self.instructor, rows, chunk_size=2)
+        self.assertEqual((report["created"], report["error_count"]), (3, 0))
+        self.assertEqual(
+            set(Grade.objects.values_list("letter_grade", flat=True)), {"A-"}
+        )
+
+    def test_non_string_fields_reported_per_row(self):
+        rows = [
+            {"student_email": self.students[0].email, "course_code": 101},
+            {"student_email": ["x"], "course_code": "BM001"},
+            {"student_email": self.students[1].email, "course_code": "BM001", "assignment_score": 90},
+        ]
+        response = self.client.post(self.url, rows, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(
+            [e["errors"] for e in report["errors"]],
+            [{"course_code": ["Not a valid string."]}, {"student_email": ["Not a valid string."]}],
+        )
+
+    def test_invalid_utf8_mid_file_reports_saved_rows(self):
+        content = (
+            "student_email,course_code,final_score\n"
+            f"{self.students[0].email},BM001,70\n"
+            f"{self.students[1].email},BM001,70\n"
+        ).encode() + b"\xff\xfe,BM001,70\n" + f"{self.students[2].email},BM001,70\n".encode()
+        upload = SimpleUploadedFile("grades.csv", content, content_type="text/csv")
+        with mock.patch("users.views.import_grades", partial(import_grades, chunk_size=1)):
+            response = self.client.post(self.url, {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, 400)
+        report = response.json()
+        self.assertIn("UTF-8", report["error"])
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(Grade.objects.count(), 2)
+
+    def test_students_cannot_import(self):
+        self.client.force_authenticate(self.students[0])
+        response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradingSchemeTests(TestCase):
+    """grading.py: hasil array == per baris, bobot & ambang per course"""
+
+    def test_array_matches_single_and_fallback(self):
+        values = [Decimal(v).scaleb(-2) for v in range(0, 10001, 37)]
+        columns = (values, values[::-1], values[5:] + values[:5])
+        columns[0][3] = None
+        expected = [DEFAULT_SCHEME.compute_one(*row) for row in zip(*columns)]
+
+        self.assertIsNone(expected[3])
+        self.assertEqual(DEFAULT_SCHEME.compute(*columns), expected)
+        with mock.patch.object(grading, "np", None):
+            self.assertEqual(DEFAULT_SCHEME.compute(*columns), expected)
+
+    def test_default_bands(self):
+        cases = {84.99: "A-", 85: "A", 40: "D", 39.99: "E", 0: "E", 100: "A"}
+        for score, letter in cases.items():
+            self.assertEqual(DEFAULT_SCHEME.compute_one(score, score, score)[1], letter)
+
+    def test_course_scheme(self):
+        course = make_course(1)
+        course.assignment_weight, course.midterm_weight, course.final_weight = 0, 50, 50
+        course.grade_cutoffs = {"A": 90, "B": 60, "D": 30}
+        course.full_clean()
+        course.save()
+
+        grade = Grade.objects.create(
+            student=make_student(0), course=course,
+            assignment_score=0, midterm_score=Decimal("80.25"), final_score=Decimal("40.50"),
+        )
+        grade.refresh_from_db()
+        self.assertEqual((grade.final_grade, grade.letter_grade), (Decimal("60.38"), "B"))
+
+    def test_invalid_scheme_rejected(self):
+        course = make_course(1)
+        course.final_weight = 50
+        with self.assertRaises(ValidationError):
+            course.full_clean()
+        course.final_weight, course.grade_cutoffs = 40, {"Z": 10}
+        with self.assertRaises(ValidationError):
+            course.full_clean()
+        course.grade_cutoffs = {"A": 60, "B": 90}  # A harus lebih tinggi dari B
+        with self.assertRaises(ValidationError):
+            course.full_clean()
+        with self.assertRaises(ValueError):
+            grading.GradingScheme(cutoffs=[("B", 90), ("A", 60)])
+
+    def test_save_loads_course_only_when_scoring(self):
+        grade_id = make_grade(make_student(0), make_course(1), scores=(80, 75, 90)).pk
+
+        def course_loads(save):
+            grade = Grade.objects.get(pk=grade_id)
+            with CaptureQueriesContext(connection) as queries:
+                save(grade)
+            return sum('FROM "users_course"' in query["sql"] for query in queries)
+
+        self.assertEqual(course_loads(lambda g: g.save(update_fields=["updated_at"])), 0)
+        self.assertEqual(course_loads(lambda g: setattr(g, "final_score", None) or g.save()), 0)
+        self.assertEqual(course_loads(lambda g: setattr(g, "final_score", 90) or g.save()), 1)
+        self.assertEqual(Grade.objects.get(pk=grade_id).letter_grade, "A-")
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class RecomputeGradesTests(TestCase):
+    """manage.py recompute_grades menulis ulang hanya baris yang berubah"""
+
+    def setUp(self):
+        cache.clear()
+        self.course = make_course(1)
+        self.other = make_course(2, semester="2")
+        self.student = make_student(0)
+        self.grade = make_grade(self.student, self.course, scores=(100, 100, 50))  # 80 -> A-
+        self.untouched = make_grade(self.student, self.other, scores=(100, 100, 50))
+        # Ubah skema tanpa menyimpan ulang grade
+        Course.objects.filter(pk__in=[self.course.pk, self.other.pk]).update(
+            assignment_weight=50, midterm_weight=50, final_weight=0
+        )
+
+    def test_dry_run_writes_nothing(self):
+        out = StringIO()
+        call_command("recompute_grades", "--dry-run", stdout=out, stderr=StringIO())
+        self.assertIn(f"grade {self.grade.pk}: 80.00 (A-) -> 100.00 (A)", out.getvalue())
+        self.grade.refresh_from_db()
+        self.assertEqual(self.grade.letter_grade, "A-")
+
+    def test_recompute_filtered_by_semester(self):
+        call_command("recompute_grades", "--semester", "1", "--chunk-size", "1",
+                     stdout=StringIO(), stderr=StringIO())
+        self.grade.refresh_from_db()
+        self.untouched.refresh_from_db()
+        self.assertEqual((self.grade.final_grade, self.grade.letter_grade), (Decimal("100.00"), "A"))
+        self.assertEqual(self.untouched.letter_grade, "A-")
+        self.assertEqual(StudentSummary.objects.get(student=self.student).gpa, round((4.0 + 3.7) / 2, 2))
+        self.assertEqual(self.course.get_statistics()["distribution"]["A"], 1)
+
+    def test_keyset_chunks_scan_each_row_once(self):
+        for i in range(1, 6):
+            make_grade(make_student(i), self.course, scores=(100, 100, 50))
+        stats = GradeRecomputer([self.course.pk, self.other.pk], chunk_size=2).run()
+        self.assertEqual((stats["scanned"], stats["changed"]), (7, 7))
+        self.assertEqual(set(Grade.objects.values_list("letter_grade", flat=True)), {"A"})
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN khusus SQLite")
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradeIndexPlanTests(TestCase):
+    """Query dashboard memakai index Grade, tanpa sort di temp b-tree"""
+
+    def setUp(self):
+        self.student = make_student(0)
+        self.course = make_course(1)
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index_name}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_student_grades_recent_first(self):
+        self.assertUsesIndex(
+            Grade.objects.filter(student=self.student).select_related("course", "course__instructor"),
+            "users_grade_student_recent_idx",
+        )
+
+    def test_student_graded_rows(self):
+        self.assertUsesIndex(
+            Grade.objects.filter(student=self.student, letter_grade__isnull=False).values("id").order_by(),
+            "users_grade_student_graded_idx",
+        )
+
+    def test_instructor_prefetch(self):
+        self.assertUsesIndex(
+            Grade.objects.filter(course_id__in=[self.course.pk, self.course.pk + 1])
+            .select_related("student").order_by("course_id", "-created_at"),
+            "users_grade_course_recent_idx",
+        )
+
+    def test_course_grades_recent_first(self):
+        self.assertUsesIndex(
+            Grade.objects.filter(course=self.course),
+            "users_grade_course_recent_idx",
+        )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CourseGradebookTests(TestCase):
+    """Gradebook per course: keyset pagination & streaming export"""
+
+    def setUp(self):
+        self.instructor = make_instructor()
+        self.course = make_course(1, instructor=self.instructor)
+        self.grades = [make_grade(make_student(i), self.course) for i in range(5)]
+        # created_at kembar untuk menguji tie-break pada id
+        Grade.objects.filter(pk__in=[g.pk for g in self.grades[:3]]).update(
+            created_at=self.grades[0].created_at
+        )
+        self.url = reverse("course_gradebook", args=[self.course.code])
+        self.params = {"email": self.instructor.email}
+
+    def test_pages_cover_all_rows_in_order(self):
+        expected = list(
+            Grade.objects.filter(course=self.course)
+            .order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        seen, url, params = [], self.url, {**self.params, "page_size": 2}
+        while url:
+            with self.assertNumQueries(3):  # instructor, course, satu halaman
+                data = self.client.get(url, params).json()
+            seen += [row["id"] for row in data["results"]]
+            url, params = data["next"], None
+        self.assertEqual(seen, expected)
+
+    def test_other_instructor_course_is_404(self):
+        other = make_course(2, instructor=make_instructor(1))
+        url = reverse("course_gradebook", args=[other.code])
+        self.assertEqual(self.client.get(url, self.params).status_code, 404)
+
+    def test_streaming_exports(self):
+        response = self.client.get(self.url, {**self.params, "export": "ndjson"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])["course_code"], self.course.code)
+
+        response = self.client.get(self.url, {**self.params, "export": "csv"})
+        rows = list(csv.DictReader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["letter_grade"], "A-")
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradeRowSerializerTests(TestCase):
+    """Fast path .values() menghasilkan JSON identik dengan GradeSerializer"""
+
+    def test_byte_identical_json(self):
+        instructor = make_instructor()
+        student = make_student(0)
+        make_grade(student, make_course(1, instructor=instructor), scores=(80.5, 75, 90))
+        make_grade(student, make_course(2), scores=(10, 20, 30))  # tanpa dosen
+        Grade.objects.create(student=student, course=make_course(3), midterm_score=Decimal("70.1"))
+
+        grades = Grade.objects.all()
+        slow = JSONRenderer().render(
+            GradeSerializer(grades.select_related("student", "course__instructor"), many=True).data
+        )
+        fast = JSONRenderer().render(GradeRowSerializer(grades).data)
+        self.assertEqual(fast, slow)
+
+    def test_student_dashboard_without_summary(self):
+        student = make_student(0)
+        make_grade(student, make_course(1), scores=(90, 90, 90))
+        StudentSummary.objects.all().delete()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("student_dashboard"), {"email": student.email})
+        self.assertEqual(response.json()["statistics"]["gpa"], 4.0)
+
+
+NO_RESPONSE_CACHE = {
+    "CACHES": {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "dummy": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    },
+    "DASHBOARD_CACHE_ALIAS": "dummy",
+}
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, **NO_RESPONSE_CACHE)
+class DashboardETagTests(TestCase):
+    """Conditional GET: 304 dari satu query, ETag berubah saat nilai berubah"""
+
+    def setUp(self):
+        self.instructor = make_instructor()
+        self.student = make_student(0)
+        self.grade = make_grade(self.student, make_course(1, instructor=self.instructor))
+
+    def assertRevalidates(self, url, email):
+        first = self.client.get(url, {"email": email})
+        etag = first["ETag"]
+        self.assertEqual(first.status_code, 200)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, {"email": email}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+
+        self.grade.final_score = Decimal(10)
+        self.grade.save()
+        changed = self.client.get(url, {"email": email}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_student_dashboard(self):
+        self.assertRevalidates(reverse("student_dashboard"), self.student.email)
+
+    def test_instructor_dashboard(self):
+        self.assertRevalidates(reverse("instructor_dashboard"), self.instructor.email)
+
+    def test_renamed_peer_changes_etag(self):
+        # Nama mahasiswa tampil di dashboard dosen, nama dosen di dashboard mahasiswa
+        for url, viewer, peer in [
+            (reverse("instructor_dashboard"), self.instructor, self.student),
+            (reverse("student_dashboard"), self.student, self.instructor),
+        ]:
+            etag = self.client.get(url, {"email": viewer.email})["ETag"]
+            peer.full_name = f"{peer.full_name} (baru)"
+            peer.save()
+            changed = self.client.get(url, {"email": viewer.email}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(changed.status_code, 200, url)
+            self.assertIn("(baru)", changed.content.decode())
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class DashboardResponseCacheTests(TestCase):
+    """Cache hit tanpa query; setiap penulisan membuat entri lama tak terbaca"""
+
+    def setUp(self):
+        cache.clear()
+        response_cache.stats.reset()
+        self.instructor = make_instructor()
+        self.student = make_student(0)
+        self.course = make_course(1, instructor=self.instructor)
+        self.grade = make_grade(self.student, self.course)
+        self.url = reverse("student_dashboard")
+        self.params = {"email": self.student.email}
+
+    def test_hit_skips_database(self):
+        first = self.client.get(self.url, self.params)
+        with self.assertNumQueries(0):
+            hit = self.client.get(self.url, self.params)
+            not_modified = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(hit.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(response_cache.stats.snapshot(), {"student": {"hits": 2, "misses": 1}})
+
+    def test_writes_invalidate(self):
+        def letter():
+            return self.client.get(self.url, self.params).json()["grades"][0]["letter_grade"]
+
+        def instructor_name():
+            return self.client.get(self.url, self.params).json()["grades"][0]["instructor_name"]
+
+        self.assertEqual(letter(), "A-")
+        self.grade.final_score = Decimal(0)
+        self.grade.save()
+        self.assertEqual(letter(), "D")
+
+        self.assertEqual(instructor_name(), "Dosen 0")
+        self.instructor.full_name = "Dosen Baru"
+        self.instructor.save()
+        self.assertEqual(instructor_name(), "Dosen Baru")
+
+        self.grade.delete()
+        self.assertEqual(self.client.get(self.url, self.params).json()["grades"], [])
+
+    def test_bulk_import_invalidates(self):
+        self.client.get(self.url, self.params)
+        import_grades(self.instructor, [{
+            "student_email": self.student.email, "course_code": self.course.code,
+            "final_score": "0",
+        }])
+        self.assertEqual(
+            self.client.get(self.url, self.params).json()["grades"][0]["letter_grade"], "D"
+        )
+
+    def test_stats_endpoint_is_admin_only(self):
+        url = reverse("dashboard_cache_stats")
+        self.assertIn(self.client.get(url).status_code, (401, 403))
+        admin_user = CustomUser.objects.create_superuser(
+            email="admin@prasetiyamulya.ac.id", username="admin", password="x", full_name="Admin"
+        )
+        api = APIClient()
+        api.force_authenticate(admin_user)
+        self.assertEqual(api.get(url).status_code, 200)
+
+
+class FastJSONRendererTests(TestCase):
+    """Output orjson harus byte-identik dengan JSONRenderer bawaan"""
+
+    data = {
+        "final_grade": Decimal("82.50"),
+        "text": "naïve \u2028 line",
+        "created_at": Grade._meta.get_field("created_at").to_python("2024-01-02T03:04:05.123456Z"),
+        "nested": [{"credits": 3, "ok": True, "none": None}],
+        1: "non-str key",
+    }
+
+    def test_matches_stdlib(self):
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(renderers.FastJSONRenderer().render(self.data), expected)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(renderers.FastJSONRenderer().render(self.data), expected)
+
+    def test_indent_and_big_int_fall_back(self):
+        context = {"indent": 2}
+        self.assertEqual(
+            renderers.FastJSONRenderer().render(self.data, renderer_context=context),
+            JSONRenderer().render(self.data, renderer_context=context),
+        )
+        self.assertEqual(renderers.FastJSONRenderer().render({"n": 2 ** 70}), b'{"n":1180591620717411303424}')
+
+
+@override_settings(
+    PASSWORD_HASHERS=settings.PASSWORD_HASHER_PROFILES["pbkdf2"],
+    PASSWORD_HASHER_PARAMS={"pbkdf2": {"iterations": 1000}},
+)
+class PasswordHasherProfileTests(TestCase):
+    """Hash lama di-upgrade ke parameter profil saat login berhasil"""
+
+    def setUp(self):
+        self.student = make_student(0)
+
+    def login(self, password="password123"):
+        return self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": self.student.email, "password": password},
+            content_type="application/json",
+        )
+
+    def stored_hash(self):
+        self.student.refresh_from_db()
+        return self.student.password
+
+    def test_rehash_on_login(self):
+        self.assertTrue(self.stored_hash().startswith("pbkdf2_sha256$1000$"))
+
+        with self.settings(PASSWORD_HASHER_PARAMS={"pbkdf2": {"iterations": 1200}}):
+            self.assertEqual(self.login("wrong").status_code, 401)
+            self.assertTrue(self.stored_hash().startswith("pbkdf2_sha256$1000$"))
+            self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(self.stored_hash().startswith("pbkdf2_sha256$1200$"))
+
+    def test_legacy_algorithm_upgraded(self):
+        CustomUser.objects.filter(pk=self.student.pk).update(
+            password=make_password("password123", hasher="pbkdf2_sha1")
+        )
+        self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(self.stored_hash().startswith("pbkdf2_sha256$1000$"))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, JWT_STATELESS_AUTH=True)
+class ClaimsAuthenticationTests(TestCase):
+    """Auth JWT dari klaim: tanpa query user, dengan revokasi"""
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.student = make_student(0)
+        self.instructor = make_instructor()
+        self.course = make_course(1, instructor=self.instructor)
+
+    def api(self, user):
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": user.email, "password": "password123"},
+            content_type="application/json",
+        )
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+        return api
+
+    def import_row(self, api):
+        return api.post(reverse("grade_import"), [{
+            "student_email": self.student.email, "course_code": self.course.code, "final_score": "90",
+        }], format="json")
+
+    def test_role_checks_without_user_query(self):
+        api = self.api(self.student)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.import_row(api).status_code, 403)
+            self.assertEqual(api.get(reverse("dashboard_cache_stats")).status_code, 403)
+
+        self.student.is_staff = True
+        self.student.save()
+        self.assertEqual(self.api(self.student).get(reverse("dashboard_cache_stats")).status_code, 200)
+
+        api = self.api(self.instructor)
+        self.assertEqual(self.import_row(api).json()["created"], 1)
+
+    def test_revocation(self):
+        api = self.api(self.instructor)
+        self.assertEqual(self.import_row(api).status_code, 200)
+
+        self.instructor.is_active = False
+        self.instructor.save(update_fields=["is_active"])
+        self.assertEqual(self.import_row(api).status_code, 401)
+
+        self.instructor.is_active = True
+        self.instructor.save(update_fields=["is_active"])
+        api = self.api(self.instructor)
+        self.assertEqual(self.import_row(api).status_code, 200)
+
+        self.instructor.set_password("password456")
+        self.instructor.save(update_fields=["password"])
+        self.assertEqual(self.import_row(api).status_code, 401)
+
+    def test_unrelated_saves_keep_tokens(self):
+        api = self.api(self.instructor)
+        self.instructor.full_name = "Dosen Baru"
+        self.instructor.save(update_fields=["full_name"])
+        self.instructor.save(update_fields=["last_login", "password"])
+        self.instructor.major = "business_mathematics"
+        self.instructor.save()  # save penuh tanpa perubahan kredensial
+        CustomUser.objects.get(pk=self.instructor.pk).save()
+        self.assertEqual(self.import_row(api).status_code, 200)
+
+        instructor = CustomUser.objects.get(pk=self.instructor.pk)
+        instructor.role = "student"
+        instructor.save()
+        self.assertEqual(self.import_row(api).status_code, 401)
+
+    @override_settings(JWT_STATELESS_AUTH=False)
+    def test_disabled_uses_database(self):
+        api = self.api(self.student)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.import_row(api).status_code, 403)
+
+    def test_token_without_claims_uses_database(self):
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.student)}")
+        with self.assertNumQueries(1):
+            self.assertEqual(self.import_row(api).status_code, 403)
+        self.student.delete()
+        self.assertEqual(self.import_row(api).status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, **NO_RESPONSE_CACHE)
+class AsyncDashboardTests(TestCase):
+    """View async: payload, ETag & error sama dengan view sync"""
+
+    def setUp(self):
+        self.instructor = make_instructor()
+        self.student = make_student(0)
+        for n in range(3):
+            make_grade(self.student, make_course(n, instructor=self.instructor))
+        make_grade(make_student(1), make_course(3, instructor=self.instructor))
+
+    async def assertSameAsSync(self, sync_url, async_url, email):
+        expected = await sync_to_async(self.client.get)(sync_url, {"email": email})
+        response = await self.async_client.get(async_url, {"email": email})
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        if expected.status_code == 200:
+            self.assertEqual(response["ETag"], expected["ETag"])
+        return response
+
+    async def test_student_dashboard(self):
+        sync_url, async_url = reverse("student_dashboard"), reverse("async_student_dashboard")
+        await self.assertSameAsSync(sync_url, async_url, self.student.email)
+        await StudentSummary.objects.filter(student=self.student).adelete()
+        await self.assertSameAsSync(sync_url, async_url, self.student.email)
+        await self.assertSameAsSync(sync_url, async_url, "nobody@student.prasetiyamulya.ac.id")
+        await self.assertSameAsSync(sync_url, async_url, "")
+
+    async def test_instructor_dashboard(self):
+        sync_url, async_url = reverse("instructor_dashboard"), reverse("async_instructor_dashboard")
+        response = await self.assertSameAsSync(sync_url, async_url, self.instructor.email)
+        self.assertEqual(len(json.loads(response.content)["courses"]), 4)
+        await self.assertSameAsSync(sync_url, async_url, "nobody@prasetiyamulya.ac.id")
+        await self.assertSameAsSync(sync_url, async_url, "dosen@gmail.com")
+
+    def test_grades_of_unlisted_course_are_skipped(self):
+        # Course + grade dibuat di antara query course dan query grade
+        courses = list(Course.objects.filter(code="BM000"))
+        rows = GradeRowSerializer(Grade.objects.filter(course__instructor=self.instructor)).iter_rows()
+        data = instructor_dashboard_payload(self.instructor, courses, {courses[0].pk: {}}, rows)
+        self.assertEqual([len(course["grades"]) for course in data["courses"]], [1])
+
+    def test_revalidation_is_one_query(self):
+        for name, email in [("async_student_dashboard", self.student.email),
+                            ("async_instructor_dashboard", self.instructor.email)]:
+            url = reverse(name)
+            etag = async_to_sync(self.async_client.get)(url, {"email": email})["ETag"]
+            with self.assertNumQueries(1):
+                cached = async_to_sync(self.async_client.get)(
+                    url, {"email": email}, headers={"If-None-Match": etag}
+                )
+            self.assertEqual(cached.status_code, 304)
+
+
+@skipUnless(connection.vendor == "sqlite", "PRAGMA khusus SQLite")
+class SQLitePragmaTests(TestCase):
+    """PRAGMA dari settings dijalankan untuk setiap koneksi baru"""
+
+    def pragma_on_new_connection(self, name):
+        new = connections.create_connection("default")
+        try:
+            with new.cursor() as cursor:
+                cursor.execute(f"PRAGMA {name}")
+                return cursor.fetchone()[0]
+        finally:
+            new.close()
+
+    def test_connection_pragmas(self):
+        with override_settings(SQLITE_PRAGMAS=settings.SQLITE_WAL_PRAGMAS):
+            self.assertEqual(self.pragma_on_new_connection("synchronous"), 1)  # NORMAL
+        with override_settings(SQLITE_PRAGMAS={"synchronous": "OFF"}):
+            self.assertEqual(self.pragma_on_new_connection("synchronous"), 0)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class RegistrationTests(TestCase):
+    """Duplikat ditangkap oleh unique index, tanpa query exists() terpisah"""
+
+    def register(self, email, username="ignored"):
+        return self.client.post(reverse("register"), {
+            "email": email, "username": username, "full_name": "Ana", "major": "business_mathematics",
+            "role": "student", "password": "secret123", "password_confirmation": "secret123",
+        }, content_type="application/json")
+
+    def test_register_and_duplicate(self):
+        make_student(0)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.register("Ana@student.prasetiyamulya.ac.id", username="student0")
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse([q for q in queries if "SELECT" in q["sql"]])
+        self.assertEqual(CustomUser.objects.get(email="ana@student.prasetiyamulya.ac.id").role, "student")
+
+        duplicate = self.register("ana@student.prasetiyamulya.ac.id")
+        self.assertEqual(duplicate.status_code, 400)
+        self.assertEqual(duplicate.json(), {"email": ["Email is already in use."]})
+
+        # Username turunan bentrok (ana@ dosen vs ana@ mahasiswa)
+        clash = self.register("ana@prasetiyamulya.ac.id")
+        self.assertEqual(clash.status_code, 400)
+        self.assertIn("username", clash.json())
+        self.assertEqual(self.register("ana@gmail.com").status_code, 400)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ProvisionStudentsTests(TestCase):
+
+    def test_roster(self):
+        make_student(0)
+        roster = (
+            "email,full_name,major,password,password_hash\n"
+            "Ana@student.prasetiyamulya.ac.id,Ana,business_mathematics,secret123,\n"
+            f"budi@student.prasetiyamulya.ac.id,Budi,,,{make_password('hashed')}\n"
+            "cici@student.prasetiyamulya.ac.id,Cici,,,\n"
+            "student0@student.prasetiyamulya.ac.id,Sudah Ada,,,\n"
+            "ana@student.prasetiyamulya.ac.id,Ana lagi,,,\n"
+            "dosen@prasetiyamulya.ac.id,Dosen,,,\n"
+            "dedi@student.prasetiyamulya.ac.id,Dedi,unknown,,\n"
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as path:
+            path.write(roster)
+            path.flush()
+            out = StringIO()
+            call_command("provision_students", path.name, "--workers", "1", stdout=out, stderr=StringIO())
+        self.assertIn("3 dibuat, 1 sudah ada, 3 gagal", out.getvalue())
+
+        users = {u.email: u for u in CustomUser.objects.filter(full_name__in=["Ana", "Budi", "Cici"])}
+        self.assertTrue(users["ana@student.prasetiyamulya.ac.id"].check_password("secret123"))
+        self.assertTrue(users["budi@student.prasetiyamulya.ac.id"].check_password("hashed"))
+        self.assertFalse(users["cici@student.prasetiyamulya.ac.id"].has_usable_password())
+        self.assertEqual({u.role for u in users.values()}, {"student"})
+
+
+INSTRUMENTATION_MIDDLEWARE = "users.instrumentation.InstrumentationMiddleware"
+
+
+@override_settings(
+    PASSWORD_HASHERS=FAST_HASHERS,
+    MIDDLEWARE=[INSTRUMENTATION_MIDDLEWARE, *(m for m in settings.MIDDLEWARE if m != INSTRUMENTATION_MIDDLEWARE)],
+    **NO_RESPONSE_CACHE,
+)
+class InstrumentationTests(TestCase):
+    """Server-Timing, histogram per view dan peringatan query budget"""
+
+    def setUp(self):
+        instrumentation.metrics.reset()
+        self.instructor = make_instructor()
+        self.student = make_student(0)
+        make_grade(self.student, make_course(1, instructor=self.instructor))
+
+    def test_server_timing_and_metrics(self):
+        response = self.client.get(reverse("student_dashboard"), {"email": self.student.email})
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="2 queries", render;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+        response = async_to_sync(self.async_client.get)(
+            reverse("async_instructor_dashboard"), {"email": self.instructor.email}
+        )
+        self.assertIn('desc="4 queries"', response["Server-Timing"])
+
+        snapshot = instrumentation.metrics.snapshot()
+        self.assertEqual(snapshot["student_dashboard"]["count"], 1)
+        self.assertEqual(snapshot["student_dashboard"]["max_queries"], 2)
+        self.assertEqual(sum(snapshot["student_dashboard"]["histogram_ms"].values()), 1)
+        self.assertEqual(snapshot["async_instructor_dashboard"]["max_queries"], 4)
+
+        admin_user = CustomUser.objects.create_superuser(
+            email="admin@prasetiyamulya.ac.id", username="admin", password="x", full_name="Admin"
+        )
+        api = APIClient()
+        api.force_authenticate(admin_user)
+        self.assertIn("student_dashboard", api.get(reverse("api_metrics")).json())
+        self.assertIn(self.client.get(reverse("api_metrics")).status_code, (401, 403))
+
+    def test_query_budget_warning(self):
+        url = reverse("student_dashboard")
+        with self.assertNoLogs("users.instrumentation", "WARNING"):
+            self.client.get(url, {"email": self.student.email})
+        with self.settings(API_QUERY_BUDGETS={"student_dashboard": 1}):
+            with self.assertLogs("users.instrumentation", "WARNING") as logs:
+                self.client.get(url, {"email": self.student.email})
+        self.assertIn("view=student_dashboard queries=2 budget=1", logs.output[0])
+
+    def test_import_chunks_are_declared_batches(self):
+        # Chunk setelah yang pertama menambah query, tapi dideklarasikan
+        # (batched_queries) sehingga tidak melanggar budget grade_import
+        rows = [
+            {"student_email": make_student(n).email, "course_code": "BM001", "final_score": "70"}
+            for n in range(1, 4)
+        ]
+        api = APIClient()
+        api.force_authenticate(self.instructor)
+        with mock.patch("users.views.import_grades", partial(import_grades, chunk_size=1)), \
+                self.assertNoLogs("users.instrumentation", "WARNING"):
+            response = api.post(reverse("grade_import"), rows, format="json")
+        self.assertEqual(response.json()["created"], 3)
+        self.assertGreater(instrumentation.metrics.snapshot()["grade_import"]["max_batched"], 0)
+
+    def test_reconnect_during_request_is_not_counted(self):
+        # Koneksi dibuka ulang di tengah request (CONN_MAX_AGE=0): PRAGMA dari
+        # users/db.py tidak boleh ikut terhitung sebagai query view
+        get_dashboard = StudentDashboardView.get_dashboard
+
+        def reconnecting(view, request):
+            connection_created.send(sender=connection.__class__, connection=connection)
+            return get_dashboard(view, request)
+
+        # synchronous tidak bisa diubah di dalam transaksi TestCase
+        pragmas = {k: v for k, v in settings.SQLITE_PRAGMAS.items() if k != "synchronous"}
+        with self.settings(SQLITE_PRAGMAS=pragmas), \
+                mock.patch.object(StudentDashboardView, "get_dashboard", reconnecting), \
+                self.assertNoLogs("users.instrumentation", "WARNING"):
+            response = self.client.get(reverse("student_dashboard"), {"email": self.student.email})
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradeAdminTests(TestCase):
+    """Changelist Grade: hitungan terbatas, pencarian index, simpan list_editable sekaligus"""
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(
+            email="admin@prasetiyamulya.ac.id", username="admin", password="x", full_name="Admin"
+        )
+        self.client.force_login(self.admin)
+        self.url = reverse("admin:users_grade_changelist")
+        self.students = [make_student(n) for n in range(3)]
+        self.courses = [make_course(1), make_course(20)]
+        self.grades = [make_grade(s, c) for s in self.students for c in self.courses]
+
+    def test_search(self):
+        Course.objects.filter(pk=self.courses[1].pk).update(code="bm020")
+        cases = {
+            "student1@student.prasetiyamulya.ac.id": 2,
+            "student1@student": 2,
+            "@student.prasetiyamulya": 6,
+            "STUDENT1": 2,
+            "BM02": 3,
+            "bm": 6,
+            "nobody": 0,
+        }
+        for term, expected in cases.items():
+            response = self.client.get(self.url, {"q": term})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context["cl"].result_count, expected, term)
+
+    def test_count_is_capped(self):
+        from .admin import EstimatedCountPaginator, GradeAdmin
+
+        with mock.patch.object(EstimatedCountPaginator, "count_limit", 4), \
+                mock.patch.object(EstimatedCountPaginator, "lookahead_pages", 2), \
+                mock.patch.object(GradeAdmin, "list_per_page", 1):
+            response = self.client.get(self.url)
+            self.assertEqual(response.context["cl"].result_count, 4)
+            self.assertIsNone(response.context["cl"].full_result_count)
+            # Batas bergeser mengikuti halaman: halaman setelah batas tetap tercapai
+            response = self.client.get(self.url, {"p": 4})
+            self.assertEqual(response.context["cl"].result_count, 6)
+            response = self.client.get(self.url, {"p": 6})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context["cl"].result_list), 1)
+
+    def test_list_editable_saves_in_one_batch(self):
+        data = {
+            "form-TOTAL_FORMS": str(len(self.grades)),
+            "form-INITIAL_FORMS": str(len(self.grades)),
+            "_save": "Save",
+        }
+        for i, grade in enumerate(self.grades):
+            data[f"form-{i}-id"] = grade.pk
+            scores = (50, 50, 50) if grade.student == self.students[0] else (80, 75, 90)
+            for field, score in zip(("assignment_score", "midterm_score", "final_score"), scores):
+                data[f"form-{i}-{field}"] = score
+
+        with mock.patch.object(Grade, "save", side_effect=AssertionError("save per baris")), \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertLessEqual(len(queries), instrumentation.query_budget("users_grade_changelist"))
+        self.assertEqual(LogEntry.objects.count(), 2)
+
+        letters = dict(Grade.objects.order_by().values_list("student_id", "letter_grade").distinct())
+        self.assertEqual(letters[self.students[0].pk], "D")
+        self.assertEqual(letters[self.students[1].pk], "A-")
+        self.assertEqual(StudentSummary.objects.get(student=self.students[0]).gpa, 1.0)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradeRollupTests(TestCase):
+    """Rollup analitik: isi grup, refresh inkremental via watermark, endpoint"""
+
+    def setUp(self):
+        self.students = [make_student(n) for n in range(4)]
+        self.students[3].major = "digital_business_technology"
+        self.students[3].save()
+        self.course = make_course(1)
+        self.other = make_course(2, semester="2")
+        for student, score in zip(self.students[:3], (60, 70, 80)):
+            make_grade(student, self.course, scores=(score, score, score))
+        make_grade(self.students[3], self.course, scores=(90, 90, 90))
+        Grade.objects.create(student=self.students[0], course=self.other)
+
+    def test_groups(self):
+        self.assertEqual(refresh_rollups(), {"courses": None, "groups": 3})
+        bm = GradeRollup.objects.get(course=self.course, student_major="business_mathematics")
+        self.assertEqual((bm.enrolled, bm.graded, bm.average), (3, 3, 70.0))
+        self.assertEqual((bm.p25, bm.median, bm.p75, bm.p90), (65.0, 70.0, 75.0, 78.0))
+        self.assertEqual(bm.distribution["C+"], 1)
+        self.assertEqual(bm.semester, "1")
+
+        ungraded = GradeRollup.objects.get(course=self.other)
+        self.assertEqual((ungraded.enrolled, ungraded.graded, ungraded.median), (1, 0, None))
+
+    def test_incremental_refresh(self):
+        refresh_rollups()
+        # Semua data lama, sudah tercakup watermark: tidak ada yang dihitung ulang
+        past = timezone.now() - timedelta(hours=1)
+        Grade.objects.update(updated_at=past)
+        Course.objects.update(updated_at=past)
+        RollupWatermark.objects.update(value=past + WATERMARK_OVERLAP + timedelta(minutes=1))
+        self.assertEqual(refresh_rollups(), {"courses": 0, "groups": 0})
+
+        grade = Grade.objects.get(student=self.students[3], course=self.course)
+        grade.final_score = Decimal(0)
+        grade.save()
+        self.assertEqual(refresh_rollups(), {"courses": 1, "groups": 2})
+        dbt = GradeRollup.objects.get(course=self.course, student_major="digital_business_technology")
+        self.assertEqual(dbt.average, 54.0)
+        self.assertEqual(GradeRollup.objects.count(), 3)
+
+    def test_bulk_write_moves_watermark(self):
+        refresh_rollups()
+        past = timezone.now() - timedelta(hours=1)
+        Grade.objects.update(updated_at=past)
+        Course.objects.update(updated_at=past)
+        RollupWatermark.objects.update(value=past + WATERMARK_OVERLAP + timedelta(minutes=1))
+        # Jalur bulk (grading.save_grades) tetap menstempel updated_at
+        Grade.objects.filter(student=self.students[3], course=self.course).update(final_score=0)
+        GradeRecomputer([self.course.pk]).run()
+        self.assertEqual(refresh_rollups(), {"courses": 1, "groups": 2})
+
+    def test_endpoint(self):
+        call_command("refresh_grade_rollups", stdout=StringIO())
+        admin_user = CustomUser.objects.create_superuser(
+            email="admin@prasetiyamulya.ac.id", username="admin", password="x", full_name="Admin"
+        )
+        api = APIClient()
+        api.force_authenticate(admin_user)
+        url = reverse("grade_analytics")
+
+        with self.assertNumQueries(2):
+            data = api.get(url, {"semester": "1"}).json()
+        self.assertIsNotNone(data["refreshed_at"])
+        self.assertEqual(
+            [(g["course"]["code"], g["student_major"], g["enrolled"]) for g in data["groups"]],
+            [("BM001", "business_mathematics", 3), ("BM001", "digital_business_technology", 1)],
+        )
+        self.assertEqual(len(api.get(url, {"course": "BM002"}).json()["groups"]), 1)
+        self.assertIn(self.client.get(url).status_code, (401, 403))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, **NO_RESPONSE_CACHE)
+class StudentRankingTests(TestCase):
+    """Peringkat jurusan/angkatan/course di dashboard, tanpa query tambahan"""
+
+    def setUp(self):
+        self.url = reverse("student_dashboard")
+        self.course = make_course(1)
+        self.students = [make_student(n) for n in range(4)]
+        # IPK: 4.0, 3.7, 3.7, 1.0 (satu course 3 SKS)
+        for student, scores in zip(self.students, [(95, 95, 95), (80, 75, 90), (80, 75, 90), (50, 50, 50)]):
+            make_grade(student, self.course, scores=scores)
+        self.students[3].major = "digital_business_technology"
+        self.students[3].save()
+
+    def dashboard(self, student):
+        return self.client.get(self.url, {"email": student.email}).json()
+
+    def test_ranks(self):
+        with self.assertNumQueries(2):
+            data = self.dashboard(self.students[1])
+        ranking = data["statistics"]["ranking"]
+        self.assertEqual(ranking["major"], {"rank": 2, "of": 3, "percentile": 66.7})
+        self.assertEqual(ranking["cohort"], {"rank": 2, "of": 4, "percentile": 75.0})
+        self.assertEqual(data["grades"][0]["course_rank"], {"rank": 2, "of": 4, "percentile": 75.0})
+
+        # Ganti jurusan: partisi peringkat ikut pindah
+        ranking = self.dashboard(self.students[3])["statistics"]["ranking"]
+        self.assertEqual(ranking["major"], {"rank": 1, "of": 1, "percentile": 100.0})
+        self.assertEqual(ranking["cohort"]["rank"], 4)
+
+    def test_migration_backfills_existing_summaries(self):
+        from django.apps import apps
+
+        backfill = import_module("users.migrations.0012_backfill_summary_ranking")
+        StudentSummary.objects.update(major=None, cohort=None)
+        backfill.backfill_ranking_fields(apps, None)
+        self.assertEqual(
+            sorted(StudentSummary.objects.values_list("major", "cohort")),
+            sorted((s.major, s.date_joined.year) for s in self.students),
+        )
+
+    def test_peer_change_updates_etag(self):
+        response = self.client.get(self.url, {"email": self.students[1].email})
+        etag = response["ETag"]
+        grade = Grade.objects.get(student=self.students[3])
+        grade.final_score = Decimal(100)
+        grade.midterm_score = Decimal(100)
+        grade.assignment_score = Decimal(100)
+        grade.save()
+
+        response = self.client.get(self.url, {"email": self.students[1].email}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["grades"][0]["course_rank"]["rank"], 3)
+
+    def test_async_matches_sync(self):
+        path = reverse("async_student_dashboard")
+        response = async_to_sync(self.async_client.get)(path, {"email": self.students[1].email})
+        self.assertEqual(response.json(), self.dashboard(self.students[1]))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+@override_settings(BENCH_DATABASE=True)
+class BenchSuiteTests(TestCase):
+    """seed_bench + bench_suite dalam skala kecil"""
+
+    def test_delete_gradebook_keeps_real_rows(self):
+        real = CustomUser.objects.create_user(
+            email="benchmark@student.prasetiyamulya.ac.id", username="benchmark", password="x",
+            full_name="Benchmark Asli", role="student",
+        )
+        real_course = make_course(1)
+        real_course.code = "BENCH900"
+        real_course.save()
+        make_grade(real, real_course)
+
+        # Lebih sedikit mahasiswa dari per_course: tidak ada pasangan ganda
+        seed_gradebook(20, students=5)
+        # Ringkasan hanya untuk mahasiswa bench
+        StudentSummary.objects.all().delete()
+        self.assertEqual(refresh_bench_summaries(), 5)
+        self.assertFalse(StudentSummary.objects.filter(student=real).exists())
+        delete_gradebook()
+        self.assertEqual(list(CustomUser.objects.values_list("username", flat=True)), ["benchmark"])
+        self.assertEqual(list(Course.objects.values_list("code", flat=True)), ["BENCH900"])
+        self.assertEqual(Grade.objects.count(), 1)
+
+    @override_settings(BENCH_DATABASE=False)
+    def test_refuses_without_bench_database(self):
+        for command in ("seed_bench", "bench_suite", "bench_db", "loadtest_dashboards"):
+            with self.assertRaisesMessage(CommandError, "--yes-i-mean-it"):
+                call_command(command, stdout=StringIO())
+        call_command("seed_bench", "--students", "5", "--courses", "5", "--grades", "5",
+                     "--yes-i-mean-it", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(CustomUser.objects.filter(username__startswith="seed:").count(), 6)
+
+    def test_seed_and_run(self):
+        # Akun asli berawalan "seed" tidak dianggap data seed
+        real = CustomUser.objects.create_user(
+            email="seedorf@student.prasetiyamulya.ac.id", username="seedorf", password="x",
+            full_name="Seedorf", role="student",
+        )
+        make_grade(real, make_course(900))
+
+        call_command("seed_bench", "--students", "30", "--courses", "10", "--grades", "60",
+                     stdout=StringIO(), stderr=StringIO())
+        students = CustomUser.objects.filter(username__startswith="seed:", role="student")
+        self.assertEqual(students.count(), 30)
+        self.assertEqual(Grade.objects.filter(student__in=students).count(), 60)
+        self.assertEqual(len(set(students.values_list("major", flat=True))), len(CustomUser.MAJOR_CHOICES))
+        self.assertEqual(set(Course.objects.exclude(code="BM900").values_list("semester", flat=True)), {"1", "2"})
+        self.assertEqual(StudentSummary.objects.filter(graded_courses__gt=0, cohort__isnull=False).count(), 31)
+        with self.assertRaises(CommandError):
+            call_command("seed_bench", "--students", "1", stdout=StringIO())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/run.json"
+            out = StringIO()
+            call_command("bench_suite", "--requests", "3", "--output", path, stdout=out)
+            call_command("bench_suite", "--requests", "3", "--output", path, "--compare", path,
+                         "--scenario", "login", stdout=out)
+            with open(path) as f:
+                report = json.load(f)
+        self.assertIn("vs baseline", out.getvalue())
+        self.assertEqual(report["meta"]["dataset"]["grades"], 60)
+        self.assertEqual(report["results"]["login"]["errors"], 0)
+        self.assertFalse(CustomUser.objects.filter(username__startswith="seed-reg-").exists())
+
+        call_command("seed_bench", "--delete", stdout=StringIO())
+        self.assertEqual(list(Grade.objects.values_list("student__username", flat=True)), ["seedorf"])
+        self.assertEqual(list(CustomUser.objects.values_list("username", flat=True)), ["seedorf"])
+        self.assertEqual(list(Course.objects.values_list("code", flat=True)), ["BM900"])
+
+
+def build_budget_data(n):
+    """
+    n course milik satu dosen dan n mahasiswa: mahasiswa pertama ikut semua
+    course, semua mahasiswa ikut course pertama (2n - 1 grade)
+    """
+    instructor = make_instructor()
+    admin = CustomUser.objects.create_superuser(
+        email="admin@prasetiyamulya.ac.id", username="admin", password="x", full_name="Admin"
+    )
+    courses = Course.objects.bulk_create([
+        Course(code=f"BM{i:03d}", name=f"Course {i}", credits=3, semester=str(i % 8 + 1),
+               major="business_mathematics", instructor=instructor)
+        for i in range(n)
+    ])
+    password = make_password("password123")
+    students = CustomUser.objects.bulk_create([
+        CustomUser(email=f"student{i}@student.prasetiyamulya.ac.id", username=f"student{i}",
+                   full_name=f"Student {i}", major="business_mathematics", role="student",
+                   password=password)
+        for i in range(n)
+    ])
+    pairs = {(students[0], course) for course in courses} | {(student, courses[0]) for student in students}
+    grades = [
+        Grade(student=student, course=course, assignment_score=Decimal(80),
+              midterm_score=Decimal(75), final_score=Decimal(90))
+        for student, course in pairs
+    ]
+    for grade in grades:
+        grade.calculate_final_grade()
+    Grade.objects.bulk_create(grades)
+    refresh_student_summaries()
+    refresh_rollups(full=True)
+    return {"instructor": instructor, "admin": admin, "student": students[0],
+            "students": students, "course": courses[0], "courses": courses,
+            "course_grades": list(courses[0].grades.values_list("pk", flat=True))}
+
+
+def _api(user=None, token=None):
+    client = APIClient()
+    if user is not None:
+        client.force_authenticate(user)
+    if token is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def _consume(response):
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+def _admin_list_editable(test, data):
+    """POST list_editable admin Grade: ubah nilai semua peserta course pertama"""
+    url = reverse("admin:users_grade_changelist")
+    grades = data["course_grades"]
+    form = {"form-TOTAL_FORMS": len(grades), "form-INITIAL_FORMS": len(grades), "_save": "Save"}
+    for i, pk in enumerate(grades):
+        form[f"form-{i}-id"] = pk
+        for field in ("assignment_score", "midterm_score", "final_score"):
+            form[f"form-{i}-{field}"] = 70
+    response = data["admin_client"].post(url, form)
+    test.assertEqual(response.get("Location"), url)  # tersimpan, bukan form error / login
+    return response
+
+
+# (label, nama route, request) - setiap route di users/urls.py wajib ada
+BUDGET_SCENARIOS = [
+    ("register", "register", lambda t, d: t.client.post(reverse("register"), {
+        "email": "baru@student.prasetiyamulya.ac.id", "username": "baru", "full_name": "Baru",
+        "major": "business_mathematics", "role": "student",
+        "password": "password123", "password_confirmation": "password123",
+    })),
+    ("login", "token_obtain_pair", lambda t, d: t.client.post(reverse("token_obtain_pair"), {
+        "email": d["student"].email, "password": "password123",
+    })),
+    ("token_refresh", "token_refresh", lambda t, d: t.client.post(reverse("token_refresh"), {
+        "refresh": str(CustomTokenObtainPairSerializer.get_token(d["student"])),
+    })),
+    ("student_dashboard", "student_dashboard", lambda t, d: t.client.get(
+        reverse("student_dashboard"), {"email": d["student"].email})),
+    ("instructor_dashboard", "instructor_dashboard", lambda t, d: t.client.get(
+        reverse("instructor_dashboard"), {"email": d["instructor"].email})),
+    ("async_student_dashboard", "async_student_dashboard", lambda t, d: async_to_sync(t.async_client.get)(
+        reverse("async_student_dashboard"), {"email": d["student"].email})),
+    ("async_instructor_dashboard", "async_instructor_dashboard", lambda t, d: async_to_sync(t.async_client.get)(
+        reverse("async_instructor_dashboard"), {"email": d["instructor"].email})),
+    ("course_gradebook", "course_gradebook", lambda t, d: t.client.get(
+        reverse("course_gradebook", args=[d["course"].code]), {"email": d["instructor"].email})),
+    ("course_gradebook csv", "course_gradebook", lambda t, d: _consume(t.client.get(
+        reverse("course_gradebook", args=[d["course"].code]),
+        {"email": d["instructor"].email, "export": "csv"}))),
+    ("dashboard_cache_stats", "dashboard_cache_stats", lambda t, d: _api(d["admin"]).get(
+        reverse("dashboard_cache_stats"))),
+    ("api_metrics", "api_metrics", lambda t, d: _api(d["admin"]).get(reverse("api_metrics"))),
+    ("grade_analytics", "grade_analytics", lambda t, d: _api(d["admin"]).get(reverse("grade_analytics"))),
+    ("grade_import", "grade_import", lambda t, d: _api(
+        token=CustomTokenObtainPairSerializer.get_token(d["instructor"]).access_token,
+    ).post(reverse("grade_import"), [
+        {"student_email": student.email, "course_code": d["course"].code,
+         "assignment_score": "70", "midterm_score": "70", "final_score": "70"}
+        for student in d["students"]
+    ], format="json")),
+    # Bukan route users/urls.py, tapi satu-satunya view admin dengan budget
+    ("admin list_editable", "users_grade_changelist", _admin_list_editable),
+]
+
+@override_settings(
+    PASSWORD_HASHERS=FAST_HASHERS,
+    MIDDLEWARE=[INSTRUMENTATION_MIDDLEWARE, *(m for m in settings.MIDDLEWARE if m != INSTRUMENTATION_MIDDLEWARE)],
+    **NO_RESPONSE_CACHE,
+)
+class QueryBudgetTests(TestCase):
+    """
+    Setiap route dijalankan dengan 1, 10 dan 100 course & peserta: jumlah
+    query harus konstan (tanpa N+1) dan tidak melebihi budget route di
+    API_QUERY_BUDGETS / API_QUERY_BUDGET, kecuali batch bulk write yang
+    dideklarasikan jalur bulk (instrumentation.allow_batches) - angka dan
+    budget yang sama dengan peringatan InstrumentationMiddleware. Gagal
+    dengan SQL yang tertangkap.
+    """
+    sizes = (1, 10, 100)
+
+    def test_every_route_has_a_scenario(self):
+        routes = {pattern.name for pattern in urlpatterns}
+        self.assertEqual(routes - {name for _label, name, _request in BUDGET_SCENARIOS}, set())
+
+    def test_query_counts(self):
+        captured = {label: {} for label, _name, _request in BUDGET_SCENARIOS}
+        for n in self.sizes:
+            with transaction.atomic():
+                data = build_budget_data(n)
+                data["admin_client"] = Client()
+                data["admin_client"].force_login(data["admin"])
+                for label, _name, request in BUDGET_SCENARIOS:
+                    captured[label][n] = self.capture(label, request, data)
+                transaction.set_rollback(True)
+
+        for label, name, _request in BUDGET_SCENARIOS:
+            with self.subTest(label):
+                self.assertWithinBudget(label, instrumentation.query_budget(name), captured[label])
+
+    def capture(self, label, request, data):
+        cache.clear()
+        user_cache.clear()
+        ContentType.objects.clear_cache()
+        instrumentation.metrics.reset()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                response = request(self, data)
+            transaction.set_rollback(True)
+        self.assertLess(response.status_code, 400, f"{label}: status {response.status_code}")
+        (view,) = instrumentation.metrics.snapshot().values()
+        return [query["sql"] for query in queries], view["max_batched"]
+
+    def assertWithinBudget(self, label, budget, captured):
+        counts = {n: len(queries) for n, (queries, _batched) in captured.items()}
+        extra = {n: batched for n, (_queries, batched) in captured.items()}
+        base = {n: counts[n] - extra[n] for n in captured}
+        largest = max(captured)
+        if len(set(base.values())) == 1 and base[largest] <= budget:
+            return
+        sql = "\n".join(f"{i}. {query}" for i, query in enumerate(captured[largest][0], start=1))
+        self.fail(
+            f"{label}: jumlah query per ukuran data {counts}, batch yang dideklarasikan {extra}, "
+            f"budget {budget} (harus konstan & <= budget di luar batch). SQL pada n={largest}:\n{sql}"
+        )
@@ -1,5 +1,9 @@
 from django.urls import path
-from .views import RegisterView, CustomTokenObtainPairView, StudentDashboardView, InstructorDashboardView
+from .views import (
+    RegisterView, CustomTokenObtainPairView, StudentDashboardView, InstructorDashboardView, CourseGradebookView,
+    DashboardCacheStatsView, GradeImportView, ApiMetricsView, GradeAnalyticsView,
+)
+from .async_views import AsyncInstructorDashboardView, AsyncStudentDashboardView
 from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
@@ -8,4 +12,11 @@ urlpatterns = [
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('student/', StudentDashboardView.as_view(), name='student_dashboard'),
     path('instructor/', InstructorDashboardView.as_view(), name='instructor_dashboard'),
+    path('async/student/', AsyncStudentDashboardView.as_view(), name='async_student_dashboard'),
+    path('async/instructor/', AsyncInstructorDashboardView.as_view(), name='async_instructor_dashboard'),
+    path('instructor/courses/<str:code>/grades/', CourseGradebookView.as_view(), name='course_gradebook'),
+    path('cache-stats/', DashboardCacheStatsView.as_view(), name='dashboard_cache_stats'),
+    path('metrics/', ApiMetricsView.as_view(), name='api_metrics'),
+    path('analytics/grades/', GradeAnalyticsView.as_view(), name='grade_analytics'),
+    path('grades/import/', GradeImportView.as_view(), name='grade_import'),
 ]
\ No newline at end of file
@@ -1,10 +1,32 @@
 
+import csv
+import json
+import logging
+
 from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
 from rest_framework import generics,permissions
 from rest_framework.views import APIView
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from django.shortcuts import get_object_or_404
-from .models import Course, Grade, CustomUser
+from .models import Course, Grade, CustomUser, GradeRollup
+from .analytics import ROLLUP_FIELDS, get_watermark
+from .authentication import db_user
+from .course_stats import get_many_course_stats
+from .grade_import import import_grades, iter_csv_rows
+from .etags import (
+    dashboard_etag,
+    instructor_etag_annotations,
+    not_modified,
+    student_etag_annotations,
+    with_validator,
+)
+from .instrumentation import metrics as view_metrics
+from .pagination import GradeKeysetPagination
+from .ranking import course_rank, course_rank_annotations, student_ranks
+from .response_cache import CachedDashboardMixin, stats as dashboard_cache_stats
 from .serializers import GradeSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
@@ -12,10 +34,12 @@ from .serializers import (
     RegisterSerializer,
     CustomTokenObtainPairSerializer,
     GradeSerializer,
+    GradeRowSerializer,
 )
 from .models import Course, Grade
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -28,109 +52,339 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
-class StudentDashboardView(generics.GenericAPIView):
+class StudentDashboardView(CachedDashboardMixin, generics.GenericAPIView):
     """Dashboard student - AllowAny"""
     permission_classes = [permissions.AllowAny]
+    dashboard_kind = 'student'
     
-    def get(self, request):
+    def get_dashboard(self, request):
         # ✅ Ambil email dari query params
         user_email = request.query_params.get('email')
         
-        print(f"📥 Received email: {user_email}")  # Debug
-        
         if not user_email:
             return Response({'error': 'Email parameter required'}, status=400)
         
         try:
-            user = User.objects.get(email=user_email, role='student')
+            user = User.objects.select_related('summary').annotate(
+                **student_etag_annotations()
+            ).get(email=user_email, role='student')
         except User.DoesNotExist:
             return Response({'error': 'Student not found'}, status=404)
         
-        # Get grades
-        grades = Grade.objects.filter(
-            student=user,
-        ).select_related('course', 'course__instructor')
-        
-        print(f"📊 Found {grades.count()} grades")  # Debug
-        
-        total_points = 0
-        total_credits = 0
-        
-        for grade in grades.filter(letter_grade__isnull=False):
-            gp = grade.get_grade_point()
-            credits = grade.course.credits
-            total_points += gp * credits
-            total_credits += credits
+        etag = dashboard_etag(user, student_etag_annotations())
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
         
+        # Get grades (fast path .values()); statistik dari StudentSummary,
+        # atau dihitung dalam query yang sama (window aggregate) jika
+        # ringkasan belum ada
+        ranks = course_rank_annotations()
+        grades = Grade.objects.filter(student=user).annotate(**ranks)
+        stat_fields = []
+        if getattr(user, 'summary', None) is None:
+            window = Grade.transcript_window_annotations()
+            grades = grades.annotate(**window)
+            stat_fields = list(window)
+        rows = list(GradeRowSerializer(grades, extra_fields=[*ranks, *stat_fields]).iter_rows())
+
+        # Argumen diformat lazy: tanpa biaya jika level DEBUG tidak aktif
+        logger.debug(
+            "student dashboard: student_id=%s grades=%d summary=%s",
+            user.pk, len(rows), not stat_fields,
+        )
+
+        return with_validator(Response(student_dashboard_payload(user, rows)), etag)
+
+
+def student_dashboard_payload(user, rows):
+    """
+    Isi dashboard mahasiswa dari user (dianotasi student_etag_annotations())
+    + hasil GradeRowSerializer.iter_rows() dengan course_rank_annotations()
+    """
+    summary = getattr(user, 'summary', None)
+    if summary is not None:
+        gpa = summary.gpa
+        total_credits = summary.total_credits
+    else:
+        first = rows[0][0] if rows else {}
+        total_points = first.get('stat_total_points', 0)
+        total_credits = first.get('stat_total_credits', 0)
         gpa = round(total_points / total_credits, 2) if total_credits > 0 else 0.0
-        
-        return Response({
-            'student': {
-                'name': user.full_name,
-                'email': user.email,
-                'major': user.major,
-            },
-            'statistics': {
-                'total_courses': grades.count(),
-                'gpa': gpa,
-                'total_credits': total_credits,
-            },
-            'grades': GradeSerializer(grades, many=True).data
-        })
 
-class InstructorDashboardView(APIView):
+    return {
+        'student': {
+            'name': user.full_name,
+            'email': user.email,
+            'major': user.major,
+        },
+        'statistics': {
+            'total_courses': len(rows),
+            'gpa': gpa,
+            'total_credits': total_credits,
+            'ranking': student_ranks(user),
+        },
+        'grades': [{**data, 'course_rank': course_rank(row)} for row, data in rows]
+    }
+
+
+def instructor_email_error(email):
+    """(payload error, status) jika ?email= tidak valid untuk dosen, selain itu None"""
+    if not email:
+        return {"error": "Email diperlukan."}, 400
+
+    # ✅ Validasi domain email
+    if not email.endswith("@prasetiyamulya.ac.id"):
+        return {"error": "Akses ditolak. Hanya email @prasetiyamulya.ac.id yang diizinkan."}, 403
+    return None
+
+
+INSTRUCTOR_NOT_FOUND = {
+    "error": "Instructor dengan email tersebut tidak ditemukan atau tidak memiliki role instructor."
+}
+
+
+def get_instructor_or_error(request, queryset=None):
+    """(instructor, None) atau (None, Response error) dari parameter ?email="""
+    if queryset is None:
+        queryset = CustomUser.objects
+    # Ambil parameter email dari query
+    email = request.query_params.get("email")
+
+    error = instructor_email_error(email)
+    if error is not None:
+        payload, status = error
+        return None, Response(payload, status=status)
+
+    # ✅ Cari user dengan role 'instructor' dan email yang cocok
+    try:
+        return queryset.get(email=email, role="instructor"), None
+    except CustomUser.DoesNotExist:
+        return None, Response(INSTRUCTOR_NOT_FOUND, status=404)
+
+
+class InstructorDashboardView(CachedDashboardMixin, APIView):
     """
     Dashboard Instructor
     - Hanya bisa diakses oleh user dengan role 'instructor'
     - Email wajib menggunakan domain @prasetiyamulya.ac.id
     """
     permission_classes = [permissions.AllowAny]
+    dashboard_kind = "instructor"
+
+    def get_dashboard(self, request):
+        instructor, error = get_instructor_or_error(
+            request, CustomUser.objects.annotate(**instructor_etag_annotations())
+        )
+        if error is not None:
+            return error
+
+        etag = dashboard_etag(instructor, instructor_etag_annotations())
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        # ✅ Ambil semua course yang diajar oleh instructor ini, lalu grades
+        # semua course dalam satu query .values() (bukan satu query per course)
+        courses = list(Course.objects.filter(instructor=instructor))
+        course_stats = get_many_course_stats([course.pk for course in courses])
+
+        # Urut per course lalu terbaru: sesuai users_grade_course_recent_idx
+        grades = Grade.objects.filter(course__in=courses).order_by("course_id", "-created_at")
+        rows = GradeRowSerializer(grades).iter_rows()
+
+        # ✅ Return data dashboard
+        return with_validator(Response(
+            instructor_dashboard_payload(instructor, courses, course_stats, rows), status=200
+        ), etag)
+
+
+def instructor_dashboard_payload(instructor, courses, course_stats, rows):
+    """Isi dashboard dosen; rows = (row, data) dari GradeRowSerializer, urut per course"""
+    grades_by_course = {course.pk: [] for course in courses}
+    for row, data in rows:
+        # View async membaca course & grade di query terpisah (bukan satu
+        # snapshot): grade dari course yang dibuat di antaranya dilewati
+        course_grades = grades_by_course.get(row["course_id"])
+        if course_grades is not None:
+            course_grades.append(data)
+
+    course_data = []
+    for course in courses:
+        course_data.append({
+            "name": course.name,
+            "code": course.code,
+            "credits": course.credits,
+            "semester": course.semester,
+            "statistics": course_stats[course.pk],
+            "grades": grades_by_course[course.pk],
+        })
+
+    return {
+        "instructor": {
+            "full_name": instructor.full_name,
+            "email": instructor.email,
+            "major": instructor.major,
+        },
+        "courses": course_data,
+    }
+
+
+class DashboardCacheStatsView(APIView):
+    """Counter hit/miss cache dashboard (proses ini) untuk monitoring - admin saja"""
+    permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        # Ambil parameter email dari query
-        email = request.query_params.get("email")
+        return Response(dashboard_cache_stats.snapshot())
 
-        if not email:
-            return Response({"error": "Email diperlukan."}, status=400)
 
-        # ✅ Validasi domain email
-        if not email.endswith("@prasetiyamulya.ac.id"):
-            return Response(
-                {"error": "Akses ditolak. Hanya email @prasetiyamulya.ac.id yang diizinkan."},
-                status=403,
-            )
+class ApiMetricsView(APIView):
+    """Histogram latensi & query per view (proses ini) - admin saja"""
+    permission_classes = [permissions.IsAdminUser]
 
-        # ✅ Cari user dengan role 'instructor' dan email yang cocok
-        try:
-            instructor = CustomUser.objects.get(email=email, role="instructor")
-        except CustomUser.DoesNotExist:
-            return Response(
-                {"error": "Instructor dengan email tersebut tidak ditemukan atau tidak memiliki role instructor."},
-                status=404,
-            )
-
-        # ✅ Ambil semua course yang diajar oleh instructor ini
-        courses = Course.objects.filter(instructor=instructor)
-
-        course_data = []
-        for course in courses:
-            grades = Grade.objects.filter(course=course).select_related("student")
-            grade_data = GradeSerializer(grades, many=True).data
-
-            course_data.append({
-                "name": course.name,
-                "code": course.code,
-                "credits": course.credits,
-                "semester": course.semester,
-                "grades": grade_data,
+    def get(self, request):
+        return Response(view_metrics.snapshot())
+
+
+class GradeAnalyticsView(APIView):
+    """
+    Distribusi nilai per (semester, jurusan course, course, jurusan mahasiswa)
+    dari tabel GradeRollup - admin saja. Filter opsional: ?semester=,
+    ?course_major=, ?student_major=, ?course=<kode>. Data per refresh
+    terakhir (manage.py refresh_grade_rollups).
+    """
+    permission_classes = [permissions.IsAdminUser]
+    filters = {
+        "semester": "semester",
+        "course_major": "course_major",
+        "student_major": "student_major",
+        "course": "course__code",
+    }
+
+    def get(self, request):
+        rollups = GradeRollup.objects.filter(**{
+            lookup: request.query_params[param]
+            for param, lookup in self.filters.items()
+            if param in request.query_params
+        })
+        rows = rollups.order_by("semester", "course__code", "student_major").values(
+            "semester", "course_major", "student_major", "course__code", "course__name", *ROLLUP_FIELDS
+        )
+        groups = []
+        for row in rows:
+            groups.append({
+                "semester": row["semester"],
+                "course_major": row["course_major"],
+                "course": {"code": row["course__code"], "name": row["course__name"]},
+                "student_major": row["student_major"] or None,
+                **{field: row[field] for field in ROLLUP_FIELDS},
             })
+        return Response({"refreshed_at": get_watermark(), "groups": groups})
 
-        # ✅ Return data dashboard
-        return Response({
-            "instructor": {
-                "full_name": instructor.full_name,
-                "email": instructor.email,
-                "major": instructor.major,
-            },
-            "courses": course_data,
-        }, status=200)
+
+class CourseGradebookView(APIView):
+    """
+    Gradebook satu course milik dosen (?email=...)
+    - default: halaman JSON dengan keyset pagination (?cursor=, ?page_size=)
+    - ?export=ndjson|csv: streaming seluruh baris, memori konstan
+    """
+    permission_classes = [permissions.AllowAny]
+    pagination_class = GradeKeysetPagination
+    export_chunk_size = 2000
+
+    def get(self, request, code):
+        instructor, error = get_instructor_or_error(request)
+        if error is not None:
+            return error
+
+        course = get_object_or_404(
+            Course.objects.select_related("instructor"), code=code, instructor=instructor
+        )
+        grades = Grade.objects.filter(course=course).select_related("student")
+
+        export = request.query_params.get("export")
+        if export:
+            if export not in GRADEBOOK_EXPORTS:
+                return Response({"error": "export harus 'ndjson' atau 'csv'."}, status=400)
+            return self.stream(course, grades.order_by("-created_at", "-id"), export)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(grades, request)
+        for grade in page:
+            grade.course = course
+        return Response(paginator.get_paginated_data(GradeSerializer(page, many=True).data))
+
+    def stream(self, course, grades, export):
+        def rows():
+            for _row, data in GradeRowSerializer(grades).iter_rows(chunk_size=self.export_chunk_size):
+                yield data
+
+        content_type, render = GRADEBOOK_EXPORTS[export]
+        response = StreamingHttpResponse(render(rows()), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{course.code}-grades.{export}"'
+        return response
+
+
+def _render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=JSONEncoder) + "\n"
+
+
+def _render_csv(rows):
+    buffer = _LineBuffer()
+    writer = csv.DictWriter(buffer, fieldnames=GradeSerializer.Meta.fields)
+    writer.writeheader()
+    yield buffer.pop()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.pop()
+
+
+class _LineBuffer:
+    """File-like minimal untuk csv.writer: simpan baris terakhir saja"""
+
+    def __init__(self):
+        self.value = ""
+
+    def write(self, value):
+        self.value += value
+
+    def pop(self):
+        value, self.value = self.value, ""
+        return value
+
+
+GRADEBOOK_EXPORTS = {
+    "ndjson": ("application/x-ndjson", _render_ndjson),
+    "csv": ("text/csv", _render_csv),
+}
+
+
+class GradeImportView(APIView):
+    """
+    Import nilai bulk untuk dosen (JWT)
+    - multipart: file CSV di field 'file' (kolom: student_email, course_code,
+      assignment_score, midterm_score, final_score)
+    - JSON: list baris, atau {"grades": [...]}
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    def post(self, request):
+        if request.user.role != "instructor":
+            return Response({"error": "Hanya dosen yang dapat mengimpor nilai."}, status=403)
+
+        upload = request.FILES.get("file")
+        if upload is not None:
+            try:
+                rows = iter_csv_rows(upload)
+            except (ValueError, UnicodeDecodeError) as exc:
+                return Response({"error": str(exc)}, status=400)
+        else:
+            rows = request.data.get("grades") if isinstance(request.data, dict) else request.data
+            if not isinstance(rows, list):
+                return Response({"error": "Kirim file CSV atau list nilai dalam JSON."}, status=400)
+
+        report = import_grades(db_user(request.user), rows)
+        # File rusak di tengah: 400, tapi dengan jumlah yang sudah tersimpan
+        return Response(report, status=400 if "error" in report else 200)